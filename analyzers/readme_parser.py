@@ -0,0 +1,292 @@
+"""Block-level README tokenizer.
+
+``parse_readme`` never loops over lines in Python. One regex walk finds the
+structural lines (fences, ATX headings and setext underlines); the prose between
+two of them is handled as one string: ``str.split`` counts its words and
+``\n``-anchored regexes count bullets and pick out feature bullets, install
+commands, badges and the description. Python-level work is per heading, fence
+and match rather than per line, building a lightweight section tree (headings
+with word, bullet and code-block counts). The whole README is parsed by
+default; ``max_lines`` / ``max_sections`` stop the scan early and set
+``truncated``.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Optional
+
+# Line-level patterns run over whole blocks. Every block starts with "\n" and
+# each pattern starts with that literal, so the regex engine jumps from line
+# to line instead of trying every character (as ``^`` with MULTILINE does);
+# "whitespace" is spelled [^\S\n] to stay within the line.
+_WS = r"[^\S\n]"
+_EOL = r"(?=\n|\Z)"
+# the lines that split a README into blocks: fences, ATX headings (the title
+# still carries any closing "#"s) and setext underlines
+_TOKEN_RE = re.compile(
+    rf"\n{_WS}*(?:(?P<fence>```|~~~)[^\n]*"
+    rf"|(?P<hashes>#{{1,6}}){_WS}+(?P<title>\S[^\n]*)"
+    rf"|(?P<underline>=+|-+){_WS}*{_EOL})"
+)
+_BULLET_RE = re.compile(rf"\n{_WS}*[-*+][ \t]{_WS}*\S")
+_FEATURE_RE = re.compile(rf"\n-[ \t]{_WS}*(\S[^\n]*)")
+_TEXT_LINE_RE = re.compile(rf"\n{_WS}*(\S[^\n]*)")
+_BADGE_RE = re.compile(r"\[!\[([^\]]*)\]\(([^)\s]+)[^)]*\)\]\(([^)\s]+)[^)]*\)|!\[([^\]]*)\]\(([^)\s]+)[^)]*\)")
+_BADGE_HOSTS = ("shields.io", "badge", "badgen.net", "travis-ci", "codecov.io", "circleci.com")
+_INSTALL_COMMANDS = (
+    rf"(?:sudo{_WS}+)?(?:"
+    rf"pip3?{_WS}+install|python3?{_WS}+-m{_WS}+pip{_WS}+install|uv{_WS}+(?:pip{_WS}+install|add)|"
+    rf"poetry{_WS}+(?:add|install)|conda{_WS}+install|pipx{_WS}+install|npm{_WS}+(?:install|i)|"
+    rf"yarn{_WS}+(?:add|install)|yarn(?={_WS}*{_EOL})|pnpm{_WS}+(?:add|install|i)|bun{_WS}+(?:add|install)|"
+    rf"npx{_WS}+\S+|cargo{_WS}+(?:install|add)|go{_WS}+(?:get|install)|brew{_WS}+install|"
+    rf"apt(?:-get)?{_WS}+install|gem{_WS}+install|composer{_WS}+(?:require|install)|"
+    rf"docker{_WS}+(?:pull|run)|docker(?:-|{_WS})compose{_WS}+up"
+    r")\b"
+)
+# every non-blank line of a code block, optionally after a "$ " prompt
+_CODE_INSTALL_RE = re.compile(rf"\n{_WS}*(?:\${_WS}*)?({_INSTALL_COMMANDS}[^\n]*?){_WS}*{_EOL}")
+# prose lines that are indented or start with a shell prompt / inline code
+_PROSE_INSTALL_RE = re.compile(
+    rf"\n(?:[ \t]{_WS}*|(?=[$`]))`*(?:\${_WS}*)?({_INSTALL_COMMANDS}[^\n]*?)`*{_WS}*{_EOL}"
+)
+_LICENSES = (
+    ("apache", "Apache-2.0"),
+    ("agpl", "AGPL-3.0"),
+    ("lgpl", "LGPL-3.0"),
+    ("gpl", "GPL-3.0"),
+    ("mpl", "MPL-2.0"),
+    ("mozilla public", "MPL-2.0"),
+    ("bsd-2", "BSD-2-Clause"),
+    ("bsd 2", "BSD-2-Clause"),
+    ("bsd", "BSD-3-Clause"),
+    ("isc", "ISC"),
+    ("unlicense", "Unlicense"),
+    ("cc0", "CC0-1.0"),
+    ("mit", "MIT"),
+)
+_LICENSE_WORD_RE = re.compile(r"\b(" + "|".join(re.escape(k) for k, _ in _LICENSES) + r")\b", re.IGNORECASE)
+
+
+def _new_section(title: str, level: int) -> Dict[str, Any]:
+    return {"title": title, "level": level, "words": 0, "bullets": 0, "code_blocks": 0, "children": []}
+
+
+def _license_name(text: str) -> Optional[str]:
+    m = _LICENSE_WORD_RE.search(text)
+    if not m:
+        return None
+    word = m.group(1).lower()
+    return next(spdx for key, spdx in _LICENSES if key == word)
+
+
+def _badge_only(line: str) -> bool:
+    return "![" in line and not _BADGE_RE.sub("", line).strip()
+
+
+class _Parser:
+    """State for one ``parse_readme`` call; blocks are fed in document order."""
+
+    def __init__(self, max_features: int, max_install_commands: int, max_badges: int,
+                 max_sections: Optional[int]):
+        self.max_features = max_features
+        self.max_install_commands = max_install_commands
+        self.max_badges = max_badges
+        self.max_sections = max_sections
+        self.root = _new_section("", 0)
+        self.stack: List[Dict[str, Any]] = [self.root]
+        self.sections = 0
+        self.description = ""
+        self.features: List[str] = []
+        self.installs: List[str] = []
+        self.badges: List[Dict[str, str]] = []
+        self.license: Optional[str] = None
+        self.in_license = False
+        self.word_count = 0
+        self.truncated = False
+
+    def feed(self, text: str) -> None:
+        """Walk the structural tokens of ``text``, which must start with "\\n".
+
+        Prose between two headings or fences goes to ``_body`` as one block,
+        the inside of a fenced block to ``_code``.
+        """
+        pos = 0  # start of the pending prose (or code) block
+        fence: Optional[str] = None
+        no_setext = 0  # a setext title cannot be the line ending here
+        for m in _TOKEN_RE.finditer(text):
+            kind = m.lastgroup  # "fence", "title" (ATX heading) or "underline"
+            if fence is not None:
+                if kind == "fence" and m.group("fence") == fence:
+                    self._code(text[pos:m.start()])
+                    fence = None
+                    pos = no_setext = m.end()
+                continue
+            start = m.start()
+            if kind == "fence":
+                self._body(text[pos:start])
+                self.stack[-1]["code_blocks"] += 1
+                fence = m.group("fence")
+                pos = m.end()
+                continue
+            if kind == "underline":
+                # setext: the previous non-blank line, unless it was a heading or fence
+                if start == no_setext:
+                    continue
+                title = text[text.rfind("\n", 0, start) + 1:start].strip()
+                if not title or title[0] in "-*+>":
+                    continue
+                level = 1 if m.group("underline")[0] == "=" else 2
+                self._body(text[pos:start])
+                # the title line was counted as body text of the previous section
+                words = len(title.split())
+                self.stack[-1]["words"] -= words
+                self.word_count -= words
+            else:
+                title = m.group("title").rstrip().rstrip("#").rstrip()
+                level = len(m.group("hashes"))
+                self._body(text[pos:start])
+            self.sections += 1
+            if self.max_sections is not None and self.sections > self.max_sections:
+                self.truncated = True
+                return
+            self._open(title, level)
+            pos = no_setext = m.end()
+        if fence is not None:
+            self._code(text[pos:])
+        else:
+            self._body(text[pos:])
+
+    def _code(self, block: str) -> None:
+        if len(self.installs) < self.max_install_commands:
+            self._add_installs(_CODE_INSTALL_RE.finditer(block))
+
+    def _open(self, title: str, level: int) -> None:
+        while self.stack[-1]["level"] >= level:
+            self.stack.pop()
+        section = _new_section(title, level)
+        self.stack[-1]["children"].append(section)
+        self.stack.append(section)
+        if not self.description:
+            self.description = title  # legacy: first non-empty line, heading marks stripped
+        self.in_license = "licen" in title.lower()
+        if self.license is None and self.in_license:
+            self.license = _license_name(title)
+
+    def _body(self, block: str) -> None:
+        if not block or block.isspace():
+            return
+        section = self.stack[-1]
+        words = len(block.split())
+        section["words"] += words
+        self.word_count += words
+        section["bullets"] += len(_BULLET_RE.findall(block))
+        if len(self.features) < self.max_features:
+            for m in _FEATURE_RE.finditer(block):
+                self.features.append(m.group(1).rstrip())
+                if len(self.features) >= self.max_features:
+                    break
+        # a license section's text names the license unless a badge line came first
+        text_license, text_line = None, len(block)
+        if self.in_license and self.license is None:
+            m = _LICENSE_WORD_RE.search(block)
+            if m:
+                text_license = _license_name(m.group(0))
+                text_line = block.rfind("\n", 0, m.start()) + 1
+        if "![" in block and len(self.badges) < self.max_badges:
+            self._add_badges(block, text_line)
+        if not self.description:
+            for m in _TEXT_LINE_RE.finditer(block):
+                line = m.group(1).rstrip()
+                if line[0] != "<" and not _badge_only(line):
+                    self.description = line.lstrip("# ")
+                    if self.description:
+                        break
+        if len(self.installs) < self.max_install_commands:
+            self._add_installs(_PROSE_INSTALL_RE.finditer(block))
+        if self.license is None:
+            self.license = text_license
+
+    def _add_badges(self, block: str, license_line: int) -> None:
+        """Badges of every line with ``![``; only lines up to ``license_line`` may set the license."""
+        at = block.find("![")
+        while at != -1 and len(self.badges) < self.max_badges:
+            end = block.find("\n", at)
+            end = len(block) if end == -1 else end
+            line_start = block.rfind("\n", 0, at) + 1
+            line = block[line_start:end]
+            for m in _BADGE_RE.finditer(line):
+                if m.group(2):
+                    alt, image, link = m.group(1), m.group(2), m.group(3)
+                else:
+                    alt, image, link = m.group(4), m.group(5), ""
+                if any(h in image for h in _BADGE_HOSTS) or image.endswith("badge.svg"):
+                    self.badges.append({"alt": alt, "image": image, "link": link})
+                    if (self.license is None and line_start <= license_line
+                            and "license" in (alt + image).lower()):
+                        self.license = _license_name(alt + " " + image.replace("%20", " "))
+            at = block.find("![", end)
+
+    def _add_installs(self, matches) -> None:
+        for m in matches:
+            command = m.group(1)
+            if command not in self.installs:
+                self.installs.append(command)
+                if len(self.installs) >= self.max_install_commands:
+                    return
+
+
+def parse_readme(
+    text: str,
+    max_features: int = 10,
+    max_install_commands: int = 10,
+    max_badges: int = 20,
+    max_sections: Optional[int] = None,
+    max_lines: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Tokenize ``text`` block by block.
+
+    Returns ``description``, ``features`` (``- `` bullets outside code blocks),
+    ``install_commands``, ``badges`` (``alt``/``image``/``link``), ``license``
+    (SPDX-style id or None), ``sections`` (heading tree; text before the first
+    heading is the level-0 root), ``word_count`` and ``truncated`` (a
+    ``max_lines``/``max_sections`` limit cut the scan short, so the counts only
+    cover the part that was read).
+    """
+    parser = _Parser(max_features, max_install_commands, max_badges, max_sections)
+    if max_lines is not None:
+        cut = -1
+        for _ in range(max_lines):
+            cut = text.find("\n", cut + 1)
+            if cut == -1:
+                break
+        if cut != -1 and cut + 1 < len(text):
+            text = text[:cut + 1]
+            parser.truncated = True
+    limited = parser.truncated
+    parser.truncated = False
+    parser.feed("\n" + text)
+    return {
+        "description": parser.description,
+        "features": parser.features,
+        "install_commands": parser.installs,
+        "badges": parser.badges,
+        "license": parser.license,
+        "sections": parser.root["children"],
+        "preamble_words": parser.root["words"],
+        "word_count": parser.word_count,
+        "truncated": limited or parser.truncated,
+    }
+
+
+def section_word_counts(sections: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Flatten the section tree to ``{title: words}`` (first occurrence of a title wins)."""
+    counts: Dict[str, int] = {}
+    todo = list(reversed(sections))
+    while todo:
+        section = todo.pop()
+        counts.setdefault(section["title"], section["words"])
+        todo.extend(reversed(section["children"]))
+    return counts
+
+
+__all__ = ["parse_readme", "section_word_counts"]
@@ -1,22 +1,9 @@
 """Analyzes collected repository artifacts to extract structured insights."""
 from __future__ import annotations
 
-import re
 from typing import Dict, Any, List
 
-
-def _extract_description(readme: str) -> str:
-    # naive: first non-empty line without markdown heading hashes
-    for line in readme.splitlines():
-        line = line.strip().lstrip("# ")
-        if line:
-            return line
-    return ""
-
-
-def _extract_features(readme: str) -> List[str]:
-    bullets = re.findall(r"^-\s+(.+)$", readme, flags=re.MULTILINE)
-    return bullets[:10]
+from analyzers.readme_parser import parse_readme, section_word_counts
 
 
 def analyze_repo(snapshot: Dict[str, Any]) -> Dict[str, Any]:
@@ -24,9 +11,10 @@ def analyze_repo(snapshot: Dict[str, Any]) -> Dict[str, Any]:
     readme = snapshot.get("readme_text", "")
     folders: List[str] = snapshot.get("folders", [])
     tech_stack: List[str] = snapshot.get("tech_stack", [])
-    description = snapshot.get("description") or _extract_description(readme)
+    parsed = parse_readme(readme)
+    description = snapshot.get("description") or parsed["description"]
     summary = readme[:500] + ("..." if len(readme) > 500 else "")
-    features = _extract_features(readme)
+    features = parsed["features"]
     return {
         "repo_name": snapshot.get("repo_name", ""),
         "description": description,
@@ -34,11 +22,25 @@ def analyze_repo(snapshot: Dict[str, Any]) -> Dict[str, Any]:
         "folders": folders,
         "main_files": snapshot.get("main_files", []),
         "tech_stack": tech_stack,
+        "stack": snapshot.get("stack", []),
         "features": features,
+        "install_commands": parsed["install_commands"],
+        "badges": parsed["badges"],
+        "license": parsed["license"],
+        "code_samples": [
+            {"path": e.get("path"), "excerpt": e.get("excerpt", "")}
+            for e in snapshot.get("main_file_excerpts", [])
+        ],
         "insights": {
             "readme_length": len(readme),
             "folder_count": len(folders),
-            "file_count": len(snapshot.get("file_list", [])),
+            "file_count": snapshot.get("file_count", len(snapshot.get("file_list", []))),
+            "total_bytes": snapshot.get("total_bytes", 0),
+            "language_bytes": snapshot.get("language_bytes", {}),
+            "readme_truncated": snapshot.get("readme_truncated", False),
+            "readme_parse_truncated": parsed["truncated"],
+            "readme_words": parsed["word_count"],
+            "section_words": section_word_counts(parsed["sections"]),
         },
     }
 
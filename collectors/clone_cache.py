@@ -0,0 +1,263 @@
+"""Persistent, content-addressed clone cache.
+
+Checkouts live under ``root/<key>`` where ``key`` is derived from the normalized
+repository URL. ``git ls-remote`` decides whether a cached checkout is still at the
+remote HEAD; unchanged repos are reused as-is, moved repos are re-cloned. Entries
+are evicted least-recently-used first once ``max_entries`` or ``max_bytes`` is hit.
+``checkout`` pins the entry it returns until ``release`` (or use ``pinned``), so
+eviction never deletes a checkout another thread is still reading; pinned
+entries are skipped and evicted once the last pin is released.
+
+``mode="sparse"`` makes a partial clone (``--filter=blob:none``) and checks out
+only ``SPARSE_PATTERNS`` — READMEs, entry-file and manifest candidates — so the
+blobs of everything else are never downloaded. The path list still covers the
+whole tree (``git ls-tree``), but file sizes are only known for checked-out files.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+def normalize_repo_url(repo_url: str) -> str:
+    """Canonical form used as cache key: https scheme, lowercase host, no `.git`/slash."""
+    url = repo_url.strip()
+    m = re.match(r"^[\w.-]+@([^:]+):(.+)$", url)  # scp-like git@host:owner/repo
+    if m:
+        url = f"https://{m.group(1)}/{m.group(2)}"
+    url = url.rstrip("/")
+    if url.endswith(".git"):
+        url = url[:-4]
+    m = re.match(r"^(?:https?|git|ssh)://(?:[^@/]+@)?([^/]+)(/.*)?$", url)
+    if not m:
+        return url  # local path or something exotic; keep verbatim
+    host, path = m.group(1).lower(), m.group(2) or ""
+    if host in ("github.com", "www.github.com"):
+        host, path = "github.com", path.lower()
+    return f"https://{host}{path}"
+
+
+CLONE_MODES = ("full", "sparse")
+
+_README = "[Rr][Ee][Aa][Dd][Mm][Ee]*"
+# gitignore-style, anchored at the repo root; mirrors find_readme and MAIN_FILE_RE
+SPARSE_PATTERNS = (
+    f"/{_README}", f"/docs/{_README}", f"/.github/{_README}",
+    "/main.*", "/app.*", "/server.*", "/index.*",
+    "/src/main.*", "/src/app.*", "/src/server.*", "/src/index.*",
+    "/package.json", "/requirements*.txt", "/pyproject.toml", "/setup.py", "/setup.cfg",
+    "/Cargo.toml", "/go.mod", "/.gitignore",
+)
+
+
+def _git(args: List[str], cwd: Optional[Path] = None, timeout: float = 300) -> str:
+    result = subprocess.run(
+        ["git", *args], cwd=cwd, capture_output=True, text=True, check=False, timeout=timeout
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or "git command failed")
+    return result.stdout
+
+
+def remote_head_sha(repo_url: str, timeout: float = 30) -> Optional[str]:
+    """Return the remote HEAD commit SHA, or None when the remote is unreachable."""
+    try:
+        out = _git(["ls-remote", repo_url, "HEAD"], timeout=timeout)
+    except Exception:
+        return None
+    line = out.split("\n", 1)[0].strip()
+    return line.split()[0] if line else None
+
+
+def git_clone(
+    repo_url: str, dest: Path, mode: str = "full", patterns: Tuple[str, ...] = SPARSE_PATTERNS
+) -> None:
+    """Shallow-clone ``repo_url`` into ``dest``; ``sparse`` skips unneeded blobs.
+
+    Servers without filter support ignore ``--filter`` and send every blob, so a
+    sparse clone is never worse than a full one.
+    """
+    if mode == "full":
+        _git(["clone", "--depth", "1", repo_url, str(dest)])
+        return
+    if mode != "sparse":
+        raise ValueError(f"clone mode must be one of {CLONE_MODES}, got {mode!r}")
+    _git(["clone", "--depth", "1", "--filter=blob:none", "--no-checkout", repo_url, str(dest)])
+    _git(["config", "core.sparseCheckout", "true"], cwd=dest)
+    info = dest / ".git" / "info"
+    info.mkdir(parents=True, exist_ok=True)
+    (info / "sparse-checkout").write_text("\n".join(patterns) + "\n", encoding="utf-8")
+    _git(["checkout", "--quiet"], cwd=dest)
+
+
+def local_head_sha(repo_path: Path) -> Optional[str]:
+    try:
+        return _git(["rev-parse", "HEAD"], cwd=repo_path).strip() or None
+    except Exception:
+        return None
+
+
+def _dir_size(path: Path) -> int:
+    total = 0
+    for dirpath, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class CloneCache:
+    def __init__(
+        self,
+        root: Path,
+        max_entries: int = 64,
+        max_bytes: Optional[int] = 5 * 1024**3,
+        mode: str = "full",
+    ):
+        if mode not in CLONE_MODES:
+            raise ValueError(f"clone mode must be one of {CLONE_MODES}, got {mode!r}")
+        self.root = root
+        self.mode = mode
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._index_path = self.root / "index.json"
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._pins: Dict[str, int] = {}
+        self._index: Dict[str, Dict[str, Any]] = self._load_index()
+
+    # Public API -------------------------------------------------------
+    @staticmethod
+    def key_for(repo_url: str) -> str:
+        return hashlib.sha1(normalize_repo_url(repo_url).encode("utf-8")).hexdigest()[:16]
+
+    def checkout(self, repo_url: str) -> Tuple[Path, Dict[str, Any]]:
+        """Return ``(path, info)`` for an up-to-date checkout of ``repo_url``.
+
+        The entry stays pinned (safe from eviction) until ``release(info["key"])``.
+        ``info["cache"]`` is ``hit`` (SHA unchanged), ``stale`` (remote unreachable,
+        cached copy reused), ``refresh`` (remote moved or cached in another clone
+        mode, re-cloned) or ``miss``.
+        """
+        key = self.key_for(repo_url)
+        path = self.root / key
+        with self._key_lock(key):
+            remote_sha = remote_head_sha(repo_url)
+            with self._lock:
+                entry = dict(self._index.get(key) or {})
+            cached = bool(entry) and path.exists()
+            same_mode = entry.get("mode", "full") == self.mode
+            if cached and same_mode and (remote_sha is None or remote_sha == entry.get("sha")):
+                status = "hit" if remote_sha else "stale"
+            else:
+                self._clone_into(repo_url, path, key)
+                status = "refresh" if cached else "miss"
+                entry = {
+                    "url": normalize_repo_url(repo_url),
+                    "sha": local_head_sha(path) or remote_sha,
+                    "bytes": _dir_size(path),
+                    "mode": self.mode,
+                }
+            entry["last_used"] = time.time()
+            with self._lock:
+                self._index[key] = entry
+                self._pins[key] = self._pins.get(key, 0) + 1
+                self._evict_locked()
+                self._save_index_locked()
+        return path, {"cache": status, "sha": entry.get("sha"), "key": key, "mode": self.mode}
+
+    def release(self, key: str) -> None:
+        """Drop one pin taken by ``checkout``; evicts anything that was waiting on it."""
+        with self._lock:
+            count = self._pins.get(key, 0) - 1
+            if count > 0:
+                self._pins[key] = count
+                return
+            self._pins.pop(key, None)
+            self._evict_locked()
+            self._save_index_locked()
+
+    @contextmanager
+    def pinned(self, repo_url: str) -> Iterator[Tuple[Path, Dict[str, Any]]]:
+        """``checkout`` as a context manager that releases the pin on exit."""
+        path, info = self.checkout(repo_url)
+        try:
+            yield path, info
+        finally:
+            self.release(info["key"])
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {k: dict(v) for k, v in self._index.items()}
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(int(e.get("bytes", 0)) for e in self._index.values())
+
+    # Internal helpers -------------------------------------------------
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _clone_into(self, repo_url: str, path: Path, key: str) -> None:
+        tmp = self.root / f".{key}.tmp-{os.getpid()}-{threading.get_ident()}"
+        shutil.rmtree(tmp, ignore_errors=True)
+        try:
+            git_clone(repo_url, tmp, self.mode)
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp, path)
+
+    def _evict_locked(self) -> None:
+        def over_budget() -> bool:
+            if len(self._index) > self.max_entries:
+                return True
+            if self.max_bytes is None:
+                return False
+            return sum(int(e.get("bytes", 0)) for e in self._index.values()) > self.max_bytes
+
+        by_age = sorted(self._index.items(), key=lambda kv: kv[1].get("last_used", 0))
+        for key, _entry in by_age:
+            if not over_budget():
+                break
+            if self._pins.get(key):
+                continue  # in use; evicted when released
+            self._index.pop(key, None)
+            shutil.rmtree(self.root / key, ignore_errors=True)
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            data = json.loads(self._index_path.read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+        return {k: v for k, v in data.items() if (self.root / k).exists()}
+
+    def _save_index_locked(self) -> None:
+        tmp = self._index_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(self._index, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, self._index_path)
+
+
+__all__ = [
+    "CLONE_MODES",
+    "SPARSE_PATTERNS",
+    "CloneCache",
+    "git_clone",
+    "normalize_repo_url",
+    "remote_head_sha",
+    "local_head_sha",
+]
@@ -0,0 +1,132 @@
+"""Bounded, encoding-aware file reads for READMEs and source excerpts.
+
+``read_bounded`` never reads more than ``max_bytes`` from disk, flags binary
+files (NUL byte in the first block) and files above ``skip_over`` without
+decoding them, and decodes via BOM → UTF-8 → CP949 → Latin-1. A multi-byte
+character split by the byte cap is dropped rather than turned into garbage.
+"""
+from __future__ import annotations
+
+import codecs
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_README_MAX_BYTES = 256 * 1024
+DEFAULT_EXCERPT_BYTES = 4 * 1024
+DEFAULT_EXCERPT_SKIP_OVER = 1024 * 1024  # bigger "source" files are bundles/generated
+SNIFF_BYTES = 8192
+
+# lower-cased README names in order of preference
+README_NAMES = ("readme.md", "readme.markdown", "readme.rst", "readme.txt", "readme")
+README_DIRS = ("", "docs", ".github")
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+_FALLBACK_ENCODINGS = ("utf-8", "cp949")
+
+
+def _decode(data: bytes, truncated: bool) -> tuple[str, str]:
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return codecs.getincrementaldecoder(encoding)("replace").decode(data, final=not truncated), encoding
+    for encoding in _FALLBACK_ENCODINGS:
+        try:
+            # final=False tolerates a character cut in half by the byte cap
+            return codecs.getincrementaldecoder(encoding)("strict").decode(data, final=not truncated), encoding
+        except UnicodeDecodeError:
+            continue
+    return data.decode("latin-1"), "latin-1"
+
+
+def read_bounded(
+    path: Path, max_bytes: int = DEFAULT_README_MAX_BYTES, skip_over: Optional[int] = None
+) -> Dict[str, Any]:
+    """Read at most ``max_bytes`` of ``path``.
+
+    Returns ``text``, ``size`` (on disk), ``bytes_read``, ``truncated``,
+    ``encoding`` and ``skipped`` (``None``, ``"binary"`` or ``"oversized"``).
+    """
+    result: Dict[str, Any] = {
+        "text": "", "size": 0, "bytes_read": 0, "truncated": False, "encoding": None, "skipped": None,
+    }
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        result["size"] = size
+        if skip_over is not None and size > skip_over:
+            result["skipped"] = "oversized"
+            return result
+        data = f.read(max(0, max_bytes))
+    result["bytes_read"] = len(data)
+    head = data[:SNIFF_BYTES]
+    if b"\0" in head and not head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        result["skipped"] = "binary"
+        return result
+    truncated = size > len(data)
+    result["text"], result["encoding"] = _decode(data, truncated)
+    result["truncated"] = truncated
+    return result
+
+
+def _scan_names(directory: Path) -> Dict[str, str]:
+    """Lower-cased name → real name for regular files in ``directory`` (one scandir)."""
+    names: Dict[str, str] = {}
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_file():
+                    names.setdefault(entry.name.lower(), entry.name)
+    except OSError:
+        pass
+    return names
+
+
+def find_readme(repo_path: Path) -> Optional[Path]:
+    """First README variant, matched case-insensitively: root, then ``docs/``, ``.github/``."""
+    for subdir in README_DIRS:
+        directory = repo_path / subdir if subdir else repo_path
+        names = _scan_names(directory)
+        for candidate in README_NAMES:
+            if candidate in names:
+                return directory / names[candidate]
+    return None
+
+
+def sample_files(
+    repo_path: Path,
+    paths: Iterable[str],
+    max_bytes: int = DEFAULT_EXCERPT_BYTES,
+    max_files: int = 8,
+    skip_over: int = DEFAULT_EXCERPT_SKIP_OVER,
+) -> List[Dict[str, Any]]:
+    """Leading excerpts of up to ``max_files`` text files; binary/oversized ones are skipped."""
+    samples: List[Dict[str, Any]] = []
+    for rel in paths:
+        if len(samples) >= max_files:
+            break
+        try:
+            read = read_bounded(repo_path / rel, max_bytes, skip_over=skip_over)
+        except OSError:
+            continue
+        if read["skipped"]:
+            continue
+        samples.append({
+            "path": rel,
+            "excerpt": read["text"],
+            "truncated": read["truncated"],
+            "size": read["size"],
+            "bytes_read": read["bytes_read"],
+        })
+    return samples
+
+
+__all__ = [
+    "read_bounded",
+    "find_readme",
+    "sample_files",
+    "DEFAULT_README_MAX_BYTES",
+    "DEFAULT_EXCERPT_BYTES",
+]
@@ -0,0 +1,261 @@
+"""Small GitHub REST client used by the collector.
+
+Adds what the one-shot ``urlopen`` call lacked:
+- persistent on-disk response cache with ETag / ``If-None-Match`` revalidation
+  (304 responses do not count against the rate limit),
+- ``Link`` header pagination,
+- keep-alive connections reused per thread,
+- rate-limit aware backoff driven by ``X-RateLimit-*`` / ``Retry-After``.
+
+Every failure degrades to the cached body or ``None`` so collection keeps
+working offline, mirroring the original ``fetch_contributors`` contract.
+"""
+from __future__ import annotations
+
+import hashlib
+import http.client
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+_LINK_RE = re.compile(r'<([^>]+)>\s*;\s*rel="([^"]+)"')
+
+
+def parse_link_header(value: Optional[str]) -> Dict[str, str]:
+    """``{rel: url}`` from a GitHub ``Link`` header."""
+    return {rel: url for url, rel in _LINK_RE.findall(value or "")}
+
+
+def parse_repo_url(repo_url: str) -> Optional[Tuple[str, str]]:
+    m = re.match(r"https?://[^/]+/([^/]+)/([^/#?]+)", repo_url)
+    if not m:
+        return None
+    repo = m.group(2)
+    return m.group(1), repo[:-4] if repo.endswith(".git") else repo
+
+
+class GitHubClient:
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        cache_dir: Optional[Path] = None,
+        base_url: str = "https://api.github.com",
+        timeout: float = 8.0,
+        max_retries: int = 3,
+        max_wait: float = 60.0,
+        user_agent: str = "auto-github-blogger",
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.token = token
+        self.cache_dir = cache_dir
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.user_agent = user_agent
+        self._sleep = sleep
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "not_modified": 0, "cache_fallbacks": 0, "rate_limited": 0}
+        self.rate_limit: Dict[str, Optional[int]] = {"remaining": None, "reset": None}
+        if cache_dir is not None:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # Public API -------------------------------------------------------
+    def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        return self._get(self._url(path, params))[0]
+
+    def paginate(
+        self, path: str, params: Optional[Dict[str, Any]] = None, max_pages: int = 10
+    ) -> List[Any]:
+        """Concatenate list pages by following ``rel="next"`` links."""
+        items: List[Any] = []
+        url: Optional[str] = self._url(path, {"per_page": 100, **(params or {})})
+        for _ in range(max_pages):
+            if not url:
+                break
+            data, links = self._get(url)
+            if not isinstance(data, list):
+                break
+            items.extend(data)
+            url = links.get("next")
+        return items
+
+    def contributors(self, owner: str, repo: str, max_pages: int = 10) -> List[str]:
+        data = self.paginate(f"/repos/{owner}/{repo}/contributors", max_pages=max_pages)
+        return [c.get("login", "") for c in data if isinstance(c, dict)]
+
+    def repo_metadata(self, owner: str, repo: str) -> Dict[str, Any]:
+        data = self.get_json(f"/repos/{owner}/{repo}")
+        if not isinstance(data, dict):
+            return {}
+        license_info = data.get("license") or {}
+        return {
+            "description": data.get("description") or "",
+            "stars": data.get("stargazers_count", 0),
+            "forks": data.get("forks_count", 0),
+            "topics": data.get("topics") or [],
+            "language": data.get("language"),
+            "homepage": data.get("homepage") or "",
+            "license": license_info.get("spdx_id") if isinstance(license_info, dict) else None,
+            "default_branch": data.get("default_branch"),
+        }
+
+    def thread_requests(self) -> int:
+        """HTTP requests issued by the calling thread (for per-repo accounting)."""
+        return getattr(self._local, "requests", 0)
+
+    def close(self) -> None:
+        for conn in getattr(self._local, "conns", {}).values():
+            conn.close()
+        self._local.conns = {}
+
+    # Internal helpers -------------------------------------------------
+    def _url(self, path: str, params: Optional[Dict[str, Any]] = None) -> str:
+        url = path if "://" in path else f"{self.base_url}/{path.lstrip('/')}"
+        if params:
+            url += ("&" if "?" in url else "?") + urlencode(params)
+        return url
+
+    def _get(self, url: str) -> Tuple[Any, Dict[str, str]]:
+        """``(json_body, links)``; falls back to the cached copy, else ``(None, {})``."""
+        cached = self._cache_read(url)
+        if cached is not None and self._rate_limited_for() > self.max_wait:
+            self._bump("cache_fallbacks")
+            return json.loads(cached["body"]), cached.get("links", {})
+        headers = {
+            "User-Agent": self.user_agent,
+            "Accept": "application/vnd.github+json",
+        }
+        if self.token:
+            headers["Authorization"] = f"token {self.token}"
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                status, resp_headers, body = self._send(url, headers)
+            except (OSError, http.client.HTTPException):
+                break
+            self._update_rate_limit(resp_headers)
+            links = parse_link_header(resp_headers.get("link"))
+            if status == 304 and cached is not None:
+                self._bump("not_modified")
+                return json.loads(cached["body"]), cached.get("links", {})
+            if 200 <= status < 300:
+                text = body.decode("utf-8", errors="replace")
+                try:
+                    data = json.loads(text) if text else None
+                except ValueError:
+                    break
+                self._cache_write(url, resp_headers.get("etag"), text, links)
+                return data, links
+            if status in (403, 429) and self._is_rate_limited(resp_headers):
+                self._bump("rate_limited")
+                wait = self._retry_after(resp_headers)
+                if attempt < self.max_retries and wait <= self.max_wait:
+                    self._sleep(wait)
+                    continue
+                break
+            if status >= 500 and attempt < self.max_retries:
+                self._sleep(min(self.max_wait, 0.5 * 2**attempt))
+                continue
+            break
+        if cached is not None:
+            self._bump("cache_fallbacks")
+            return json.loads(cached["body"]), cached.get("links", {})
+        return None, {}
+
+    def _send(self, url: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        parts = urlsplit(url)
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+        self._bump("requests")
+        self._local.requests = getattr(self._local, "requests", 0) + 1
+        for retry in (True, False):
+            conn = self._conn(parts.scheme, parts.netloc)
+            try:
+                conn.request("GET", target or "/", headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+                return resp.status, {k.lower(): v for k, v in resp.getheaders()}, body
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                conn.close()  # stale keep-alive socket; reconnect once
+                if not retry:
+                    raise
+        raise http.client.HTTPException("unreachable")
+
+    def _conn(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        key = (scheme, netloc)
+        if key not in conns:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conns[key] = cls(netloc, timeout=self.timeout)
+        return conns[key]
+
+    def _update_rate_limit(self, headers: Dict[str, str]) -> None:
+        remaining, reset = headers.get("x-ratelimit-remaining"), headers.get("x-ratelimit-reset")
+        with self._lock:
+            if remaining is not None and remaining.isdigit():
+                self.rate_limit["remaining"] = int(remaining)
+            if reset is not None and reset.isdigit():
+                self.rate_limit["reset"] = int(reset)
+
+    def _rate_limited_for(self) -> float:
+        """Seconds until the known rate-limit window resets (0 when not exhausted)."""
+        with self._lock:
+            remaining, reset = self.rate_limit["remaining"], self.rate_limit["reset"]
+        if remaining != 0 or reset is None:
+            return 0.0
+        return max(0.0, reset - time.time())
+
+    @staticmethod
+    def _is_rate_limited(headers: Dict[str, str]) -> bool:
+        return headers.get("x-ratelimit-remaining") == "0" or "retry-after" in headers
+
+    @staticmethod
+    def _retry_after(headers: Dict[str, str]) -> float:
+        retry_after = headers.get("retry-after", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+        reset = headers.get("x-ratelimit-reset", "")
+        if reset.isdigit():
+            return max(1.0, int(reset) - time.time())
+        return 60.0
+
+    def _bump(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _cache_path(self, url: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        key = hashlib.sha1(f"{url}|{bool(self.token)}".encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    def _cache_read(self, url: str) -> Optional[Dict[str, Any]]:
+        path = self._cache_path(url)
+        if path is None:
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+
+    def _cache_write(self, url: str, etag: Optional[str], body: str, links: Dict[str, str]) -> None:
+        path = self._cache_path(url)
+        if path is None or not body:
+            return
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        payload = {"url": url, "etag": etag, "body": body, "links": links}
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+__all__ = ["GitHubClient", "parse_link_header", "parse_repo_url"]
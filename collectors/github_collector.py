@@ -6,11 +6,36 @@ from __future__ import annotations
 
 import json
 import os
-import re
+import shutil
 import subprocess
-import urllib.request
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import TYPE_CHECKING, ContextManager, Dict, Any, Iterable, List, Optional
+
+from collectors.github_api import GitHubClient, parse_repo_url
+from collectors.clone_cache import CloneCache, git_clone, local_head_sha, normalize_repo_url
+from collectors.file_reader import (
+    DEFAULT_EXCERPT_BYTES,
+    DEFAULT_README_MAX_BYTES,
+    find_readme,
+    read_bounded,
+    sample_files,
+)
+from collectors.repo_scanner import RepoScanner
+from collectors.stack_detect import detect_stack, read_manifests, stack_names
+from collectors.tree_walk import (
+    DEFAULT_IGNORED_DIRS,
+    is_sparse_checkout,
+    iter_repo_entries,
+    iter_repo_files,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pipeline.metrics import RunMetrics
+
+
+def _stage(metrics: Optional["RunMetrics"], name: str) -> ContextManager[None]:
+    return metrics.stage(name) if metrics is not None else nullcontext()
 
 
 def _run(cmd: List[str], cwd: Path | None = None) -> str:
@@ -20,130 +45,193 @@ def _run(cmd: List[str], cwd: Path | None = None) -> str:
     return result.stdout
 
 
-def clone_repo(repo_url: str, dest_dir: Path) -> Path:
+def _origin_url(repo_path: Path) -> str:
+    try:
+        return _run(["git", "config", "--get", "remote.origin.url"], cwd=repo_path).strip()
+    except Exception:
+        return ""
+
+
+def clone_repo(
+    repo_url: str, dest_dir: Path, cache: Optional[CloneCache] = None, mode: str = "full"
+) -> Path:
+    """Shallow-clone ``repo_url``; served from ``cache`` (and its mode) when one is given.
+
+    A cached checkout is not pinned once returned; use ``CloneCache.pinned`` to
+    keep it from being evicted while reading. Without a cache the checkout at ``dest_dir / "repo"`` is only reused when its
+    origin is the same repository, otherwise it is replaced. ``mode="sparse"``
+    makes a blobless partial clone with a sparse checkout (see ``git_clone``).
+    """
+    if cache is not None:
+        path, info = cache.checkout(repo_url)
+        cache.release(info["key"])
+        return path
     dest_dir.mkdir(parents=True, exist_ok=True)
     repo_path = dest_dir / "repo"
     if repo_path.exists():
-        return repo_path
-    _run(["git", "clone", "--depth", "1", repo_url, str(repo_path)])
+        same_origin = normalize_repo_url(_origin_url(repo_path)) == normalize_repo_url(repo_url)
+        if same_origin and is_sparse_checkout(repo_path) == (mode == "sparse"):
+            return repo_path
+        shutil.rmtree(repo_path)
+    git_clone(repo_url, repo_path, mode)
     return repo_path
 
 
-def read_readme(repo_path: Path) -> str:
-    for name in ("README.md", "README.MD", "readme.md"):
-        p = repo_path / name
-        if p.exists():
-            return p.read_text(encoding="utf-8", errors="ignore")
-    return ""
+def read_readme(repo_path: Path, max_bytes: int = DEFAULT_README_MAX_BYTES) -> str:
+    """README text (any case/extension; root, ``docs/`` or ``.github/``), capped at ``max_bytes``."""
+    return read_readme_info(repo_path, max_bytes)["text"]
 
 
-def tree_paths(repo_path: Path) -> List[str]:
-    paths: List[str] = []
-    for p in repo_path.rglob("*"):
-        if p.is_dir():
-            continue
-        rel = p.relative_to(repo_path)
-        parts = rel.parts
-        if ".git" in parts:
-            continue
-        paths.append(str(rel))
-    return paths
+def read_readme_info(repo_path: Path, max_bytes: int = DEFAULT_README_MAX_BYTES) -> Dict[str, Any]:
+    """``read_bounded`` result for the README plus its repo-relative ``path``."""
+    path = find_readme(repo_path)
+    if path is None:
+        return {"text": "", "path": None, "bytes_read": 0, "truncated": False, "skipped": None}
+    info = read_bounded(path, max_bytes)
+    info["path"] = path.relative_to(repo_path).as_posix()
+    return info
 
 
-def guess_tech_stack(paths: List[str], readme: str) -> List[str]:
-    stack: set[str] = set()
-    ext_map = {
-        ".py": "python",
-        ".js": "javascript",
-        ".ts": "typescript",
-        ".tsx": "typescript",
-        ".jsx": "javascript",
-        ".go": "go",
-        ".rs": "rust",
-        ".java": "java",
-        ".rb": "ruby",
-        ".php": "php",
-        ".swift": "swift",
-        ".kt": "kotlin",
-    }
-    for path in paths:
-        ext = Path(path).suffix
-        if ext in ext_map:
-            stack.add(ext_map[ext])
-    # simple README keyword sniffing
-    keywords = {
-        "supabase": "supabase",
-        "fastapi": "fastapi",
-        "flask": "flask",
-        "django": "django",
-        "react": "react",
-        "next.js": "next.js",
-        "vite": "vite",
-        "docker": "docker",
-    }
-    lower = readme.lower()
-    for k, v in keywords.items():
-        if k in lower:
-            stack.add(v)
-    return sorted(stack)
+def tree_paths(
+    repo_path: Path,
+    ignore_dirs: Iterable[str] = DEFAULT_IGNORED_DIRS,
+    ignore_patterns: Iterable[str] = (),
+    use_gitignore: bool = False,
+    use_git: bool = True,
+) -> List[str]:
+    """Repo-relative file paths, pruning `.git`/`node_modules`/vendor dirs up front."""
+    return list(iter_repo_files(repo_path, ignore_dirs, ignore_patterns, use_gitignore, use_git))
+
 
+class CollectError(RuntimeError):
+    """A repository could not be cloned or read."""
 
-def collect_repo(repo_url: str, dest_dir: Path = Path("/tmp/github_repo")) -> Dict[str, Any]:
+
+def guess_tech_stack(paths: List[str], readme: str) -> List[str]:
+    return stack_names(detect_stack(paths, readme))
+
+
+def collect_repo(
+    repo_url: str,
+    dest_dir: Path = Path("/tmp/github_repo"),
+    cache: Optional[CloneCache] = None,
+    file_list_limit: Optional[int] = None,
+    api: Optional[GitHubClient] = None,
+    metrics: Optional["RunMetrics"] = None,
+    readme_max_bytes: int = DEFAULT_README_MAX_BYTES,
+    excerpt_bytes: int = DEFAULT_EXCERPT_BYTES,
+    clone_mode: str = "full",
+) -> Dict[str, Any]:
     """Clone repo, read README, compute tree and basic metadata.
-    If cloning fails (e.g., offline), returns minimal fallback structure.
+    If cloning fails (e.g., offline), returns minimal fallback structure whose
+    ``error`` field names the failure (the key is absent on success).
+    ``file_list_limit`` caps the paths kept in ``file_list`` (0 omits it); counts
+    and histograms always cover the whole tree. ``metrics`` receives
+    ``collect.*`` stage timings and walk/HTTP counters. The README is read up to
+    ``readme_max_bytes`` and each main file contributes an ``excerpt_bytes`` sample.
+    ``clone_mode`` applies without a ``cache`` (a cache clones in its own mode).
     """
     repo_name = repo_url.rstrip("/").split("/")[-1]
+    commit_sha = None
+    cache_status = None
+    readme = {"text": "", "path": None, "bytes_read": 0, "truncated": False}
+    excerpts: List[Dict[str, Any]] = []
+    manifests: Dict[str, List[str]] = {}
+    scanner = RepoScanner(file_list_limit=file_list_limit)
+    pin: Optional[str] = None
+    error: Optional[str] = None
     try:
-        repo_path = clone_repo(repo_url, dest_dir)
-        readme_text = read_readme(repo_path)
-        files = tree_paths(repo_path)
-        folders = sorted({str(Path(f).parent) for f in files if "/" in f})
-    except Exception:
+        with _stage(metrics, "collect.clone"):
+            if cache is not None:
+                repo_path, info = cache.checkout(repo_url)
+                pin = info["key"]  # held until the checkout has been read
+                commit_sha, cache_status = info.get("sha"), info.get("cache")
+            else:
+                repo_path = clone_repo(repo_url, dest_dir, mode=clone_mode)
+                commit_sha = local_head_sha(repo_path)
+        with _stage(metrics, "collect.readme"):
+            readme = read_readme_info(repo_path, readme_max_bytes)
+        with _stage(metrics, "collect.tree_walk"):
+            scanner.feed(iter_repo_entries(repo_path))
+        with _stage(metrics, "collect.excerpts"):
+            excerpts = sample_files(repo_path, scanner.main_files, max_bytes=excerpt_bytes)
+        with _stage(metrics, "collect.manifests"):
+            manifests = read_manifests(repo_path, os.listdir(repo_path))
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
         repo_path = None
-        readme_text = ""
-        files = []
-        folders = []
-
-    main_files = [f for f in files if re.match(r"(src/)?(main|app|server|index)\.(py|js|ts|tsx|go)$", f)]
-    tech_stack = guess_tech_stack(files, readme_text)
-    contributors = fetch_contributors(repo_url)
-
-    return {
+        readme = {"text": "", "path": None, "bytes_read": 0, "truncated": False}
+        excerpts = []
+        manifests = {}
+        scanner = RepoScanner(file_list_limit=file_list_limit)
+    finally:
+        if pin is not None:
+            cache.release(pin)
+
+    readme_text = readme["text"]
+    scan = scanner.result(readme_text, manifests)
+    api = api or GitHubClient(token=os.getenv("GITHUB_TOKEN"))
+    http_before = api.thread_requests()
+    with _stage(metrics, "collect.github_api"):
+        contributors = fetch_contributors(repo_url, api)
+        metadata = fetch_repo_metadata(repo_url, api)
+    if metrics is not None:
+        metrics.incr("files_walked", scan["file_count"])
+        metrics.incr("bytes_read", readme["bytes_read"] + sum(e["bytes_read"] for e in excerpts))
+        metrics.incr("http_calls", api.thread_requests() - http_before)
+
+    snapshot = {
         "repo_name": repo_name,
-        "description": "",  # filled by analyzer
+        "description": metadata.get("description", ""),  # analyzer falls back to README
+        "stars": metadata.get("stars", 0),
+        "topics": metadata.get("topics", []),
         "readme_text": readme_text,
-        "folders": folders,
-        "main_files": main_files,
-        "tech_stack": tech_stack,
+        "readme_path": readme["path"],
+        "readme_truncated": readme["truncated"],
+        "main_file_excerpts": [
+            {"path": e["path"], "excerpt": e["excerpt"], "truncated": e["truncated"]} for e in excerpts
+        ],
+        "folders": scan["folders"],
+        "main_files": scan["main_files"],
+        "tech_stack": scan["tech_stack"],
+        "stack": scan["stack"],
         "contributors": contributors,
-        "file_list": files,
+        "file_list": scan["file_list"],
+        "file_count": scan["file_count"],
+        "file_list_truncated": scan["file_list_truncated"],
+        "total_bytes": scan["total_bytes"],
+        "extension_histogram": scan["extension_histogram"],
+        "language_bytes": scan["language_bytes"],
         "repo_path": str(repo_path) if repo_path else None,
+        "commit_sha": commit_sha,
+        "clone_cache": cache_status,
     }
+    if error is not None:
+        snapshot["error"] = error
+    return snapshot
 
 
-def fetch_contributors(repo_url: str) -> List[str]:
-    """Lightweight GitHub contributors fetch; returns [] when offline or rate-limited."""
-    token = os.getenv("GITHUB_TOKEN")
-    m = re.match(r"https?://[^/]+/([^/]+)/([^/]+)", repo_url)
-    if not m:
-        return []
-    owner, repo = m.group(1), m.group(2)
-    api = f"https://api.github.com/repos/{owner}/{repo}/contributors"
-    headers = {"User-Agent": "auto-github-blogger"}
-    if token:
-        headers["Authorization"] = f"token {token}"
-    req = urllib.request.Request(api, headers=headers)
-    try:
-        with urllib.request.urlopen(req, timeout=8) as resp:
-            data = json.loads(resp.read().decode())
-            return [c.get("login", "") for c in data if isinstance(c, dict)]
-    except Exception:
+def fetch_contributors(repo_url: str, client: Optional[GitHubClient] = None) -> List[str]:
+    """GitHub contributors (all pages); returns [] when offline or rate-limited."""
+    parsed = parse_repo_url(repo_url)
+    if not parsed:
         return []
+    client = client or GitHubClient(token=os.getenv("GITHUB_TOKEN"))
+    return client.contributors(*parsed)
+
+
+def fetch_repo_metadata(repo_url: str, client: Optional[GitHubClient] = None) -> Dict[str, Any]:
+    """Stars, description, topics, ...; returns {} when offline or rate-limited."""
+    parsed = parse_repo_url(repo_url)
+    if not parsed:
+        return {}
+    client = client or GitHubClient(token=os.getenv("GITHUB_TOKEN"))
+    return client.repo_metadata(*parsed)
 
 
 def save_snapshot(data: Dict[str, Any], path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    path.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
 
 
-__all__ = ["collect_repo", "save_snapshot", "clone_repo"]
+__all__ = ["CollectError", "collect_repo", "save_snapshot", "clone_repo"]
@@ -0,0 +1,113 @@
+"""Single-pass repository scanner.
+
+``RepoScanner`` consumes the tree walk as a stream of ``(path, size)`` entries and
+derives folders, entry files, extension histogram and per-language byte counts in
+one pass, so the full path list never has to be materialized more than once.
+"""
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from collectors.stack_detect import (
+    EXTENSION_LANGUAGES,
+    README_KEYWORDS,
+    detect_stack,
+    path_suffix,
+    readme_keywords,
+    stack_names,
+)
+
+MAIN_FILE_RE = re.compile(r"(src/)?(main|app|server|index)\.(py|js|ts|tsx|go)$")
+
+Entry = Union[str, Tuple[str, Optional[int]]]
+
+
+class RepoScanner:
+    """Accumulates repo metadata from a stream of paths.
+
+    ``file_list_limit`` caps the paths retained for the snapshot (``None`` keeps
+    all, ``0`` keeps none); every other aggregate is bounded by the number of
+    distinct folders/extensions rather than the number of files.
+    """
+
+    def __init__(self, file_list_limit: Optional[int] = None):
+        self.file_list_limit = file_list_limit
+        self.file_list: List[str] = []
+        self.file_count = 0
+        self.total_bytes = 0
+        self.folders: set[str] = set()
+        self.main_files: List[str] = []
+        self.extensions: Counter[str] = Counter()
+        self.language_bytes: Counter[str] = Counter()
+        self.unsized = 0  # files without a size (unreadable, or outside a sparse checkout)
+
+    def add(self, path: str, size: Optional[int] = None) -> None:
+        self.file_count += 1
+        if self.file_list_limit is None or len(self.file_list) < self.file_list_limit:
+            self.file_list.append(path)
+        folder, sep, _name = path.rpartition("/")
+        if sep:
+            self.folders.add(folder)
+        if MAIN_FILE_RE.match(path):
+            self.main_files.append(path)
+        suffix = path_suffix(path)
+        self.extensions[suffix] += 1
+        if size is None:
+            self.unsized += 1
+        elif size:
+            self.total_bytes += size
+            language = EXTENSION_LANGUAGES.get(suffix)
+            if language:
+                self.language_bytes[language] += size
+
+    def feed(self, entries: Iterable[Entry]) -> "RepoScanner":
+        add = self.add
+        for entry in entries:
+            if isinstance(entry, str):
+                add(entry)
+            else:
+                add(entry[0], entry[1])
+        return self
+
+    def stack(
+        self, readme: str = "", manifests: Optional[Mapping[str, Iterable[str]]] = None
+    ) -> List[Dict[str, Any]]:
+        """Weighted stack; language shares use bytes only when every file was sized."""
+        return detect_stack(
+            readme=readme,
+            manifests=manifests,
+            extensions=self.extensions,
+            language_bytes=None if self.unsized else self.language_bytes,
+        )
+
+    def tech_stack(self, readme: str = "") -> List[str]:
+        return stack_names(self.stack(readme))
+
+    def result(
+        self, readme: str = "", manifests: Optional[Mapping[str, Iterable[str]]] = None
+    ) -> Dict[str, Any]:
+        stack = self.stack(readme, manifests)
+        return {
+            "folders": sorted(self.folders),
+            "main_files": self.main_files,
+            "tech_stack": stack_names(stack),
+            "stack": stack,
+            "file_list": self.file_list,
+            "file_count": self.file_count,
+            "file_list_truncated": len(self.file_list) < self.file_count,
+            "total_bytes": self.total_bytes,
+            "extension_histogram": dict(self.extensions.most_common()),
+            "language_bytes": dict(self.language_bytes.most_common()),
+        }
+
+
+__all__ = [
+    "RepoScanner",
+    "MAIN_FILE_RE",
+    "EXTENSION_LANGUAGES",
+    "README_KEYWORDS",
+    "path_suffix",
+    "readme_keywords",
+]
@@ -0,0 +1,316 @@
+"""Tech-stack detection from file suffixes, manifests and README keywords.
+
+``suffix_counts`` classifies a whole path list at once: the paths are joined
+into one string, a regex with a literal ``.`` prefix pulls every trailing
+suffix out and ``Counter`` tallies them in C; dotfiles (``.gitignore``), which
+have no suffix, are found the same way and subtracted (a path list containing a
+newline falls back to ``path_suffix`` per path). Manifests
+(``package.json``, ``requirements*.txt``, ``pyproject.toml``, ``Cargo.toml``,
+``go.mod``) are parsed for real framework dependencies, and README keywords are
+matched on word boundaries by one precompiled alternation ("react" no longer
+matches "reactive").
+
+``detect_stack`` combines the evidence into ``[{name, confidence, evidence}]``;
+each source contributes a weight and they are merged as independent signals
+(``1 - Π(1 - w)``).
+"""
+from __future__ import annotations
+
+import json
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+try:
+    import tomllib  # type: ignore
+except Exception:  # pragma: no cover - Python < 3.11
+    tomllib = None  # type: ignore
+
+from collectors.file_reader import read_bounded
+
+EXTENSION_LANGUAGES = {
+    ".py": "python",
+    ".js": "javascript",
+    ".mjs": "javascript",
+    ".cjs": "javascript",
+    ".jsx": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".go": "go",
+    ".rs": "rust",
+    ".java": "java",
+    ".kt": "kotlin",
+    ".scala": "scala",
+    ".rb": "ruby",
+    ".php": "php",
+    ".swift": "swift",
+    ".c": "c",
+    ".cc": "c++",
+    ".cpp": "c++",
+    ".hpp": "c++",
+    ".cs": "c#",
+    ".dart": "dart",
+    ".lua": "lua",
+    ".vue": "vue",
+    ".svelte": "svelte",
+}
+
+README_KEYWORDS = {
+    "supabase": "supabase",
+    "fastapi": "fastapi",
+    "flask": "flask",
+    "django": "django",
+    "react": "react",
+    "next.js": "next.js",
+    "nextjs": "next.js",
+    "vite": "vite",
+    "docker": "docker",
+    "kubernetes": "kubernetes",
+    "postgresql": "postgresql",
+    "redis": "redis",
+    "pytorch": "pytorch",
+    "tensorflow": "tensorflow",
+}
+
+# dependency name (as written in the manifest, lower-cased) -> stack label
+FRAMEWORK_PACKAGES = {
+    # npm
+    "react": "react", "next": "next.js", "vue": "vue", "nuxt": "nuxt", "svelte": "svelte",
+    "@angular/core": "angular", "express": "express", "@nestjs/core": "nestjs",
+    "vite": "vite", "electron": "electron", "@supabase/supabase-js": "supabase",
+    # python
+    "django": "django", "flask": "flask", "fastapi": "fastapi", "supabase": "supabase",
+    "torch": "pytorch", "tensorflow": "tensorflow", "pandas": "pandas", "numpy": "numpy",
+    "streamlit": "streamlit", "celery": "celery",
+    # rust
+    "tokio": "tokio", "actix-web": "actix", "axum": "axum", "rocket": "rocket",
+    # go
+    "github.com/gin-gonic/gin": "gin", "github.com/labstack/echo/v4": "echo",
+    "github.com/gofiber/fiber/v2": "fiber",
+}
+
+MANIFEST_LANGUAGES = {
+    "package.json": "javascript",
+    "pyproject.toml": "python",
+    "requirements.txt": "python",
+    "Cargo.toml": "rust",
+    "go.mod": "go",
+}
+
+WEIGHTS = {"manifest": 0.9, "manifest_file": 0.6, "readme": 0.4}
+MANIFEST_MAX_BYTES = 256 * 1024
+
+# over "\n" + "\n".join(paths) + "\n": the last ".suffix" of each line, and the
+# dotfile names (a basename that starts with its only dot) to take back out
+_SUFFIX_RE = re.compile(r"\.[^./\n]+(?=\n)")
+_NESTED_DOTFILE_RE = re.compile(r"/(\.[^./\n]+)(?=\n)")
+_ROOT_DOTFILE_RE = re.compile(r"\n(\.[^./\n]+)(?=\n)")
+_README_RE = re.compile(
+    r"(?<![\w.])(" + "|".join(
+        re.escape(k) for k in sorted(README_KEYWORDS, key=len, reverse=True)
+    ) + r")(?![\w])",
+    re.IGNORECASE,
+)
+_REQUIREMENT_RE = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)", re.MULTILINE)
+_TOML_STRING_RE = re.compile(r"[\"']([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+
+def path_suffix(path: str) -> str:
+    """``Path(path).suffix`` without building a Path object."""
+    name = path.rpartition("/")[2]
+    dot = name.rfind(".")
+    return name[dot:] if 0 < dot < len(name) - 1 else ""
+
+
+def suffix_counts(paths: Sequence[str]) -> Counter:
+    """``Counter`` of path suffixes (``path_suffix`` semantics) over all ``paths``."""
+    if not paths:
+        return Counter()
+    text = "\n" + "\n".join(paths) + "\n"
+    if text.count("\n") != len(paths) + 1:  # a file name with a newline in it
+        counts = Counter(map(path_suffix, paths))
+        del counts[""]
+        return counts
+    counts = Counter(_SUFFIX_RE.findall(text))
+    dotfiles = _NESTED_DOTFILE_RE.findall(text) + _ROOT_DOTFILE_RE.findall(text)
+    if dotfiles:
+        counts.subtract(dotfiles)
+        counts = +counts  # drop the zeroed entries
+    return counts
+
+
+def readme_keywords(readme: str) -> List[str]:
+    """Stack labels named in ``readme``, whole words only, in first-seen order."""
+    found = {README_KEYWORDS[m.lower()]: None for m in _README_RE.findall(readme)}
+    return list(found)
+
+
+# Manifest parsers: text -> dependency names ------------------------------
+def _package_json(text: str) -> List[str]:
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return []
+    if not isinstance(data, dict):
+        return []
+    deps: List[str] = []
+    for key in ("dependencies", "devDependencies", "peerDependencies"):
+        if isinstance(data.get(key), dict):
+            deps.extend(data[key])
+    return deps
+
+
+def _requirements(text: str) -> List[str]:
+    return [m for m in _REQUIREMENT_RE.findall(text) if not m.startswith("-")]
+
+
+def _pyproject(text: str) -> List[str]:
+    if tomllib is not None:
+        try:
+            data = tomllib.loads(text)
+        except Exception:
+            data = None
+        if data is not None:
+            project = data.get("project", {})
+            deps = [_requirements(d)[:1] for d in project.get("dependencies", [])]
+            for extra in project.get("optional-dependencies", {}).values():
+                deps.extend(_requirements(d)[:1] for d in extra)
+            names = [d[0] for d in deps if d]
+            poetry = data.get("tool", {}).get("poetry", {})
+            names.extend(poetry.get("dependencies", {}))
+            return names
+    return _TOML_STRING_RE.findall(text)
+
+
+def _cargo(text: str) -> List[str]:
+    names: List[str] = []
+    in_deps = False
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("["):
+            in_deps = line.strip("[]").endswith("dependencies")
+            continue
+        if in_deps and "=" in line:
+            names.append(line.split("=", 1)[0].strip().strip('"'))
+    return names
+
+
+def _go_mod(text: str) -> List[str]:
+    names: List[str] = []
+    in_block = False
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("require ("):
+            in_block = True
+        elif in_block and line == ")":
+            in_block = False
+        elif in_block or line.startswith("require "):
+            parts = line.removeprefix("require ").split()
+            if parts:
+                names.append(parts[0])
+    return names
+
+
+MANIFEST_PARSERS = {
+    "package.json": _package_json,
+    "pyproject.toml": _pyproject,
+    "Cargo.toml": _cargo,
+    "go.mod": _go_mod,
+}
+
+
+def _manifest_kind(name: str) -> Optional[str]:
+    if name in MANIFEST_PARSERS:
+        return name
+    if name.startswith("requirements") and name.endswith(".txt"):
+        return "requirements.txt"
+    return None
+
+
+def read_manifests(repo_path: Path, paths: Iterable[str]) -> Dict[str, List[str]]:
+    """Dependencies of each root-level manifest among ``paths`` (missing files skipped)."""
+    found: Dict[str, List[str]] = {}
+    for rel in paths:
+        if "/" in rel:
+            continue
+        kind = _manifest_kind(rel)
+        if kind is None:
+            continue
+        try:
+            text = read_bounded(repo_path / rel, MANIFEST_MAX_BYTES)["text"]
+        except OSError:
+            continue  # outside a sparse checkout, or unreadable
+        parser = MANIFEST_PARSERS.get(kind, _requirements)
+        found[rel] = parser(text)
+    return found
+
+
+def detect_stack(
+    paths: Optional[Sequence[str]] = None,
+    readme: str = "",
+    manifests: Optional[Mapping[str, Iterable[str]]] = None,
+    extensions: Optional[Mapping[str, int]] = None,
+    language_bytes: Optional[Mapping[str, int]] = None,
+) -> List[Dict[str, Any]]:
+    """Weighted stack, most confident first.
+
+    Languages are weighted by their share of source files (or of source bytes
+    when ``language_bytes`` is given), floored at 0.3 so a minority language
+    still shows up. Pass either ``paths`` or a precomputed ``extensions`` count.
+    """
+    evidence: Dict[str, Dict[str, float]] = {}
+
+    def add(name: str, source: str, weight: float) -> None:
+        current = evidence.setdefault(name, {})
+        current[source] = max(current.get(source, 0.0), weight)
+
+    counts = extensions if extensions is not None else suffix_counts(paths or ())
+    by_language: Counter = Counter()
+    for suffix, n in counts.items():
+        language = EXTENSION_LANGUAGES.get(suffix)
+        if language:
+            by_language[language] += n
+    share_source = language_bytes if language_bytes else by_language
+    total = sum(share_source.values()) or 1
+    for language in by_language:
+        add(language, "files", 0.3 + 0.7 * share_source.get(language, 0) / total)
+
+    for name, deps in (manifests or {}).items():
+        language = MANIFEST_LANGUAGES.get(_manifest_kind(name) or "")
+        if language:
+            add(language, f"manifest:{name}", WEIGHTS["manifest_file"])
+        for dep in deps:
+            label = FRAMEWORK_PACKAGES.get(dep.lower())
+            if label:
+                add(label, f"manifest:{name}", WEIGHTS["manifest"])
+
+    for label in readme_keywords(readme):
+        add(label, "readme", WEIGHTS["readme"])
+
+    stack = []
+    for name, sources in evidence.items():
+        miss = 1.0
+        for weight in sources.values():
+            miss *= 1.0 - weight
+        stack.append({"name": name, "confidence": round(1.0 - miss, 3), "evidence": sorted(sources)})
+    stack.sort(key=lambda s: (-s["confidence"], s["name"]))
+    return stack
+
+
+def stack_names(stack: Iterable[Mapping[str, Any]], min_confidence: float = 0.0) -> List[str]:
+    """Sorted labels of ``stack`` entries at or above ``min_confidence``."""
+    return sorted(s["name"] for s in stack if s["confidence"] >= min_confidence)
+
+
+__all__ = [
+    "EXTENSION_LANGUAGES",
+    "FRAMEWORK_PACKAGES",
+    "README_KEYWORDS",
+    "detect_stack",
+    "path_suffix",
+    "read_manifests",
+    "readme_keywords",
+    "stack_names",
+    "suffix_counts",
+]
@@ -0,0 +1,213 @@
+"""Pruned repository tree walker.
+
+``walk_tree`` uses ``os.scandir`` and drops ignored directories (``.git``,
+``node_modules``, ``vendor``, ...) before descending into them. When the
+checkout is a git work tree, ``iter_repo_files`` prefers ``git ls-files -z``,
+which lists tracked files without touching the filesystem at all; a sparse
+checkout is listed from the commit tree with ``git ls-tree -r --name-only``.
+"""
+from __future__ import annotations
+
+import fnmatch
+import os
+import subprocess
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_IGNORED_DIRS = frozenset({
+    ".git", ".hg", ".svn",
+    "node_modules", "bower_components", "vendor", "dist",
+    "__pycache__", ".venv", "venv", ".tox", ".nox",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache",
+    ".next", ".nuxt", ".gradle", ".idea",
+})
+
+
+class GitIgnore:
+    """Minimal ``.gitignore`` matcher (root file only, last match wins).
+
+    Supports ``#`` comments, ``!`` negation, trailing ``/`` for directories and
+    leading ``/`` anchoring; patterns without a slash match any basename.
+    """
+
+    def __init__(self, lines: Iterable[str]):
+        self.rules: List[Tuple[str, bool, bool, bool]] = []
+        for raw in lines:
+            line = raw.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            anchored = "/" in line  # a leading or middle slash; the trailing one is gone
+            self.rules.append((line.lstrip("/"), negate, dir_only, anchored))
+
+    @classmethod
+    def from_repo(cls, root: Path) -> Optional["GitIgnore"]:
+        try:
+            text = (root / ".gitignore").read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            return None
+        ignore = cls(text.splitlines())
+        return ignore if ignore.rules else None
+
+    def match(self, rel_path: str, is_dir: bool) -> bool:
+        name = rel_path.rsplit("/", 1)[-1]
+        ignored = False
+        for pattern, negate, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            target = rel_path if anchored else name
+            if fnmatch.fnmatchcase(target, pattern):
+                ignored = not negate
+        return ignored
+
+
+def _pattern_match(rel_path: str, name: str, patterns: Tuple[str, ...]) -> bool:
+    return any(fnmatch.fnmatchcase(name, p) or fnmatch.fnmatchcase(rel_path, p) for p in patterns)
+
+
+def walk_tree(
+    root: Path,
+    ignore_dirs: Iterable[str] = DEFAULT_IGNORED_DIRS,
+    ignore_patterns: Iterable[str] = (),
+    use_gitignore: bool = False,
+) -> Iterator[str]:
+    """Yield repo-relative POSIX paths of files under ``root``, pruning early."""
+    ignore_dirs = frozenset(ignore_dirs)
+    patterns = tuple(ignore_patterns)
+    gitignore = GitIgnore.from_repo(root) if use_gitignore else None
+    stack: List[Tuple[str, str]] = [(str(root), "")]
+    while stack:
+        abs_dir, prefix = stack.pop()
+        try:
+            it = os.scandir(abs_dir)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                name = entry.name
+                rel = prefix + name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if is_dir:
+                    if name in ignore_dirs:
+                        continue
+                    if patterns and _pattern_match(rel, name, patterns):
+                        continue
+                    if gitignore is not None and gitignore.match(rel, True):
+                        continue
+                    stack.append((entry.path, rel + "/"))
+                    continue
+                if entry.is_symlink() and entry.is_dir():
+                    continue  # never follow directory symlinks
+                if patterns and _pattern_match(rel, name, patterns):
+                    continue
+                if gitignore is not None and gitignore.match(rel, False):
+                    continue
+                yield rel
+
+
+def git_ls_files(root: Path) -> Optional[List[str]]:
+    """Tracked files via ``git ls-files -z``; None when ``root`` is not a work tree."""
+    if not (root / ".git").exists():
+        return None
+    try:
+        result = subprocess.run(
+            ["git", "-c", "core.quotepath=off", "ls-files", "-z"],
+            cwd=root, capture_output=True, check=False, timeout=120,
+        )
+    except Exception:
+        return None
+    if result.returncode != 0:
+        return None
+    return [p for p in result.stdout.decode("utf-8", errors="surrogateescape").split("\0") if p]
+
+
+def is_sparse_checkout(root: Path) -> bool:
+    return (root / ".git" / "info" / "sparse-checkout").is_file()
+
+
+def git_ls_tree(root: Path, rev: str = "HEAD") -> Optional[List[str]]:
+    """All file paths of ``rev`` via ``git ls-tree -r --name-only -z``.
+
+    Reads only tree objects, so it works in a blobless partial clone.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "-c", "core.quotepath=off", "ls-tree", "-r", "--name-only", "-z", rev],
+            cwd=root, capture_output=True, check=False, timeout=120,
+        )
+    except Exception:
+        return None
+    if result.returncode != 0:
+        return None
+    return [p for p in result.stdout.decode("utf-8", errors="surrogateescape").split("\0") if p]
+
+
+def iter_repo_files(
+    root: Path,
+    ignore_dirs: Iterable[str] = DEFAULT_IGNORED_DIRS,
+    ignore_patterns: Iterable[str] = (),
+    use_gitignore: bool = False,
+    use_git: bool = True,
+) -> Iterator[str]:
+    """Repo files via the git index when available, else a pruned scandir walk.
+
+    The same ``ignore_dirs``/``ignore_patterns`` filters apply to both paths; the
+    git index already excludes ignored files, so ``use_gitignore`` only affects
+    the filesystem walk.
+    """
+    tracked = None
+    if use_git:
+        tracked = git_ls_tree(root) if is_sparse_checkout(root) else git_ls_files(root)
+    if tracked is None:
+        yield from walk_tree(root, ignore_dirs, ignore_patterns, use_gitignore)
+        return
+    ignore_dirs = frozenset(ignore_dirs)
+    patterns = tuple(ignore_patterns)
+    for rel in tracked:
+        parts = rel.split("/")
+        if ignore_dirs and not ignore_dirs.isdisjoint(parts[:-1]):
+            continue
+        if patterns and any(
+            _pattern_match("/".join(parts[: i + 1]), parts[i], patterns) for i in range(len(parts))
+        ):
+            continue
+        yield rel
+
+
+def iter_repo_entries(
+    root: Path,
+    ignore_dirs: Iterable[str] = DEFAULT_IGNORED_DIRS,
+    ignore_patterns: Iterable[str] = (),
+    use_gitignore: bool = False,
+    use_git: bool = True,
+) -> Iterator[Tuple[str, Optional[int]]]:
+    """Like ``iter_repo_files`` but yields ``(path, size)``.
+
+    The size is None when the file is unreadable or outside a sparse checkout.
+    """
+    base = str(root) + os.sep
+    for rel in iter_repo_files(root, ignore_dirs, ignore_patterns, use_gitignore, use_git):
+        try:
+            size: Optional[int] = os.lstat(base + rel).st_size
+        except OSError:
+            size = None
+        yield rel, size
+
+
+__all__ = [
+    "DEFAULT_IGNORED_DIRS",
+    "GitIgnore",
+    "walk_tree",
+    "git_ls_files",
+    "git_ls_tree",
+    "is_sparse_checkout",
+    "iter_repo_files",
+    "iter_repo_entries",
+]
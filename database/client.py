@@ -3,34 +3,310 @@ Falls back to no-op when supabase-py is unavailable (offline dev).
 """
 from __future__ import annotations
 
-from typing import Dict, Any, List
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
 
 try:  # optional dependency
     from supabase import create_client
 except Exception:  # pragma: no cover - missing in sandbox
     create_client = None  # type: ignore
 
+# on_conflict targets for upserts; each needs a unique index in Supabase, e.g.
+#   create unique index on blog_drafts (repo);
+#   create unique index on image_prompts (prompt_hash);
+NATURAL_KEYS = {
+    "blog_drafts": "repo",
+    "image_prompts": "prompt_hash",
+}
+# tables where re-sending an existing key must not touch the stored row
+# (an image_prompts row may already be rendered)
+IGNORE_DUPLICATES = frozenset({"image_prompts"})
+
+PROMPT_COLUMNS = ("id", "repo", "section", "prompt", "prompt_hash", "status", "attempts")
+DRAFT_COLUMNS = ("id", "repo", "title", "subtitle", "body_md", "seo_keywords")
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
 
 class SupabaseClient:
     def __init__(self, url: str, key: str):
         self.url = url
         self.key = key
         self.client = create_client(url, key) if (url and key and create_client) else None
+        self.round_trips = 0
+        self._lock = threading.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self.client is not None
 
     def insert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        if self.client:
+        if self.connected:
             try:
-                res = self.client.table(table).insert(data).execute()
-                return {"status": "ok", "data": res.data}
+                res = self._insert_rows(table, [data])
+                return {"status": "ok", "data": res}
             except Exception as e:  # tolerant if table missing
                 return {"status": "error", "error": str(e)}
         return {"status": "noop", "table": table, "data": data}
 
-    def fetch_waiting_prompts(self) -> List[Dict[str, Any]]:
+    def insert_many(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        chunk_size: int = 500,
+        retries: int = 2,
+        backoff: float = 0.5,
+    ) -> List[Dict[str, Any]]:
+        """Array-insert ``rows`` in chunks; returns one status dict per row.
+
+        A chunk that keeps failing after ``retries`` is bisected so a single bad
+        row does not take its neighbours down with it.
+        """
+        return self._write_many(self._insert_rows, table, rows, chunk_size, retries, backoff)
+
+    def upsert_many(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        on_conflict: Optional[str] = None,
+        ignore_duplicates: Optional[bool] = None,
+        chunk_size: int = 500,
+        retries: int = 2,
+        backoff: float = 0.5,
+    ) -> List[Dict[str, Any]]:
+        """Idempotent ``insert_many`` keyed by ``on_conflict`` (default: ``NATURAL_KEYS``).
+
+        Rows repeating a key within the call are collapsed (last one wins), since
+        Postgres rejects touching the same row twice in one statement.
+        """
+        key = on_conflict or NATURAL_KEYS[table]
+        if ignore_duplicates is None:
+            ignore_duplicates = table in IGNORE_DUPLICATES
+        columns = key.split(",")
+        slot: Dict[tuple, int] = {}
+        unique: List[Dict[str, Any]] = []
+        positions: List[int] = []
+        for row in rows:
+            k = tuple(row.get(c) for c in columns)
+            if k in slot:
+                unique[slot[k]] = row
+            else:
+                slot[k] = len(unique)
+                unique.append(row)
+            positions.append(slot[k])
+
+        def op(t: str, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            return self._upsert_rows(t, chunk, key, ignore_duplicates)
+
+        statuses = self._write_many(op, table, unique, chunk_size, retries, backoff)
+        return [statuses[i] for i in positions]
+
+    def fetch_waiting_prompts(
+        self,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        columns: Sequence[str] = PROMPT_COLUMNS,
+    ) -> List[Dict[str, Any]]:
+        """One page of waiting prompts ordered by id (keyset pagination via ``after_id``)."""
+        if self.client:
+            self._count_round_trip()
+            query = self.client.table("image_prompts").select(",".join(columns)).eq("status", "waiting")
+            if after_id is not None:
+                query = query.gt("id", after_id)
+            res = query.order("id").limit(limit).execute()
+            return res.data or []
+        return []
+
+    def iter_waiting_prompts(self, page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        after_id = None
+        while True:
+            page = self.fetch_waiting_prompts(limit=page_size, after_id=after_id)
+            yield from page
+            if len(page) < page_size:
+                return
+            after_id = page[-1]["id"]
+
+    def fetch_drafts(
+        self,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        columns: Sequence[str] = DRAFT_COLUMNS,
+    ) -> List[Dict[str, Any]]:
+        """One page of blog drafts ordered by id (keyset pagination via ``after_id``)."""
         if self.client:
-            res = self.client.table("image_prompts").select("*").eq("status", "waiting").execute()
+            self._count_round_trip()
+            query = self.client.table("blog_drafts").select(",".join(columns))
+            if after_id is not None:
+                query = query.gt("id", after_id)
+            res = query.order("id").limit(limit).execute()
             return res.data or []
         return []
 
+    def iter_drafts(self, page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        after_id = None
+        while True:
+            page = self.fetch_drafts(limit=page_size, after_id=after_id)
+            yield from page
+            if len(page) < page_size:
+                return
+            after_id = page[-1]["id"]
+
+    # Image worker queue ----------------------------------------------
+    # image_prompts.status moves waiting -> processing (leased) -> done/failed.
+    # Claims are a conditional UPDATE ... WHERE status = 'waiting', so two
+    # workers racing for the same row can never both win it.
+    def claim_prompts(
+        self, worker_id: str, limit: int = 10, lease_seconds: float = 300
+    ) -> List[Dict[str, Any]]:
+        """Lease up to ``limit`` waiting prompts to ``worker_id``; returns the claimed rows."""
+        if not self.client:
+            return []
+        candidates = self.fetch_waiting_prompts(limit=limit, columns=("id",))
+        if not candidates:
+            return []
+        lease = {
+            "status": "processing",
+            "worker_id": worker_id,
+            "lease_expires_at": (utc_now() + timedelta(seconds=lease_seconds)).isoformat(),
+        }
+        self._count_round_trip()
+        res = (
+            self.client.table("image_prompts")
+            .update(lease)
+            .in_("id", [c["id"] for c in candidates])
+            .eq("status", "waiting")
+            .execute()
+        )
+        return res.data or []
+
+    def requeue_expired(
+        self, now: Optional[datetime] = None, max_attempts: Optional[int] = None
+    ) -> Dict[str, int]:
+        """Hand prompts whose lease ran out back to the queue.
+
+        A lost lease counts as an attempt (the worker died or hung mid-render), so
+        a prompt that keeps killing workers is marked ``failed`` once it reaches
+        ``max_attempts`` instead of being re-claimed forever. Returns
+        ``{"requeued": n, "failed": m}``.
+        """
+        counts = {"requeued": 0, "failed": 0}
+        if not self.client:
+            return counts
+        cutoff = (now or utc_now()).isoformat()
+        self._count_round_trip()
+        expired = (
+            self.client.table("image_prompts")
+            .select("id,attempts")
+            .eq("status", "processing")
+            .lt("lease_expires_at", cutoff)
+            .execute()
+        ).data or []
+        by_attempts: Dict[Optional[int], List[Any]] = {}
+        for row in expired:
+            by_attempts.setdefault(row.get("attempts"), []).append(row["id"])
+        # one conditional update per previous attempt count: PostgREST cannot
+        # write attempts = attempts + 1, so the old value is part of the filter
+        for previous, ids in by_attempts.items():
+            attempts = int(previous or 0) + 1
+            failed = max_attempts is not None and attempts >= max_attempts
+            query = (
+                self.client.table("image_prompts")
+                .update({
+                    "status": "failed" if failed else "waiting",
+                    "attempts": attempts,
+                    "error": "lease expired",
+                    "worker_id": None,
+                    "lease_expires_at": None,
+                })
+                .in_("id", ids)
+                .eq("status", "processing")
+                .lt("lease_expires_at", cutoff)
+            )
+            query = query.is_("attempts", "null") if previous is None else query.eq("attempts", previous)
+            self._count_round_trip()
+            counts["failed" if failed else "requeued"] += len(query.execute().data or [])
+        return counts
+
+    def finish_prompt(self, prompt_id: Any, worker_id: str, fields: Dict[str, Any]) -> bool:
+        """Write a render outcome, only if ``worker_id`` still holds the lease."""
+        if not self.client:
+            return False
+        self._count_round_trip()
+        res = (
+            self.client.table("image_prompts")
+            .update({**fields, "lease_expires_at": None})
+            .eq("id", prompt_id)
+            .eq("worker_id", worker_id)
+            .eq("status", "processing")
+            .execute()
+        )
+        return bool(res.data)
+
+    # Internal helpers -------------------------------------------------
+    def _count_round_trip(self) -> None:
+        with self._lock:
+            self.round_trips += 1
+
+    def _insert_rows(self, table: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """One array insert = one round-trip; returns the inserted rows."""
+        self._count_round_trip()
+        res = self.client.table(table).insert(rows).execute()
+        return res.data or []
+
+    def _upsert_rows(
+        self, table: str, rows: List[Dict[str, Any]], on_conflict: str, ignore_duplicates: bool
+    ) -> List[Dict[str, Any]]:
+        self._count_round_trip()
+        res = self.client.table(table).upsert(
+            rows, on_conflict=on_conflict, ignore_duplicates=ignore_duplicates
+        ).execute()
+        return res.data or []
+
+    def _write_many(
+        self,
+        op: Callable[[str, List[Dict[str, Any]]], List[Dict[str, Any]]],
+        table: str,
+        rows: List[Dict[str, Any]],
+        chunk_size: int,
+        retries: int,
+        backoff: float,
+    ) -> List[Dict[str, Any]]:
+        if not self.connected:
+            return [{"status": "noop", "table": table, "data": row} for row in rows]
+        statuses: List[Dict[str, Any]] = []
+        for start in range(0, len(rows), max(1, chunk_size)):
+            chunk = rows[start:start + chunk_size]
+            statuses.extend(self._write_chunk(op, table, chunk, retries, backoff))
+        return statuses
+
+    def _write_chunk(
+        self,
+        op: Callable[[str, List[Dict[str, Any]]], List[Dict[str, Any]]],
+        table: str,
+        chunk: List[Dict[str, Any]],
+        retries: int,
+        backoff: float,
+    ) -> List[Dict[str, Any]]:
+        error = ""
+        for attempt in range(retries + 1):
+            try:
+                data = op(table, chunk)
+            except Exception as e:
+                error = str(e)
+                if attempt < retries and backoff:
+                    time.sleep(backoff * 2**attempt)
+                continue
+            aligned = len(data) == len(chunk)  # upserts that ignore duplicates return fewer
+            return [{"status": "ok", "data": data[i] if aligned else None} for i in range(len(chunk))]
+        if len(chunk) > 1:
+            mid = len(chunk) // 2
+            return (self._write_chunk(op, table, chunk[:mid], 0, 0)
+                    + self._write_chunk(op, table, chunk[mid:], 0, 0))
+        return [{"status": "error", "error": error}]
+
 
-__all__ = ["SupabaseClient"]
+__all__ = ["SupabaseClient", "NATURAL_KEYS", "PROMPT_COLUMNS", "DRAFT_COLUMNS", "utc_now"]
@@ -0,0 +1,146 @@
+"""In-memory stand-in for SupabaseClient (tests and offline dev).
+
+Implements the same interface against plain dict tables and counts every
+simulated round-trip, so callers can assert on batching behaviour.
+"""
+from __future__ import annotations
+
+import copy
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from database.client import DRAFT_COLUMNS, PROMPT_COLUMNS, SupabaseClient, utc_now
+
+
+class InMemorySupabaseClient(SupabaseClient):
+    def __init__(self, reject: Optional[Callable[[Dict[str, Any]], bool]] = None):
+        super().__init__("", "")
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self.fail_next = 0  # fail this many upcoming round-trips
+        self.reject = reject  # rows for which the whole request fails
+        self._next_id = 1
+
+    @property
+    def connected(self) -> bool:
+        return True
+
+    def rows(self, table: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return copy.deepcopy(self.tables.get(table, []))
+
+    def fetch_waiting_prompts(
+        self,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        columns: Sequence[str] = PROMPT_COLUMNS,
+    ) -> List[Dict[str, Any]]:
+        self._count_round_trip()
+        with self._lock:
+            rows = sorted(
+                (r for r in self.tables.get("image_prompts", [])
+                 if r.get("status") == "waiting" and (after_id is None or r["id"] > after_id)),
+                key=lambda r: r["id"],
+            )[:limit]
+            return [{c: r.get(c) for c in columns} for r in rows]
+
+    def fetch_drafts(
+        self,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        columns: Sequence[str] = DRAFT_COLUMNS,
+    ) -> List[Dict[str, Any]]:
+        self._count_round_trip()
+        with self._lock:
+            rows = sorted(
+                (r for r in self.tables.get("blog_drafts", [])
+                 if after_id is None or r["id"] > after_id),
+                key=lambda r: r["id"],
+            )[:limit]
+            return [{c: copy.deepcopy(r.get(c)) for c in columns} for r in rows]
+
+    def claim_prompts(
+        self, worker_id: str, limit: int = 10, lease_seconds: float = 300
+    ) -> List[Dict[str, Any]]:
+        self._count_round_trip()
+        expires = (utc_now() + timedelta(seconds=lease_seconds)).isoformat()
+        with self._lock:
+            waiting = sorted(
+                (r for r in self.tables.get("image_prompts", []) if r.get("status") == "waiting"),
+                key=lambda r: r["id"],
+            )[:limit]
+            for row in waiting:
+                row.update(status="processing", worker_id=worker_id, lease_expires_at=expires)
+            return copy.deepcopy(waiting)
+
+    def requeue_expired(
+        self, now: Optional[datetime] = None, max_attempts: Optional[int] = None
+    ) -> Dict[str, int]:
+        self._count_round_trip()
+        cutoff = now or utc_now()
+        counts = {"requeued": 0, "failed": 0}
+        with self._lock:
+            for row in self.tables.get("image_prompts", []):
+                if not (row.get("status") == "processing" and row.get("lease_expires_at")
+                        and datetime.fromisoformat(row["lease_expires_at"]) < cutoff):
+                    continue
+                attempts = int(row.get("attempts") or 0) + 1
+                failed = max_attempts is not None and attempts >= max_attempts
+                row.update(
+                    status="failed" if failed else "waiting", attempts=attempts,
+                    error="lease expired", worker_id=None, lease_expires_at=None,
+                )
+                counts["failed" if failed else "requeued"] += 1
+        return counts
+
+    def finish_prompt(self, prompt_id: Any, worker_id: str, fields: Dict[str, Any]) -> bool:
+        self._count_round_trip()
+        with self._lock:
+            for row in self.tables.get("image_prompts", []):
+                if (row["id"] == prompt_id and row.get("worker_id") == worker_id
+                        and row.get("status") == "processing"):
+                    row.update(copy.deepcopy(fields), lease_expires_at=None)
+                    return True
+            return False
+
+    def _insert_rows(self, table: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        self._count_round_trip()
+        with self._lock:
+            self._check_failure_locked(rows)
+            return [self._store_locked(table, row) for row in rows]
+
+    def _upsert_rows(
+        self, table: str, rows: List[Dict[str, Any]], on_conflict: str, ignore_duplicates: bool
+    ) -> List[Dict[str, Any]]:
+        self._count_round_trip()
+        columns = on_conflict.split(",")
+        with self._lock:
+            self._check_failure_locked(rows)
+            existing = {tuple(r.get(c) for c in columns): r for r in self.tables.get(table, [])}
+            written = []
+            for row in rows:
+                current = existing.get(tuple(row.get(c) for c in columns))
+                if current is None:
+                    written.append(self._store_locked(table, row))
+                elif not ignore_duplicates:
+                    current.update(copy.deepcopy(row))
+                    written.append(copy.deepcopy(current))
+            return written
+
+    # Internal helpers -------------------------------------------------
+    def _check_failure_locked(self, rows: List[Dict[str, Any]]) -> None:
+        if self.fail_next > 0:
+            self.fail_next -= 1
+            raise RuntimeError("simulated network failure")
+        if self.reject and any(self.reject(r) for r in rows):
+            raise RuntimeError("row rejected")
+
+    def _store_locked(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        stored = {"id": self._next_id, **copy.deepcopy(row)}
+        if table == "image_prompts":
+            stored.setdefault("status", "waiting")  # column default in the real schema
+        self._next_id += 1
+        self.tables.setdefault(table, []).append(stored)
+        return copy.deepcopy(stored)
+
+
+__all__ = ["InMemorySupabaseClient"]
@@ -0,0 +1,93 @@
+"""Write-behind buffer that batches rows into ``SupabaseClient.insert_many`` calls."""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from database.client import SupabaseClient
+
+
+class WriteBuffer:
+    """Collects rows per table and flushes them as array inserts.
+
+    A table is flushed when it holds ``max_rows`` rows or its oldest row is older
+    than ``max_delay`` seconds (checked on every ``add``), and on ``flush()`` /
+    context exit. Each row may carry a ``key``; ``results`` keeps
+    ``(key, table, status)`` for every written row so callers can map failures
+    back to their source. With ``upsert=True`` rows are written through
+    ``upsert_many`` on the table's natural key, so replays are idempotent.
+    """
+
+    def __init__(
+        self,
+        client: SupabaseClient,
+        max_rows: int = 500,
+        max_delay: float = 2.0,
+        chunk_size: int = 500,
+        upsert: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client = client
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.chunk_size = chunk_size
+        self.upsert = upsert
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pending: Dict[str, List[Tuple[Optional[Hashable], Dict[str, Any]]]] = {}
+        self._oldest: Dict[str, float] = {}
+        self.results: List[Tuple[Optional[Hashable], str, Dict[str, Any]]] = []
+
+    def add(self, table: str, row: Dict[str, Any], key: Optional[Hashable] = None) -> None:
+        with self._lock:
+            self._pending.setdefault(table, []).append((key, row))
+            self._oldest.setdefault(table, self._clock())
+            due = [t for t in self._pending if self._is_due_locked(t)]
+        for t in due:
+            self._flush_table(t)
+
+    def extend(self, table: str, rows: List[Dict[str, Any]], key: Optional[Hashable] = None) -> None:
+        for row in rows:
+            self.add(table, row, key)
+
+    def flush(self) -> List[Tuple[Optional[Hashable], str, Dict[str, Any]]]:
+        with self._lock:
+            tables = list(self._pending)
+        for t in tables:
+            self._flush_table(t)
+        return self.results
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(len(rows) for rows in self._pending.values())
+
+    def failed_keys(self) -> set:
+        return {key for key, _table, status in self.results if status.get("status") == "error"}
+
+    def __enter__(self) -> "WriteBuffer":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.flush()
+
+    # Internal helpers -------------------------------------------------
+    def _is_due_locked(self, table: str) -> bool:
+        rows = self._pending.get(table) or []
+        if len(rows) >= self.max_rows:
+            return True
+        return bool(rows) and self._clock() - self._oldest.get(table, self._clock()) >= self.max_delay
+
+    def _flush_table(self, table: str) -> None:
+        with self._lock:
+            batch = self._pending.pop(table, [])
+            self._oldest.pop(table, None)
+        if not batch:
+            return
+        write = self.client.upsert_many if self.upsert else self.client.insert_many
+        statuses = write(table, [row for _key, row in batch], chunk_size=self.chunk_size)
+        with self._lock:
+            self.results.extend((key, table, st) for (key, _row), st in zip(batch, statuses))
+
+
+__all__ = ["WriteBuffer"]
@@ -0,0 +1,37 @@
+"""Stable content fingerprints used to skip unchanged pipeline stages."""
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+# snapshot keys that change between runs without changing the content
+VOLATILE_SNAPSHOT_KEYS = frozenset({"repo_path", "clone_cache"})
+
+
+def fingerprint(*parts: Any) -> str:
+    """sha256 over the canonical JSON encoding of ``parts``."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(json.dumps(part, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def snapshot_fingerprint(snapshot: Dict[str, Any]) -> str:
+    """Fingerprint of everything the analyzer reads (README, file list, commit SHA, ...)."""
+    stable = {k: v for k, v in snapshot.items() if k not in VOLATILE_SNAPSHOT_KEYS}
+    if isinstance(stable.get("file_list"), list):
+        stable["file_list"] = sorted(stable["file_list"])
+    return fingerprint(stable)
+
+
+def file_fingerprint(path: Path) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+__all__ = ["fingerprint", "snapshot_fingerprint", "file_fingerprint"]
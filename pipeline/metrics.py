@@ -0,0 +1,86 @@
+"""Per-run stage timers and counters for the pipeline.
+
+``RunMetrics.stage(name)`` records wall time and the calling thread's CPU time;
+``incr`` bumps named counters (files walked, bytes read, HTTP calls, DB
+round-trips). ``emit`` writes one JSON line to the ``pipeline.metrics`` logger.
+
+With ``profile=True`` each top-level stage also runs under the run's own
+``cProfile.Profile``, enabled on whichever thread executes the stage, so the
+collect stage on a batch worker thread and the later stages on the calling
+thread land in one per-repo profile (``dump_profile``).
+"""
+from __future__ import annotations
+
+import cProfile
+import json
+import logging
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger("pipeline.metrics")
+
+
+class RunMetrics:
+    def __init__(self, repo_url: str = "", profile: bool = False):
+        self.repo_url = repo_url
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.profiler: Optional[cProfile.Profile] = cProfile.Profile() if profile else None
+        self._profiled = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        profiling = self.profiler is not None and "." not in name and self._enable_profiler()
+        wall0, cpu0 = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            if profiling:
+                self.profiler.disable()
+            entry = self.stages.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0, "calls": 0})
+            entry["wall_s"] += time.perf_counter() - wall0
+            entry["cpu_s"] += time.thread_time() - cpu0
+            entry["calls"] += 1
+
+    def _enable_profiler(self) -> bool:
+        try:
+            self.profiler.enable()
+        except ValueError:  # another profiler is active (one per interpreter on 3.12+)
+            self.incr("profile_skipped_stages")
+            return False
+        self._profiled = True
+        return True
+
+    def dump_profile(self, path: Path) -> Optional[Path]:
+        """Write the run's ``.pstats`` to ``path``; None when nothing was profiled."""
+        if self.profiler is None or not self._profiled:
+            return None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.profiler.dump_stats(str(path))
+        return path
+
+    def incr(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def total_wall(self) -> float:
+        top = [v["wall_s"] for k, v in self.stages.items() if "." not in k]
+        return sum(top)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "repo": self.repo_url,
+            "total_wall_s": round(self.total_wall(), 4),
+            "stages": {
+                k: {"wall_s": round(v["wall_s"], 4), "cpu_s": round(v["cpu_s"], 4), "calls": v["calls"]}
+                for k, v in self.stages.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+    def emit(self) -> None:
+        logger.info(json.dumps({"event": "pipeline.run", **self.as_dict()}, ensure_ascii=False))
+
+
+__all__ = ["RunMetrics"]
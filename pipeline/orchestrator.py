@@ -2,54 +2,454 @@
 from __future__ import annotations
 
 import json
+import os
+import queue
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from collectors.github_collector import collect_repo, save_snapshot
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from collectors.clone_cache import CloneCache, normalize_repo_url
+from collectors.github_api import GitHubClient
+from collectors.github_collector import CollectError, collect_repo
 from analyzers.repo_analyzer import analyze_repo
-from writers.blog_writer import generate_blog
-from prompts.prompt_generator import generate_prompts
+from writers.blog_writer import BLOG_TEMPLATE_PATH, generate_blog
+from writers.manifest import MANIFEST_NAME, ArticleManifest, article_slug
+from writers.template import load_template
+from writers.markdown_renderer import render_document
+from prompts.prompt_cache import PromptCache
+from prompts.prompt_generator import plan_prompts
 from database.client import SupabaseClient
+from database.write_buffer import WriteBuffer
+from pipeline.fingerprint import fingerprint, snapshot_fingerprint
+from pipeline.metrics import RunMetrics
+from pipeline.snapshot_store import SnapshotStore
+
+
+def repo_slug(repo_url: str) -> str:
+    """Filesystem-safe `owner__repo` slug used for per-repo workdirs."""
+    parts = [p for p in repo_url.rstrip("/").split("/") if p][-2:]
+    slug = "__".join(parts) or "repo"
+    if slug.endswith(".git"):
+        slug = slug[:-4]
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", slug)
 
 
 class Pipeline:
-    def __init__(self, supabase: SupabaseClient, workdir: Path = Path(".cache")):
+    def __init__(
+        self,
+        supabase: SupabaseClient,
+        workdir: Path = Path(".cache"),
+        clone_cache: Optional[CloneCache] = None,
+        file_list_limit: Optional[int] = None,
+        github: Optional[GitHubClient] = None,
+        articles_dir: Path = Path("articles/final"),
+        clone_mode: str = "full",
+        prompt_budget: Optional[int] = None,
+        profile_dir: Optional[Path] = None,
+    ):
         self.supabase = supabase
         self.workdir = workdir
         self.workdir.mkdir(parents=True, exist_ok=True)
+        self.clone_cache = clone_cache or CloneCache(self.workdir / "clones", mode=clone_mode)
+        self.file_list_limit = file_list_limit
+        self.github = github or GitHubClient(
+            token=os.getenv("GITHUB_TOKEN"), cache_dir=self.workdir / "github_api"
+        )
+        self.snapshots = SnapshotStore(self.workdir / "snapshots.sqlite")
+        self.prompt_cache = PromptCache(self.workdir / "prompt_cache.sqlite")
+        self.prompt_budget = prompt_budget
+        self.profile_dir = profile_dir
+        self.articles_dir = articles_dir
+        self.manifest = ArticleManifest(self.articles_dir / MANIFEST_NAME)
+        self._buffer: Optional[WriteBuffer] = None
+        self._pending_states: Dict[str, tuple[Path, dict]] = {}
+
+    def run(self, repo_url: str, force: bool = False, full: bool = False) -> dict:
+        """Run every stage for one repository.
+
+        Returns a compact result (stages, a short draft summary, prompt count);
+        ``full=True`` also returns the snapshot, analysis, draft and prompts. With
+        ``profile_dir`` the run's profile is written to ``<repo_slug>.pstats`` there.
+        """
+        metrics = RunMetrics(repo_url, profile=self.profile_dir is not None)
+        round_trips = self.supabase.round_trips
+        record: Dict[str, Any] = {"url": repo_url, "metrics": metrics}
+        try:
+            record["snapshot"], record["snapshot_fp"] = self._collect(repo_url, metrics)
+            (record,) = self._stages([record], force=force, full=full)
+        finally:
+            self._dump_profile(metrics)
+        if "error" in record:
+            raise record["error"]
+        result = record["result"]
+        metrics.incr("db_round_trips", self.supabase.round_trips - round_trips)
+        result["metrics"] = metrics.as_dict()
+        metrics.emit()
+        return result
+
+    def run_many(
+        self,
+        urls: Iterable[str],
+        max_workers: int = 8,
+        force: bool = False,
+        max_in_flight: Optional[int] = None,
+        full: bool = False,
+    ) -> dict:
+        """Run the pipeline for many repositories.
+
+        The I/O-bound collect stage (clone + GitHub API) runs on a thread pool of
+        ``max_workers``; analyze/write/persist/output run on the calling thread as
+        snapshots arrive. At most ``max_in_flight`` repos (default ``2 * max_workers``)
+        are between submission and the end of the output stage, so memory stays
+        bounded however long the URL list is. A failing repo (including one that
+        cannot be cloned) is recorded and never aborts the batch. Supabase rows go
+        through a write-behind buffer flushed in array inserts, so DB round-trips
+        are reported for the batch rather than per repo.
+        """
+        urls = list(dict.fromkeys(u.strip() for u in urls if u and u.strip()))
+        started = time.perf_counter()
+        results: List[Dict[str, Any]] = []
+        round_trips = self.supabase.round_trips
+        self._buffer, self._pending_states = WriteBuffer(self.supabase, upsert=True), {}
+        try:
+            in_flight = max_in_flight or 2 * max(1, max_workers)
+            records = self._collect_stage(urls, max_workers, in_flight)
+            for record in self._stages(records, force=force, full=full):
+                self._dump_profile(record["metrics"])
+                results.append(self._batch_entry(record))
+            self._buffer.flush()
+            self._settle_pending_states(results)
+        finally:
+            self._buffer, self._pending_states = None, {}
+            self.manifest.save()
+        elapsed = time.perf_counter() - started
+        failures = [{"url": r["url"], "error": r["error"]} for r in results if r["status"] != "ok"]
+        unchanged = sum(1 for r in results if r.get("result", {}).get("skipped"))
+        slowest = sorted(
+            (r for r in results if "metrics" in r),
+            key=lambda r: r["metrics"]["total_wall_s"],
+            reverse=True,
+        )[:5]
+        return {
+            "results": results,
+            "summary": {
+                "total": len(urls),
+                "succeeded": len(urls) - len(failures),
+                "failed": len(failures),
+                "unchanged": unchanged,
+                "elapsed_s": round(elapsed, 3),
+                "repos_per_s": round(len(urls) / elapsed, 3) if elapsed > 0 else 0.0,
+                "max_workers": max_workers,
+                "db_round_trips": self.supabase.round_trips - round_trips,
+                "failures": failures,
+                "slowest": [{"url": r["url"], "wall_s": r["metrics"]["total_wall_s"]} for r in slowest],
+            },
+        }
+
+    # Stages -----------------------------------------------------------
+    # Each stage consumes and yields per-repo record dicts. Downstream stages pull
+    # one record at a time, so between stages at most one record is buffered; a
+    # record that failed upstream carries "error" and passes through untouched.
+    def _collect_stage(
+        self, urls: List[str], max_workers: int, max_in_flight: int
+    ) -> Iterator[Dict[str, Any]]:
+        """Collect on a thread pool, yielding records as they finish.
+
+        A new URL is only submitted once fewer than ``max_in_flight`` records are
+        collecting, queued or still travelling through the downstream stages.
+        """
+        done: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_in_flight)
+
+        def work(url: str) -> None:
+            metrics = RunMetrics(url, profile=self.profile_dir is not None)
+            record: Dict[str, Any] = {"url": url, "metrics": metrics}
+            try:
+                record["snapshot"], record["snapshot_fp"] = self._collect(
+                    url, record["metrics"], strict=True
+                )
+            except Exception as e:  # per-repo isolation
+                record["error"] = e
+            done.put(record)
+
+        pending = deque(urls)
+        in_flight = 0
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            while pending or in_flight:
+                while pending and in_flight < max_in_flight:
+                    pool.submit(work, pending.popleft())
+                    in_flight += 1
+                record = done.get()
+                yield record  # resumes once the record has left the last stage
+                in_flight -= 1
+
+    def _stages(
+        self, records: Iterable[Dict[str, Any]], force: bool = False, full: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        records = self._analyze_stage(records, force, full)
+        records = self._write_stage(records)
+        records = self._persist_stage(records, full)
+        return self._output_stage(records, full)
+
+    def _analyze_stage(
+        self, records: Iterable[Dict[str, Any]], force: bool, full: bool
+    ) -> Iterator[Dict[str, Any]]:
+        """Analyze unless the snapshot is unchanged; drops the snapshot afterwards.
+
+        Fingerprints of the previous run live in the repo workdir's ``state.json``;
+        ``force`` ignores them. Nothing downstream reads the snapshot (it is already
+        in the snapshot store), so its README and file list are released here.
+        """
+        for record in records:
+            if "error" in record:
+                yield record
+                continue
+            try:
+                state_path = self._repo_workdir(record["url"]) / "state.json"
+                state = {} if force else self._load_state(state_path)
+                stages: Dict[str, str] = {}
+                snapshot = record["snapshot"] if full else record.pop("snapshot")
+                snapshot_fp = record["snapshot_fp"]
+                if state.get("snapshot_fp") == snapshot_fp and "analysis" in state:
+                    analysis = state["analysis"]
+                    stages["analyze"] = "skipped"
+                else:
+                    with record["metrics"].stage("analyze"):
+                        analysis = analyze_repo(snapshot)
+                    stages["analyze"] = "run"
+                del snapshot
+                template_version = load_template(BLOG_TEMPLATE_PATH).version
+                write_fp = fingerprint(fingerprint(analysis), template_version)
+                record.update(
+                    state_path=state_path, analysis=analysis, write_fp=write_fp, stages=stages,
+                    skipped=state.get("write_fp") == write_fp,
+                )
+                if record["skipped"]:
+                    stages.update(write="skipped", persist="skipped")
+            except Exception as e:
+                record["error"] = e
+            yield record
+
+    def _write_stage(self, records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for record in records:
+            if "error" not in record and not record["skipped"]:
+                try:
+                    with record["metrics"].stage("write"):
+                        record["draft"] = generate_blog(record["analysis"])
+                        plan = plan_prompts(
+                            record["draft"], cache=self.prompt_cache, budget=self.prompt_budget
+                        )
+                    record["prompts"] = plan["prompts"]
+                    record["renders_avoided"] = plan["stats"]["renders_avoided"]
+                    if record["renders_avoided"]:
+                        record["metrics"].incr("renders_avoided", record["renders_avoided"])
+                    record["stages"]["write"] = "run"
+                except Exception as e:
+                    record["error"] = e
+            yield record
 
-    def run(self, repo_url: str) -> dict:
-        snapshot = collect_repo(repo_url, self.workdir / "repo")
-        save_snapshot(snapshot, self.workdir / "snapshot.json")
-        analysis = analyze_repo(snapshot)
-        draft = generate_blog(analysis)
-        prompts = generate_prompts(draft)
-        self._persist(draft, prompts)
-        self._write_local_outputs(draft)
+    def _persist_stage(
+        self, records: Iterable[Dict[str, Any]], full: bool
+    ) -> Iterator[Dict[str, Any]]:
+        """Upsert draft and prompts; the state is only updated after persisting succeeds.
+
+        In batch mode that is decided after the write buffer flushes. Prompts are
+        released here unless ``full`` (only their count is kept).
+        """
+        for record in records:
+            if "error" in record or record["skipped"]:
+                yield record
+                continue
+            try:
+                url, stages = record["url"], record["stages"]
+                with record["metrics"].stage("persist"):
+                    statuses = self._persist(url, record["draft"], record["prompts"])
+                new_state = {
+                    "snapshot_fp": record["snapshot_fp"],
+                    "write_fp": record["write_fp"],
+                    "analysis": record["analysis"],
+                    "title": record["draft"].get("title"),
+                }
+                if statuses is None:
+                    stages["persist"] = "buffered"
+                    self._pending_states[url] = (record["state_path"], new_state)
+                elif any(st.get("status") == "error" for st in statuses):
+                    stages["persist"] = "error"  # keep old state so the next run retries
+                else:
+                    stages["persist"] = "run"
+                    self._save_state(record["state_path"], new_state)
+                record["prompt_count"] = len(record["prompts"])
+                if not full:
+                    del record["prompts"]
+            except Exception as e:
+                record["error"] = e
+            yield record
+
+    def _output_stage(
+        self, records: Iterable[Dict[str, Any]], full: bool
+    ) -> Iterator[Dict[str, Any]]:
+        """Write local article files, then reduce the record to its result."""
+        for record in records:
+            if "error" not in record:
+                try:
+                    if not record["skipped"]:
+                        with record["metrics"].stage("output"):
+                            self._write_local_outputs(
+                                record["draft"], record["url"], record["analysis"]
+                            )
+                    record["result"] = self._result(record, full)
+                except Exception as e:
+                    record["error"] = e
+            yield record
+
+    @staticmethod
+    def _result(record: Dict[str, Any], full: bool) -> dict:
+        draft = record.get("draft")
+        if full:
+            return {
+                "snapshot": record.get("snapshot"),
+                "analysis": record["analysis"],
+                "draft": draft,
+                "prompts": record.get("prompts", []),
+                "stages": record["stages"],
+                "skipped": record["skipped"],
+            }
         return {
-            "snapshot": snapshot,
-            "analysis": analysis,
-            "draft": draft,
-            "prompts": prompts,
+            "draft": {
+                "title": draft.get("title"),
+                "slug": article_slug(draft.get("title", "draft")),
+                "body_chars": len(draft.get("body_md", "")),
+                "template_version": draft.get("template_version"),
+            } if draft else None,
+            "prompt_count": record.get("prompt_count", 0),
+            "renders_avoided": record.get("renders_avoided", 0),
+            "snapshot_fp": record["snapshot_fp"],
+            "stages": record["stages"],
+            "skipped": record["skipped"],
         }
 
+    @staticmethod
+    def _batch_entry(record: Dict[str, Any]) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {"url": record["url"], "status": "ok", "error": None}
+        if "error" in record:
+            e = record["error"]
+            entry.update(status="error", error=f"{type(e).__name__}: {e}")
+            return entry
+        entry["result"] = record["result"]
+        entry["metrics"] = record["metrics"].as_dict()
+        record["metrics"].emit()
+        return entry
+
     # Internal helpers -------------------------------------------------
-    def _persist(self, draft: dict, prompts: list[dict]) -> None:
-        self.supabase.insert("blog_drafts", draft)
-        for p in prompts:
-            self.supabase.insert("image_prompts", p)
+    def _settle_pending_states(self, results: List[Dict[str, Any]]) -> None:
+        """After the buffer flush: save state for persisted repos, flag the rest."""
+        failed = self._buffer.failed_keys() if self._buffer else set()
+        for entry in results:
+            pending = self._pending_states.get(entry["url"])
+            if pending is None:
+                continue
+            if entry["url"] in failed:
+                entry["status"] = "error"
+                entry["error"] = "persist failed"
+                entry["result"]["stages"]["persist"] = "error"
+            else:
+                self._save_state(*pending)
+                entry["result"]["stages"]["persist"] = "run"
+
+    def _dump_profile(self, metrics: RunMetrics) -> None:
+        if self.profile_dir is not None:
+            metrics.dump_profile(self.profile_dir / f"{repo_slug(metrics.repo_url)}.pstats")
+
+    def _repo_workdir(self, repo_url: str) -> Path:
+        path = self.workdir / "repos" / repo_slug(repo_url)
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def _collect(
+        self, repo_url: str, metrics: RunMetrics, strict: bool = False
+    ) -> tuple[dict, str]:
+        """Collect and store the snapshot; returns it with its fingerprint (computed once).
+
+        ``strict`` raises ``CollectError`` instead of going on with the empty
+        fallback snapshot ``collect_repo`` returns when the clone fails.
+        """
+        workdir = self._repo_workdir(repo_url)
+        with metrics.stage("collect"):
+            snapshot = collect_repo(
+                repo_url,
+                workdir,
+                cache=self.clone_cache,
+                file_list_limit=self.file_list_limit,
+                api=self.github,
+                metrics=metrics,
+            )
+        if strict and snapshot.get("error"):
+            raise CollectError(snapshot["error"])
+        with metrics.stage("snapshot"):
+            snapshot_fp = snapshot_fingerprint(snapshot)
+            self.snapshots.put(repo_url, snapshot, fingerprint=snapshot_fp)
+        return snapshot, snapshot_fp
+
+    @staticmethod
+    def _load_state(path: Path) -> dict:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+
+    @staticmethod
+    def _save_state(path: Path, state: dict) -> None:
+        path.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+
+    def _persist(self, repo_url: str, draft: dict, prompts: list[dict]) -> Optional[list[dict]]:
+        """Upsert the draft and its prompts; None when deferred to the batch buffer.
+
+        Drafts are keyed by repo and prompts by a hash of (repo, section, prompt),
+        so re-runs update the draft in place and never re-queue a known prompt.
+        """
+        repo = normalize_repo_url(repo_url)
+        draft_row = {**draft, "repo": repo}
+        prompt_rows = [
+            {**p, "repo": repo, "prompt_hash": fingerprint(repo, p.get("section"), p.get("prompt"))}
+            for p in prompts
+        ]
+        if self._buffer is not None:
+            self._buffer.add("blog_drafts", draft_row, key=repo_url)
+            self._buffer.extend("image_prompts", prompt_rows, key=repo_url)
+            return None
+        statuses = self.supabase.upsert_many("blog_drafts", [draft_row])
+        return statuses + self.supabase.upsert_many("image_prompts", prompt_rows)
+
+    def _write_local_outputs(
+        self, draft: dict, repo_url: str = "", analysis: Optional[dict] = None
+    ) -> None:
+        """Write ``<slug>.md``/``.html`` and record the post in the article manifest.
 
-    def _write_local_outputs(self, draft: dict) -> None:
-        out_dir = Path("articles/final")
+        The manifest is saved straight away for single runs; ``run_many`` saves it
+        once at the end of the batch.
+        """
+        out_dir = self.articles_dir
         out_dir.mkdir(parents=True, exist_ok=True)
-        slug = draft.get("title", "draft").replace(" ", "_")
-        (out_dir / f"{slug}.md").write_text(draft.get("body_md", ""), encoding="utf-8")
-        html = self._markdown_to_html(draft.get("body_md", ""))
+        title = draft.get("title", "draft")
+        slug = article_slug(title)
+        body = draft.get("body_md", "")
+        (out_dir / f"{slug}.md").write_text(body, encoding="utf-8")
+        html = self._markdown_to_html(body, title)
         (out_dir / f"{slug}.html").write_text(html, encoding="utf-8")
+        self.manifest.record(
+            title,
+            body,
+            repo=normalize_repo_url(repo_url) if repo_url else "",
+            tech_stack=(analysis or {}).get("tech_stack", ()),
+        )
+        if self._buffer is None:
+            self.manifest.save()
 
     @staticmethod
-    def _markdown_to_html(md: str) -> str:
-        # very small converter to keep dependencies light; replace with markdown lib if needed
-        html = md.replace("\n\n", "<br><br>").replace("\n", "<br>")
-        return f"<html><body>{html}</body></html>"
+    def _markdown_to_html(md: str, title: str = "") -> str:
+        return render_document(md, title=title)
 
 
-__all__ = ["Pipeline"]
+__all__ = ["Pipeline", "repo_slug"]
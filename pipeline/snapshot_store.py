@@ -0,0 +1,256 @@
+"""SQLite store of repo snapshots, one version per (repo, commit SHA).
+
+Snapshots are written compactly: the small metadata as zlib'd compact JSON, and
+the two large fields — ``readme_text`` and ``file_list`` — in their own
+compressed columns. ``get`` returns a ``StoredSnapshot`` mapping that only
+decompresses those columns when they are accessed. Re-collecting a commit
+replaces its row; ``gc`` keeps the newest ``keep`` versions per repo.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from collectors.clone_cache import normalize_repo_url
+from pipeline.fingerprint import VOLATILE_SNAPSHOT_KEYS, snapshot_fingerprint
+
+LAZY_FIELDS = ("readme_text", "file_list")
+_INFO_KEYS = ("id", "repo", "commit_sha", "fingerprint", "created_at", "file_count")
+
+_SCHEMA = """
+create table if not exists snapshots (
+    id integer primary key,
+    repo text not null,
+    version text not null,          -- commit SHA, or the fingerprint when offline
+    commit_sha text,
+    fingerprint text not null,
+    created_at real not null,
+    file_count integer not null default 0,
+    meta blob not null,
+    readme_text blob,
+    file_list blob,
+    unique (repo, version)
+);
+create index if not exists snapshots_repo_created on snapshots (repo, created_at);
+"""
+
+
+def _pack(value: Any) -> bytes:
+    text = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return zlib.compress(text.encode("utf-8"))
+
+
+def _unpack(blob: Optional[bytes]) -> Any:
+    return json.loads(zlib.decompress(blob)) if blob else None
+
+
+class StoredSnapshot(Mapping):
+    """Read-only snapshot; ``readme_text``/``file_list`` load on first access."""
+
+    def __init__(
+        self, store: "SnapshotStore", row_id: int, info: Dict[str, Any], meta: Dict[str, Any]
+    ):
+        self._store = store
+        self.id = row_id
+        self.info = info
+        self._data = meta
+        self._missing = [k for k in LAZY_FIELDS if k not in meta]
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._data:
+            return self._data[key]
+        if key in self._missing:
+            self._data[key] = self._store._load_field(self.id, key)
+            self._missing.remove(key)
+            return self._data[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._data
+        yield from list(self._missing)
+
+    def __len__(self) -> int:
+        return len(self._data) + len(self._missing)
+
+    def loaded(self, key: str) -> bool:
+        return key in self._data
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: self[k] for k in list(self)}
+
+
+class SnapshotStore:
+    def __init__(self, path: Path, keep: int = 5):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("pragma journal_mode=wal")
+        self._conn.execute("pragma synchronous=normal")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # Writes -----------------------------------------------------------
+    def put(
+        self, repo_url: str, snapshot: Dict[str, Any], fingerprint: Optional[str] = None
+    ) -> int:
+        """Store ``snapshot`` under (repo, commit SHA); an identical row is left untouched.
+
+        Pass ``fingerprint`` when the caller already has ``snapshot_fingerprint(snapshot)``.
+        """
+        repo = normalize_repo_url(repo_url)
+        fp = fingerprint or snapshot_fingerprint(snapshot)
+        sha = snapshot.get("commit_sha")
+        version = sha or f"fp:{fp}"
+        skip = set(LAZY_FIELDS) | VOLATILE_SNAPSHOT_KEYS
+        meta = {k: v for k, v in snapshot.items() if k not in skip}
+        readme = snapshot.get("readme_text")
+        files = snapshot.get("file_list")
+        with self._lock:
+            row = self._conn.execute(
+                "select id, fingerprint from snapshots where repo = ? and version = ?",
+                (repo, version),
+            ).fetchone()
+            if row and row[1] == fp:
+                return row[0]
+            cur = self._conn.execute(
+                "insert or replace into snapshots (repo, version, commit_sha, fingerprint,"
+                " created_at, file_count, meta, readme_text, file_list)"
+                " values (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    repo, version, sha, fp, time.time(),
+                    snapshot.get("file_count", len(files or [])),
+                    _pack(meta),
+                    zlib.compress(readme.encode("utf-8")) if readme is not None else None,
+                    zlib.compress("\0".join(files).encode("utf-8")) if files is not None else None,
+                ),
+            )
+            row_id = cur.lastrowid
+            if self.keep:
+                self._gc_locked(repo, self.keep)
+            return row_id
+
+    def gc(self, keep: Optional[int] = None, repo: Optional[str] = None) -> int:
+        """Delete all but the newest ``keep`` versions (per repo, or only ``repo``)."""
+        keep = self.keep if keep is None else keep
+        with self._lock:
+            repos = [normalize_repo_url(repo)] if repo else [
+                r for (r,) in self._conn.execute("select distinct repo from snapshots")
+            ]
+            removed = sum(self._gc_locked(r, keep) for r in repos)
+        return removed
+
+    def _gc_locked(self, repo: str, keep: int) -> int:
+        cur = self._conn.execute(
+            "delete from snapshots where repo = ? and id not in"
+            " (select id from snapshots where repo = ? order by created_at desc, id desc limit ?)",
+            (repo, repo, max(0, keep)),
+        )
+        return cur.rowcount
+
+    # Reads ------------------------------------------------------------
+    def list(self, repo: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Versions newest first, without loading any snapshot bodies."""
+        sql = "select id, repo, commit_sha, fingerprint, created_at, file_count from snapshots"
+        args: tuple = ()
+        if repo:
+            sql += " where repo = ?"
+            args = (normalize_repo_url(repo),)
+        with self._lock:
+            rows = self._conn.execute(
+                sql + " order by repo, created_at desc, id desc", args
+            ).fetchall()
+        return [dict(zip(_INFO_KEYS, row)) for row in rows]
+
+    def get(
+        self, repo: str, commit_sha: Optional[str] = None, snapshot_id: Optional[int] = None
+    ) -> Optional[StoredSnapshot]:
+        """Latest snapshot of ``repo``, or the one at ``commit_sha`` / with ``snapshot_id``."""
+        sql = (
+            "select id, repo, commit_sha, fingerprint, created_at, file_count, meta"
+            " from snapshots where repo = ?"
+        )
+        args: tuple = (normalize_repo_url(repo),)
+        if snapshot_id is not None:
+            sql += " and id = ?"
+            args += (snapshot_id,)
+        elif commit_sha:
+            sql += " and commit_sha = ?"
+            args += (commit_sha,)
+        with self._lock:
+            row = self._conn.execute(
+                sql + " order by created_at desc, id desc limit 1", args
+            ).fetchone()
+        if row is None:
+            return None
+        info = dict(zip(_INFO_KEYS, row[:6]))
+        return StoredSnapshot(self, row[0], info, _unpack(row[6]))
+
+    def _load_field(self, row_id: int, field: str) -> Any:
+        if field not in LAZY_FIELDS:
+            raise KeyError(field)
+        with self._lock:
+            row = self._conn.execute(
+                f"select {field} from snapshots where id = ?", (row_id,)
+            ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        text = zlib.decompress(row[0]).decode("utf-8")
+        if field == "file_list":
+            return text.split("\0") if text else []
+        return text
+
+    def diff(
+        self, repo: str, old_sha: Optional[str] = None, new_sha: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Compare two versions of ``repo`` by commit SHA.
+
+        ``new_sha`` defaults to the newest snapshot and ``old_sha`` to the one
+        stored just before ``new``; a given SHA that is not stored raises KeyError.
+        """
+        if new_sha:
+            new = self.get(repo, new_sha)
+            if new is None:
+                raise KeyError(f"snapshot not found for {repo} at {new_sha}")
+        else:
+            new = self.get(repo)
+            if new is None:
+                raise ValueError(f"need two snapshots of {repo} to diff, found 0")
+        if old_sha:
+            old = self.get(repo, old_sha)
+            if old is None:
+                raise KeyError(f"snapshot not found for {repo} at {old_sha}")
+        else:
+            older = [v for v in self.list(repo) if v["id"] < new.id]
+            if not older:
+                raise ValueError(f"no snapshot of {repo} older than {new.info['commit_sha']} to diff")
+            old = self.get(repo, snapshot_id=older[0]["id"])
+        changed = {}
+        for key in sorted(set(old._data) | set(new._data)):
+            if key in LAZY_FIELDS:
+                continue
+            if old._data.get(key) != new._data.get(key):
+                changed[key] = {"old": old._data.get(key), "new": new._data.get(key)}
+        old_files, new_files = set(old["file_list"] or []), set(new["file_list"] or [])
+        return {
+            "repo": new.info["repo"],
+            "old": old.info["commit_sha"],
+            "new": new.info["commit_sha"],
+            "changed": changed,
+            "readme_changed": old["readme_text"] != new["readme_text"],
+            "files_added": sorted(new_files - old_files),
+            "files_removed": sorted(old_files - new_files),
+        }
+
+
+__all__ = ["SnapshotStore", "StoredSnapshot", "LAZY_FIELDS"]
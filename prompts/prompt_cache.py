@@ -0,0 +1,181 @@
+"""Persistent prompt → rendered-image cache with near-duplicate lookup.
+
+Prompts are normalized (NFKC, lower case, punctuation and whitespace folded)
+and keyed by the sha256 of that text, so an identical prompt is found with a
+single indexed read. Near-duplicates are found with MinHash over character
+5-gram shingles of the prompt *subject* (``prompt_subject``: the shared style
+suffix and the per-repo "Illustration for <title> -" prefix removed): the
+signature is split into LSH bands, candidates sharing any band are fetched and
+accepted when their estimated Jaccard similarity reaches ``threshold``.
+
+Only rendered prompts are stored; the image worker records each finished render.
+"""
+from __future__ import annotations
+
+import hashlib
+import random
+import sqlite3
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from prompts.prompt_generator import normalize_prompt, prompt_subject
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE = 5
+DEFAULT_THRESHOLD = 0.7
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+_SIG = struct.Struct(f"<{NUM_PERM}Q")
+
+_SCHEMA = """
+create table if not exists prompts (
+    hash text primary key,
+    prompt text not null,
+    image_url text not null,
+    signature blob not null,
+    created_at real not null,
+    hits integer not null default 0
+);
+create table if not exists bands (
+    band integer not null,
+    bucket blob not null,
+    hash text not null,
+    primary key (band, bucket, hash)
+) without rowid;
+"""
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(normalize_prompt(prompt).encode("utf-8")).hexdigest()
+
+
+def shingles(text: str, k: int = SHINGLE) -> List[int]:
+    if len(text) <= k:
+        grams = {text}
+    else:
+        grams = {text[i:i + k] for i in range(len(text) - k + 1)}
+    return [
+        int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "little")
+        for g in grams
+    ]
+
+
+def minhash(text: str) -> Tuple[int, ...]:
+    hashes = shingles(text)
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS)
+
+
+def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_PERM
+
+
+def _bands(sig: Tuple[int, ...]) -> List[Tuple[int, bytes]]:
+    packed = _SIG.pack(*sig)
+    width = ROWS * 8
+    return [
+        (i, hashlib.blake2b(packed[i * width:(i + 1) * width], digest_size=8).digest())
+        for i in range(BANDS)
+    ]
+
+
+class PromptCache:
+    def __init__(self, path: Path, threshold: float = DEFAULT_THRESHOLD):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("pragma journal_mode=wal")
+        self._conn.execute("pragma synchronous=normal")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def lookup(self, prompt: str) -> Optional[Dict[str, Any]]:
+        """Cached render for ``prompt``: ``{image_url, hash, match, similarity}`` or None.
+
+        ``match`` is ``"exact"`` (same normalized prompt) or ``"near"`` (estimated
+        similarity of the subjects at least ``threshold``).
+        """
+        best = self.nearest(prompt)
+        if best is None or best["similarity"] < self.threshold:
+            return None
+        self.touch(best["hash"])
+        return best
+
+    def nearest(self, prompt: str) -> Optional[Dict[str, Any]]:
+        """Most similar cached prompt among the LSH candidates, whatever its score."""
+        key = prompt_hash(prompt)
+        with self._lock:
+            row = self._conn.execute(
+                "select image_url from prompts where hash = ?", (key,)
+            ).fetchone()
+        if row:
+            return {"image_url": row[0], "hash": key, "match": "exact", "similarity": 1.0}
+        sig = minhash(prompt_subject(prompt))
+        clauses = " or ".join("(band = ? and bucket = ?)" for _ in range(BANDS))
+        args = [v for pair in _bands(sig) for v in pair]
+        with self._lock:
+            rows = self._conn.execute(
+                "select hash, image_url, signature from prompts where hash in"
+                f" (select hash from bands where {clauses})",
+                args,
+            ).fetchall()
+        best: Optional[Dict[str, Any]] = None
+        for cached_key, image_url, blob in rows:
+            score = similarity(sig, _SIG.unpack(blob))
+            if best is None or score > best["similarity"]:
+                best = {"image_url": image_url, "hash": cached_key, "match": "near", "similarity": score}
+        return best
+
+    def touch(self, key: str) -> None:
+        """Count a reuse of the cached prompt ``key``."""
+        with self._lock:
+            self._conn.execute("update prompts set hits = hits + 1 where hash = ?", (key,))
+
+    def record(self, prompt: str, image_url: str) -> str:
+        """Remember that ``prompt`` rendered to ``image_url``; returns the prompt hash."""
+        key = prompt_hash(prompt)
+        sig = minhash(prompt_subject(prompt))
+        with self._lock:
+            self._conn.execute("begin")
+            try:
+                self._conn.execute(
+                    "insert or replace into prompts (hash, prompt, image_url, signature, created_at)"
+                    " values (?, ?, ?, ?, ?)",
+                    (key, prompt, image_url, _SIG.pack(*sig), time.time()),
+                )
+                self._conn.executemany(
+                    "insert or ignore into bands (band, bucket, hash) values (?, ?, ?)",
+                    [(band, bucket, key) for band, bucket in _bands(sig)],
+                )
+                self._conn.execute("commit")
+            except Exception:
+                self._conn.execute("rollback")
+                raise
+        return key
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            count, hits = self._conn.execute(
+                "select count(*), coalesce(sum(hits), 0) from prompts"
+            ).fetchone()
+        return {"entries": count, "hits": hits}
+
+
+__all__ = [
+    "PromptCache",
+    "minhash",
+    "prompt_hash",
+    "similarity",
+]
@@ -1,13 +1,46 @@
-"""Generate Midjourney prompts based on blog sections."""
+"""Generate Midjourney prompts based on blog sections.
+
+``plan_prompts`` can dedupe against a ``PromptCache``: a prompt whose normalized
+text, or whose subject nearly, matches an already rendered one reuses that image
+instead of queueing a render. ``budget`` caps the new renders per post and is
+spent on the most distinctive sections first — those least like anything in
+the cache and least like the post's other sections.
+"""
 from __future__ import annotations
 
-from typing import List, Dict, Any
+import re
+import unicodedata
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    from prompts.prompt_cache import PromptCache
 
 
 BASE_STYLE = "ultra-detailed, cinematic lighting, clean UI, trending on artstation"
+SECTION_PREFIX = "Illustration for "
+
+_PUNCT_RE = re.compile(r"[^\w\s]+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """NFKC, lower case, punctuation dropped and whitespace collapsed."""
+    text = unicodedata.normalize("NFKC", prompt).lower()
+    return _SPACE_RE.sub(" ", _PUNCT_RE.sub(" ", text)).strip()
 
 
-def generate_prompts(draft: Dict[str, Any]) -> List[Dict[str, str]]:
+def prompt_subject(prompt: str) -> str:
+    """Normalized prompt without the shared style and the per-repo title prefix."""
+    text = prompt
+    if text.endswith(f", {BASE_STYLE}"):
+        text = text[: -len(BASE_STYLE) - 2]
+    if text.startswith(SECTION_PREFIX):
+        _title, sep, rest = text.partition(" - ")
+        text = rest if sep else text
+    return normalize_prompt(text)
+
+
+def _section_prompts(draft: Dict[str, Any]) -> List[Dict[str, str]]:
     prompts: List[Dict[str, str]] = []
     sections = draft.get("sections") or []
     title = draft.get("title", "an open-source project")
@@ -23,9 +56,86 @@ def generate_prompts(draft: Dict[str, Any]) -> List[Dict[str, str]]:
         detail = section.get("content", "")[:180]
         prompts.append({
             "section": sec_title,
-            "prompt": f"Illustration for {title} - {sec_title}: {detail}, {BASE_STYLE}"
+            "prompt": f"{SECTION_PREFIX}{title} - {sec_title}: {detail}, {BASE_STYLE}"
         })
     return prompts
 
 
-__all__ = ["generate_prompts"]
+def _grams(text: str, k: int = 5) -> set:
+    return {text[i:i + k] for i in range(max(1, len(text) - k + 1))}
+
+
+def _distinctiveness(prompts: List[Dict[str, Any]], closeness: List[float]) -> List[float]:
+    """(1 - similarity to the nearest cached render) × share of subject n-grams
+    that no other section of the post has."""
+    grams = [_grams(prompt_subject(p["prompt"])) for p in prompts]
+    scores = []
+    for i, own in enumerate(grams):
+        others = set().union(*(g for j, g in enumerate(grams) if j != i))
+        unique = len(own - others) / len(own) if own else 0.0
+        scores.append((1.0 - closeness[i]) * unique)
+    return scores
+
+
+def plan_prompts(
+    draft: Dict[str, Any],
+    cache: Optional["PromptCache"] = None,
+    budget: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Prompts for ``draft`` plus ``stats``.
+
+    With a cache every row carries ``status`` (``done`` when an image is reused,
+    else ``waiting``) and ``image_url``, so rows share one shape for bulk upserts.
+    Prompts cut by ``budget`` are left out. ``stats`` counts ``exact_hits``,
+    ``near_hits``, ``renders_avoided``, ``queued`` and ``over_budget``.
+    """
+    prompts = _section_prompts(draft)
+    stats = {"total": len(prompts), "exact_hits": 0, "near_hits": 0,
+             "renders_avoided": 0, "queued": len(prompts), "over_budget": 0}
+    if cache is None and budget is None:
+        return {"prompts": prompts, "stats": stats}
+
+    fresh: List[Dict[str, Any]] = []
+    closeness: List[float] = []
+    seen: Dict[str, Dict[str, Any]] = {}
+    for p in prompts:
+        key = normalize_prompt(p["prompt"])
+        if key in seen:  # same prompt twice in one post renders once
+            p.update(status="duplicate")
+            continue
+        seen[key] = p
+        nearest = cache.nearest(p["prompt"]) if cache is not None else None
+        if nearest is not None and nearest["similarity"] >= cache.threshold:
+            cache.touch(nearest["hash"])
+            p.update(status="done", image_url=nearest["image_url"])
+            stats[f"{nearest['match']}_hits"] += 1
+            continue
+        p.update(status="waiting", image_url=None)
+        fresh.append(p)
+        closeness.append(nearest["similarity"] if nearest else 0.0)
+
+    if budget is not None and len(fresh) > budget:
+        scores = _distinctiveness(fresh, closeness)
+        ranked = sorted(range(len(fresh)), key=lambda i: scores[i], reverse=True)
+        for i in ranked[budget:]:
+            fresh[i]["status"] = "over_budget"
+        stats["over_budget"] = len(fresh) - budget
+
+    kept = [p for p in prompts if p["status"] in ("done", "waiting")]
+    stats["renders_avoided"] = stats["exact_hits"] + stats["near_hits"] + (len(prompts) - len(seen))
+    stats["queued"] = sum(1 for p in kept if p["status"] == "waiting")
+    if cache is None:
+        for p in kept:
+            del p["status"], p["image_url"]
+    return {"prompts": kept, "stats": stats}
+
+
+def generate_prompts(
+    draft: Dict[str, Any],
+    cache: Optional["PromptCache"] = None,
+    budget: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    return plan_prompts(draft, cache, budget)["prompts"]
+
+
+__all__ = ["generate_prompts", "plan_prompts", "normalize_prompt", "prompt_subject", "BASE_STYLE"]
@@ -0,0 +1,133 @@
+"""Shared HTTP plumbing for publish targets.
+
+Each ``Publisher`` owns one ``requests.Session`` (keep-alive + a connection pool
+sized to its concurrency), a per-target ``RateLimiter`` and retry with
+exponential backoff on 429/5xx and connection errors.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import requests  # type: ignore
+    from requests.adapters import HTTPAdapter  # type: ignore
+except Exception:  # pragma: no cover
+    requests = None  # type: ignore
+    HTTPAdapter = None  # type: ignore
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class PublishError(RuntimeError):
+    pass
+
+
+class RateLimiter:
+    """Spaces call starts at least ``1 / rate_per_s`` apart across threads."""
+
+    def __init__(
+        self,
+        rate_per_s: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.interval = 1.0 / rate_per_s if rate_per_s > 0 else 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = self.clock()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            self.sleep(start - now)
+
+
+class Publisher(ABC):
+    """Base class; subclasses implement ``publish(post) -> link``.
+
+    ``post`` is a dict with ``slug``, ``title``, ``html``, ``body_md``, ``tags``
+    and ``content_hash`` (see ``publishers.sources``).
+    """
+
+    name = "base"
+
+    def __init__(
+        self,
+        base_url: str,
+        rate_per_s: float = 1.0,
+        concurrency: int = 2,
+        timeout: float = 10.0,
+        max_retries: int = 4,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if requests is None:
+            raise PublishError("the requests package is required for publishing")
+        self.base_url = base_url.rstrip("/")
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.sleep = sleep
+        self.limiter = RateLimiter(rate_per_s, sleep=sleep)
+        self.stats = {"requests": 0, "retries": 0}
+        self._stats_lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @abstractmethod
+    def publish(self, post: Dict[str, Any]) -> str:
+        """Create or update ``post`` on the target; returns its public link."""
+
+    def request(self, method: str, path: str, **kwargs: Any) -> "requests.Response":
+        """Rate-limited request that retries 429/5xx with exponential backoff."""
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        kwargs.setdefault("timeout", self.timeout)
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            self._count("requests")
+            try:
+                resp = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise PublishError(f"{self.name}: {type(e).__name__}: {e}") from e
+                self._wait(attempt, None)
+                continue
+            if resp.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                self._wait(attempt, resp.headers.get("Retry-After"))
+                continue
+            if resp.status_code >= 400:
+                raise PublishError(f"{self.name}: HTTP {resp.status_code}: {resp.text[:200]}")
+            return resp
+        raise PublishError(f"{self.name}: retries exhausted")  # pragma: no cover
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _wait(self, attempt: int, retry_after: Optional[str]) -> None:
+        self._count("retries")
+        try:
+            delay = float(retry_after) if retry_after else self.backoff * 2 ** attempt
+        except ValueError:  # HTTP-date form; fall back to our own schedule
+            delay = self.backoff * 2 ** attempt
+        self.sleep(min(delay, self.max_backoff))
+
+    def close(self) -> None:
+        self.session.close()
+
+
+__all__ = ["Publisher", "PublishError", "RateLimiter", "RETRY_STATUSES"]
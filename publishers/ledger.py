@@ -0,0 +1,52 @@
+"""Idempotency record of what has been published where.
+
+Keyed by ``(target, content_hash)``: re-running the publisher over the same posts
+skips everything already live, while an edited post (new hash) goes out again.
+Each successful publish is persisted immediately (atomic rewrite), so a crash
+mid-run cannot cause a double post on the next one.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from database.client import utc_now
+
+
+class PublishLedger:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            self._entries: Dict[str, Dict[str, Any]] = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._entries = {}
+
+    @staticmethod
+    def key(target: str, content_hash: str) -> str:
+        return f"{target}:{content_hash}"
+
+    def get(self, target: str, content_hash: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._entries.get(self.key(target, content_hash))
+
+    def record(self, target: str, post: Dict[str, Any], link: str) -> None:
+        entry = {"slug": post.get("slug"), "link": link, "published_at": utc_now().isoformat()}
+        with self._lock:
+            self._entries[self.key(target, post["content_hash"])] = entry
+            self._save_locked()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _save_locked(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._entries, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+__all__ = ["PublishLedger"]
@@ -0,0 +1,75 @@
+"""Fan posts out to every publish target concurrently.
+
+Each target gets its own thread pool sized to its ``concurrency`` (matching its
+session's connection pool), so a slow or rate-limited target never holds up the
+others. Posts already in the ledger for a target are skipped; one failure is
+recorded and never aborts the run.
+"""
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from publishers.base import Publisher
+from publishers.ledger import PublishLedger
+
+
+def publish_posts(
+    posts: Iterable[Dict[str, Any]],
+    publishers: Mapping[str, Publisher],
+    ledger: Optional[PublishLedger] = None,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    posts = list(posts)
+    started = time.perf_counter()
+    results: List[Dict[str, Any]] = []
+    pools = {
+        name: ThreadPoolExecutor(max_workers=getattr(p, "concurrency", 1), thread_name_prefix=name)
+        for name, p in publishers.items()
+    }
+    futures = {}
+    try:
+        for name, publisher in publishers.items():
+            for post in posts:
+                done = ledger.get(name, post["content_hash"]) if ledger else None
+                if done is not None:
+                    results.append(_result(name, post, "skipped", link=done.get("link")))
+                elif dry_run:
+                    results.append(_result(name, post, "dry_run"))
+                else:
+                    futures[pools[name].submit(publisher.publish, post)] = (name, post)
+        for future in as_completed(futures):
+            name, post = futures[future]
+            try:
+                link = future.result()
+            except Exception as e:  # per-post isolation
+                results.append(_result(name, post, "error", error=f"{type(e).__name__}: {e}"))
+                continue
+            if ledger is not None:
+                ledger.record(name, post, link)
+            results.append(_result(name, post, "published", link=link))
+    finally:
+        for pool in pools.values():
+            pool.shutdown(wait=True)
+
+    counts = {s: sum(1 for r in results if r["status"] == s)
+              for s in ("published", "skipped", "error", "dry_run")}
+    return {
+        "results": results,
+        "summary": {
+            "posts": len(posts),
+            "targets": sorted(publishers),
+            **counts,
+            "elapsed_s": round(time.perf_counter() - started, 3),
+            "failures": [r for r in results if r["status"] == "error"],
+        },
+    }
+
+
+def _result(target: str, post: Dict[str, Any], status: str, link: Optional[str] = None,
+             error: Optional[str] = None) -> Dict[str, Any]:
+    return {"target": target, "slug": post.get("slug"), "status": status, "link": link, "error": error}
+
+
+__all__ = ["publish_posts"]
@@ -0,0 +1,51 @@
+"""Post sources for the publisher: the article manifest or Supabase drafts.
+
+Both yield dicts with ``slug``, ``title``, ``html``, ``body_md``, ``tags``,
+``repo`` and ``content_hash`` (``body_hash`` of the Markdown body, the manifest's
+key, so a post keeps its ledger key across sources and regeneration dates).
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+from database.client import SupabaseClient
+from writers.manifest import MANIFEST_NAME, ArticleManifest, article_slug, body_hash
+from writers.markdown_renderer import render_document
+
+
+def posts_from_manifest(articles_dir: Path = Path("articles/final")) -> Iterator[Dict[str, Any]]:
+    """Posts listed in ``manifest.json``; entries whose HTML file is missing are skipped."""
+    for entry in ArticleManifest(articles_dir / MANIFEST_NAME).posts():
+        html_path = articles_dir / entry["href"]
+        if not html_path.is_file():
+            continue
+        md_path = html_path.with_suffix(".md")
+        yield {
+            "slug": entry["slug"],
+            "title": entry["title"],
+            "html": html_path.read_text(encoding="utf-8"),
+            "body_md": md_path.read_text(encoding="utf-8") if md_path.is_file() else "",
+            "tags": entry.get("tech_stack", []),
+            "repo": entry.get("repo", ""),
+            "content_hash": entry["content_hash"],
+        }
+
+
+def posts_from_supabase(client: SupabaseClient, page_size: int = 100) -> Iterator[Dict[str, Any]]:
+    """Drafts from ``blog_drafts``, rendered to HTML on the fly."""
+    for row in client.iter_drafts(page_size=page_size):
+        title = row.get("title") or "draft"
+        body = row.get("body_md") or ""
+        yield {
+            "slug": article_slug(title),
+            "title": title,
+            "html": render_document(body, title=title),
+            "body_md": body,
+            "tags": row.get("seo_keywords") or [],
+            "repo": row.get("repo", ""),
+            "content_hash": body_hash(body),
+        }
+
+
+__all__ = ["posts_from_manifest", "posts_from_supabase"]
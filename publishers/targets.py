@@ -0,0 +1,126 @@
+"""Concrete publish targets. ``from_env`` returns None when a target is not configured."""
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, Optional
+
+from publishers.base import Publisher, PublishError
+
+
+class WordPressPublisher(Publisher):
+    """WordPress REST API (``/wp-json/wp/v2/posts``) with a bearer token."""
+
+    name = "wordpress"
+
+    def __init__(self, base_url: str, key: str, status: str = "publish", **kwargs: Any):
+        super().__init__(base_url, **kwargs)
+        self.status = status
+        self.session.headers["Authorization"] = f"Bearer {key}"
+
+    @classmethod
+    def from_env(cls, **kwargs: Any) -> Optional["WordPressPublisher"]:
+        url, key = os.getenv("PUBLISH_WORDPRESS_URL"), os.getenv("PUBLISH_WORDPRESS_KEY")
+        return cls(url, key, **kwargs) if url and key else None
+
+    def publish(self, post: Dict[str, Any]) -> str:
+        payload = {"title": post["title"], "content": post["html"], "status": self.status}
+        resp = self.request("POST", "/wp-json/wp/v2/posts", json=payload)
+        return resp.json().get("link", "")
+
+
+class TistoryPublisher(Publisher):
+    """Tistory Open API ``post/write``."""
+
+    name = "tistory"
+
+    def __init__(
+        self, token: str, blog_name: str, base_url: str = "https://www.tistory.com", **kwargs: Any
+    ):
+        super().__init__(base_url, **kwargs)
+        self.token = token
+        self.blog_name = blog_name
+
+    @classmethod
+    def from_env(cls, **kwargs: Any) -> Optional["TistoryPublisher"]:
+        token, blog = os.getenv("PUBLISH_TISTORY_TOKEN"), os.getenv("PUBLISH_TISTORY_BLOG")
+        return cls(token, blog, **kwargs) if token and blog else None
+
+    def publish(self, post: Dict[str, Any]) -> str:
+        data = {
+            "access_token": self.token,
+            "output": "json",
+            "blogName": self.blog_name,
+            "title": post["title"],
+            "content": post["html"],
+            "visibility": "3",  # public
+            "tag": ",".join(post.get("tags", [])),
+        }
+        resp = self.request("POST", "/apis/post/write", data=data)
+        body = resp.json().get("tistory", {})
+        if str(body.get("status")) != "200":
+            raise PublishError(f"tistory: {body.get('error_message') or body}")
+        return body.get("url", "")
+
+
+class VelogPublisher(Publisher):
+    """Velog GraphQL ``writePost`` (cookie auth; Velog takes Markdown)."""
+
+    name = "velog"
+    MUTATION = (
+        "mutation WritePost($title: String, $body: String, $tags: [String], $url_slug: String) {"
+        " writePost(title: $title, body: $body, tags: $tags, is_markdown: true, is_temp: false,"
+        " is_private: false, url_slug: $url_slug, thumbnail: null, meta: {}, series_id: null)"
+        " { id url_slug user { username } } }"
+    )
+
+    def __init__(self, cookie: str, base_url: str = "https://v2.velog.io", **kwargs: Any):
+        super().__init__(base_url, **kwargs)
+        self.session.headers["Cookie"] = cookie
+
+    @classmethod
+    def from_env(cls, **kwargs: Any) -> Optional["VelogPublisher"]:
+        cookie = os.getenv("PUBLISH_VELOG_COOKIE")
+        return cls(cookie, **kwargs) if cookie else None
+
+    def publish(self, post: Dict[str, Any]) -> str:
+        variables = {
+            "title": post["title"],
+            "body": post.get("body_md") or post["html"],
+            "tags": list(post.get("tags", []))[:5],
+            "url_slug": post["slug"],
+        }
+        resp = self.request("POST", "/graphql", json={"query": self.MUTATION, "variables": variables})
+        payload = resp.json()
+        if payload.get("errors"):
+            raise PublishError(f"velog: {payload['errors'][0].get('message')}")
+        written = (payload.get("data") or {}).get("writePost") or {}
+        user = (written.get("user") or {}).get("username")
+        return f"https://velog.io/@{user}/{written.get('url_slug')}" if user else str(written.get("id", ""))
+
+
+TARGETS = {
+    "wordpress": WordPressPublisher,
+    "tistory": TistoryPublisher,
+    "velog": VelogPublisher,
+}
+
+
+def configured_publishers(names=None, **kwargs: Any) -> Dict[str, Publisher]:
+    """Instantiate the named targets (default: all) that have credentials in the env."""
+    found = {}
+    for name in names or TARGETS:
+        if name not in TARGETS:
+            raise ValueError(f"unknown publish target {name!r}; use one of {sorted(TARGETS)}")
+        publisher = TARGETS[name].from_env(**kwargs)
+        if publisher is not None:
+            found[name] = publisher
+    return found
+
+
+__all__ = [
+    "WordPressPublisher",
+    "TistoryPublisher",
+    "VelogPublisher",
+    "TARGETS",
+    "configured_publishers",
+]
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""Benchmark full vs. sparse (blobless partial) clones against a local bare repo.
+
+Builds a fixture with ``--sources`` small source files and ``--assets`` random
+binary assets of ``--asset-kb`` each, pushes it to a bare repo with
+``uploadpack.allowFilter`` enabled and clones it over ``file://`` (the transport
+that honours ``--filter``). Bytes transferred are measured as the size of the
+clone's object store, i.e. the packs the server sent.
+
+    python -m scripts.bench_clone --assets 200 --asset-kb 512
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from collectors.clone_cache import git_clone
+from collectors.tree_walk import iter_repo_files
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=bench", "-c", "user.email=bench@example.com", *args],
+        cwd=cwd, check=True, capture_output=True,
+    )
+
+
+def _size(path: Path) -> int:
+    return sum(
+        os.lstat(os.path.join(d, f)).st_size for d, _, files in os.walk(path) for f in files
+    )
+
+
+def build_fixture(root: Path, sources: int, assets: int, asset_kb: int) -> Path:
+    work = root / "work"
+    (work / "src").mkdir(parents=True)
+    (work / "assets").mkdir()
+    (work / "README.md").write_text("# Fixture\n\n- fast\n", encoding="utf-8")
+    (work / "src" / "main.py").write_text("print('hello')\n", encoding="utf-8")
+    (work / "package.json").write_text('{"name": "fixture"}\n', encoding="utf-8")
+    for i in range(sources):
+        pkg = work / "src" / f"pkg{i // 100}"
+        pkg.mkdir(exist_ok=True)
+        (pkg / f"mod{i}.py").write_text(f"VALUE = {i}\n" * 20, encoding="utf-8")
+    for i in range(assets):
+        (work / "assets" / f"blob{i}.bin").write_bytes(os.urandom(asset_kb * 1024))
+    _git(work, "init", "-q")
+    _git(work, "add", "-A")
+    _git(work, "commit", "-qm", "fixture")
+    bare = root / "fixture.git"
+    _git(root, "clone", "-q", "--bare", str(work), str(bare))
+    _git(bare, "config", "uploadpack.allowFilter", "true")
+    return bare
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sources", type=int, default=2000)
+    parser.add_argument("--assets", type=int, default=200)
+    parser.add_argument("--asset-kb", type=int, default=512)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="bench_clone_"))
+    try:
+        url = build_fixture(root, args.sources, args.assets, args.asset_kb).as_uri()
+        print(f"fixture: {args.sources} sources, {args.assets} x {args.asset_kb} KB assets")
+        for mode in ("full", "sparse"):
+            best, objects, checkout, listed = float("inf"), 0, 0, 0
+            for i in range(args.repeat):
+                dest = root / f"{mode}-{i}"
+                t0 = time.perf_counter()
+                git_clone(url, dest, mode)
+                listed = sum(1 for _ in iter_repo_files(dest))
+                best = min(best, time.perf_counter() - t0)
+                objects = _size(dest / ".git" / "objects")
+                checkout = _size(dest) - _size(dest / ".git")
+                shutil.rmtree(dest)
+            print(
+                f"{mode:6}: {best:6.3f}s  transferred {objects / 1024 / 1024:8.2f} MB"
+                f"  checked out {checkout / 1024 / 1024:8.2f} MB  listed {listed} files"
+            )
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""Benchmark Markdown → HTML on multi-MB documents.
+
+Compares the original newline-replacing ``_markdown_to_html`` (which renders
+nothing) with the streaming renderer, reporting MB/s for each.
+
+    python -m scripts.bench_markdown --mb 8
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from writers.blog_writer import generate_blog
+from writers.markdown_renderer import render_markdown
+
+
+def legacy_markdown_to_html(md: str) -> str:
+    """The original ``Pipeline._markdown_to_html``, kept for comparison."""
+    html = md.replace("\n\n", "<br><br>").replace("\n", "<br>")
+    return f"<html><body>{html}</body></html>"
+
+
+def sample_document(target_mb: float) -> str:
+    analysis = {
+        "repo_name": "bench-repo",
+        "description": "**fast** `tooling` for [docs](https://example.com)",
+        "summary": "A *benchmark* summary with `code` and <tags>.",
+        "features": [f"feature {i} with `inline_code` and **bold**" for i in range(10)],
+        "folders": [f"src/pkg_{i}" for i in range(12)],
+        "main_files": ["src/main.py"],
+        "tech_stack": ["python", "docker"],
+    }
+    body = generate_blog(analysis)["body_md"]
+    body += "\n```python\nfor i in range(10):\n    print(i < 5)\n```\n"
+    repeat = max(1, int(target_mb * 1024 * 1024 / len(body.encode("utf-8"))))
+    return body * repeat
+
+
+def _time(fn, doc: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(doc)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mb", type=float, default=8.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    doc = sample_document(args.mb)
+    size_mb = len(doc.encode("utf-8")) / 1024 / 1024
+    print(f"document: {size_mb:.1f} MB, {doc.count(chr(10))} lines")
+    for name, fn in (("legacy replace", legacy_markdown_to_html), ("streaming", render_markdown)):
+        seconds = _time(fn, doc, args.repeat)
+        print(f"{name:15}: {seconds:7.3f}s  {size_mb / seconds:8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
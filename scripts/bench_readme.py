@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""Benchmark README analysis on large READMEs: cost per MB.
+
+Compares the original multi-pass extraction (``splitlines`` for the description,
+a MULTILINE regex over the whole text for bullets) with the block-level
+``parse_readme``, which also builds the section tree and collects install
+commands, badges and license. ``parse_readme`` reads the whole README by
+default; the capped row shows what ``max_sections`` saves (and sets
+``truncated``).
+
+    python -m scripts.bench_readme --mb 4
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import time
+
+from analyzers.readme_parser import parse_readme
+
+SECTION = """## Section {i}
+
+[![CI](https://img.shields.io/badge/ci-passing-green.svg)](https://ci.example.com)
+Some prose about feature {i} with `inline code` and a [link](https://example.com).
+- bullet one for {i}
+- bullet two for {i}
+  - nested bullet
+
+```bash
+$ pip install package-{i}
+npm install package-{i}
+```
+
+"""
+
+
+def legacy_extract(readme: str) -> dict:
+    """The original ``_extract_description`` + ``_extract_features`` + summary slice."""
+    description = ""
+    for line in readme.splitlines():
+        line = line.strip().lstrip("# ")
+        if line:
+            description = line
+            break
+    features = re.findall(r"^-\s+(.+)$", readme, flags=re.MULTILINE)[:10]
+    summary = readme[:500] + ("..." if len(readme) > 500 else "")
+    return {"description": description, "features": features, "summary": summary}
+
+
+def sample_readme(target_mb: float) -> str:
+    parts = ["# Big Project\n\nA generated README.\n\n"]
+    size, i = 0, 0
+    while size < target_mb * 1024 * 1024:
+        chunk = SECTION.format(i=i)
+        parts.append(chunk)
+        size += len(chunk)
+        i += 1
+    parts.append("## License\nMIT\n")
+    return "".join(parts)
+
+
+def _time(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mb", type=float, default=4.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    text = sample_readme(args.mb)
+    size_mb = len(text.encode("utf-8")) / 1024 / 1024
+    print(f"readme: {size_mb:.1f} MB, {text.count(chr(10))} lines")
+    cases = (
+        ("legacy (3 passes)", legacy_extract),
+        ("parse_readme", parse_readme),
+        ("parse_readme capped", lambda t: parse_readme(t, max_sections=200)),
+    )
+    for name, fn in cases:
+        seconds = _time(fn, text, args.repeat)
+        print(f"{name:20}: {seconds:7.3f}s  {seconds / size_mb * 1000:8.1f} ms/MB")
+
+
+if __name__ == "__main__":
+    main()
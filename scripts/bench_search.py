@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""Benchmark the article search index on synthetic posts.
+
+Writes ``--posts`` Markdown articles plus a manifest to a temporary directory,
+times a full index build, an incremental build after editing a few posts, and
+query latency (cold: shards read from disk; warm: shards cached) against the
+old way of finding a post — reading every ``.md`` file and grepping it.
+
+    python -m scripts.bench_search --posts 10000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from writers.manifest import ArticleManifest
+from writers.search_index import INDEX_DIR, SearchIndex, build_search_index
+
+STACKS = ("python", "rust", "go", "typescript", "react", "django", "fastapi", "docker")
+WORDS = (
+    "오픈소스 프로젝트 설치 실행 아키텍처 비동기 런타임 데이터베이스 캐시 인덱스 검색 배포 "
+    "컨테이너 모니터링 로그 파이프라인 워커 큐 스트리밍 인증 권한 테스트 벤치마크 성능 "
+    "async cache index server client plugin schema migration cli api graph queue"
+).split()
+TAIL = 5000
+QUERIES = [
+    ("topic42", {}),
+    ("topic7 비동기", {}),
+    ("오픈소스", {}),
+    ("비동기 런타임", {}),
+    ("cache", {"tech_stack": ["rust"]}),
+    ("데이터베이스 migration", {}),
+    ("", {"tech_stack": ["python", "docker"]}),
+    ("검색 인덱스 성능", {}),
+]
+
+
+def synthetic_posts(root: Path, count: int, seed: int = 7) -> ArticleManifest:
+    rng = random.Random(seed)
+    manifest = ArticleManifest(root / "manifest.json")
+    for i in range(count):
+        title = f"repo{i} — 오픈소스 자동 소개"
+        # a shared vocabulary (matches nearly every post) plus a long tail
+        tail = " ".join(f"topic{rng.randrange(TAIL)}" for _ in range(20))
+        body = "\n\n".join(" ".join(rng.choices(WORDS, k=60)) for _ in range(8)) + "\n\n" + tail
+        entry = manifest.record(
+            title, body, repo=f"github.com/o{i % 500}/repo{i}",
+            tech_stack=rng.sample(STACKS, 2), date=f"2024-{1 + i % 12:02d}-01",
+        )
+        (root / f"{entry['slug']}.md").write_text(body, encoding="utf-8")
+    manifest.save()
+    return manifest
+
+
+def legacy_grep(root: Path, query: str) -> List[str]:
+    words = query.lower().split()
+    return [
+        p.stem for p in root.glob("*.md")
+        if all(w in p.read_text(encoding="utf-8").lower() for w in words)
+    ]
+
+
+def _latencies(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return {"p50": statistics.median(samples), "p95": samples[int(0.95 * (len(samples) - 1))]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the search index")
+    parser.add_argument("--posts", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        manifest = synthetic_posts(root, args.posts)
+        posts = manifest.posts()
+
+        t0 = time.perf_counter()
+        stats = build_search_index(posts, root)
+        full = time.perf_counter() - t0
+        size = sum(p.stat().st_size for p in (root / INDEX_DIR).rglob("*.json"))
+        print(f"full build: {full:.2f}s, {stats['docs']} docs, "
+              f"{stats['shards_written']} shards, {size / 1e6:.1f} MB")
+
+        for entry in posts[:10]:
+            body = f"수정된 본문 {entry['slug']} hotfix"
+            manifest.record(entry["title"], body, tech_stack=entry["tech_stack"])
+            (root / f"{entry['slug']}.md").write_text(body, encoding="utf-8")
+        t0 = time.perf_counter()
+        stats = build_search_index(manifest.posts(), root)
+        print(f"incremental (10 edited): {time.perf_counter() - t0:.2f}s, "
+              f"{stats['indexed']} re-indexed, {stats['shards_written']} shards written")
+
+        index_dir = root / INDEX_DIR
+        for query, filters in QUERIES:
+            cold = _latencies(lambda: SearchIndex(index_dir).search(query, **filters), 3)
+            index = SearchIndex(index_dir)
+            warm = _latencies(lambda: index.search(query, **filters), args.repeat)
+            total = index.search(query, **filters)["total"]
+            print(f"{query or '(facets)':>14} {str(filters):<36} {total:>6} hits  "
+                  f"cold p50 {cold['p50']:7.1f} ms  warm p50 {warm['p50']:6.1f} ms"
+                  f"  p95 {warm['p95']:6.1f} ms")
+        grep = _latencies(lambda: legacy_grep(root, "비동기 런타임"), 3)
+        print(f"legacy grep over .md files: p50 {grep['p50']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""Local load test for ``scripts/serve_local.py``: reports req/s and latency percentiles.
+
+Starts an in-process server on a free port (or targets ``--url``), then runs
+``--clients`` keep-alive connections for ``--seconds``.
+
+    python -m scripts.bench_serve --clients 32 --seconds 5 --cache-mb 64 --gzip
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import threading
+import time
+from pathlib import Path
+from typing import List
+from urllib.parse import urlsplit
+
+from scripts.serve_local import ROOT, make_server
+
+
+def _client(host: str, port: int, path: str, headers: dict, deadline: float,
+            latencies: List[float], errors: List[int]) -> None:
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        try:
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+            resp.read()
+            if resp.status >= 400:
+                errors.append(resp.status)
+        except (OSError, http.client.HTTPException):
+            errors.append(0)
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=10)
+            continue
+        latencies.append(time.perf_counter() - t0)
+    conn.close()
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def run(url: str, clients: int, seconds: float, headers: dict) -> dict:
+    parts = urlsplit(url)
+    deadline = time.perf_counter() + seconds
+    per_thread: List[List[float]] = [[] for _ in range(clients)]
+    errors: List[int] = []
+    threads = [
+        threading.Thread(
+            target=_client,
+            args=(parts.hostname, parts.port or 80, parts.path or "/", headers, deadline,
+                  per_thread[i], errors),
+        )
+        for i in range(clients)
+    ]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    latencies = [x for chunk in per_thread for x in chunk]
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "req_per_s": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Existing server URL (default: start one in-process)")
+    parser.add_argument("--path", default="/index.html")
+    parser.add_argument("--root", type=Path, default=ROOT)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--cache-mb", type=float, default=0)
+    parser.add_argument("--gzip", action="store_true", help="Send Accept-Encoding: br, gzip")
+    parser.add_argument("--revalidate", action="store_true",
+                        help="Send If-None-Match with the current ETag (measures 304s)")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if not url:
+        server = make_server(args.root, port=0, host="127.0.0.1", cache_mb=args.cache_mb, quiet=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}{args.path}"
+    headers = {"Accept-Encoding": "br, gzip"} if args.gzip else {}
+    if args.revalidate:
+        parts = urlsplit(url)
+        conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=10)
+        conn.request("HEAD", parts.path or "/", headers=headers)
+        headers["If-None-Match"] = conn.getresponse().getheader("ETag", "")
+        conn.close()
+    try:
+        stats = run(url, args.clients, args.seconds, headers)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+    print(
+        f"{url} clients={args.clients}: {stats['requests']} requests, {stats['errors']} errors, "
+        f"{stats['req_per_s']:.0f} req/s, p50 {stats['p50_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""Benchmark tech-stack detection over a large synthetic path list.
+
+Compares the original per-path ``dict`` lookup (plus substring README keywords)
+with ``detect_stack``, which extracts every suffix in one regex pass.
+
+    python -m scripts.bench_stack --paths 500000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import List
+
+from collectors.repo_scanner import path_suffix
+from collectors.stack_detect import EXTENSION_LANGUAGES, README_KEYWORDS, detect_stack, suffix_counts
+
+SUFFIXES = (".py", ".ts", ".tsx", ".js", ".json", ".md", ".png", ".go", ".rs", "", ".yml", ".lock")
+
+
+def legacy_guess_tech_stack(paths: List[str], readme: str) -> List[str]:
+    stack = {EXTENSION_LANGUAGES[ext] for ext in map(path_suffix, paths) if ext in EXTENSION_LANGUAGES}
+    lower = readme.lower()
+    stack.update(v for k, v in README_KEYWORDS.items() if k in lower)
+    return sorted(stack)
+
+
+def synthetic_paths(count: int) -> List[str]:
+    return [
+        f"pkg{i % 97}/module{i % 1013}/file_{i}{SUFFIXES[i % len(SUFFIXES)]}" for i in range(count)
+    ]
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = synthetic_paths(args.paths)
+    readme = "A reactive toolkit built with FastAPI and Docker. " * 2000
+    cases = (
+        ("legacy per-path lookup", lambda: legacy_guess_tech_stack(paths, readme)),
+        ("suffix_counts only", lambda: suffix_counts(paths)),
+        ("detect_stack", lambda: detect_stack(paths, readme)),
+    )
+    print(f"{len(paths)} paths")
+    for name, fn in cases:
+        seconds = _best(fn, args.repeat)
+        print(f"{name:24}: {seconds * 1000:8.1f} ms  {seconds / len(paths) * 1e9:6.0f} ns/path")
+
+
+if __name__ == "__main__":
+    main()
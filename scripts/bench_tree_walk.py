@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""Benchmark tree walking on a synthetic monorepo-like tree.
+
+Builds ``--files`` files (default 200k) split between source dirs, a vendored
+``node_modules`` and a ``.git/objects`` store, then times the legacy
+``rglob`` walker against the pruned ``walk_tree``.
+
+    python -m scripts.bench_tree_walk --files 200000
+"""
+from __future__ import annotations
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from collectors.tree_walk import walk_tree
+
+
+def legacy_tree_paths(repo_path: Path) -> List[str]:
+    """The original ``tree_paths`` implementation, kept for comparison."""
+    paths: List[str] = []
+    for p in repo_path.rglob("*"):
+        if p.is_dir():
+            continue
+        rel = p.relative_to(repo_path)
+        if ".git" in rel.parts:
+            continue
+        paths.append(str(rel))
+    return paths
+
+
+def build_tree(root: Path, total: int, per_dir: int = 100) -> dict:
+    layout = {"src": int(total * 0.3), "node_modules": int(total * 0.4)}
+    layout[".git/objects"] = total - sum(layout.values())
+    for base, count in layout.items():
+        for i in range(count):
+            d = root / base / f"d{i // per_dir // per_dir:03d}" / f"d{i // per_dir:05d}"
+            if i % per_dir == 0:
+                d.mkdir(parents=True, exist_ok=True)
+            (d / f"f{i}.js").touch()
+    return layout
+
+
+def _time(fn, repeat: int) -> tuple[float, int]:
+    best, n = float("inf"), 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        n = len(fn())
+        best = min(best, time.perf_counter() - t0)
+    return best, n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="bench_tree_"))
+    try:
+        t0 = time.perf_counter()
+        layout = build_tree(root, args.files)
+        print(f"built {args.files} files in {time.perf_counter() - t0:.1f}s: {layout}")
+        legacy_s, legacy_n = _time(lambda: legacy_tree_paths(root), args.repeat)
+        gitonly_s, gitonly_n = _time(lambda: list(walk_tree(root, ignore_dirs={".git"})), args.repeat)
+        pruned_s, pruned_n = _time(lambda: list(walk_tree(root)), args.repeat)
+        print(f"legacy rglob : {legacy_s:8.3f}s  {legacy_n:>8} paths")
+        print(f"scandir .git : {gitonly_s:8.3f}s  {gitonly_n:>8} paths (same result set as legacy)")
+        print(f"pruned walk  : {pruned_s:8.3f}s  {pruned_n:>8} paths")
+        print(f"speedup      : {legacy_s / pruned_s:8.1f}x")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
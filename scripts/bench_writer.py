@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""Micro-benchmark draft generation over many synthetic analyses.
+
+Compares the original ``+=`` body builder with a ``while`` padding loop against
+the list-join builder with computed padding in ``writers.blog_writer``.
+
+    python -m scripts.bench_writer --count 10000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Dict, List
+
+from writers import blog_writer
+from writers.blog_writer import generate_blog
+
+
+def legacy_ensure_length(text: str, target_len: int) -> str:
+    if len(text) >= target_len:
+        return text
+    filler = "\n\n" + "이 프로젝트를 통한 자동화, 확장성, 유지보수 방법을 깊게 다룹니다. "
+    while len(text) < target_len:
+        text += filler
+    return text[:target_len]
+
+
+def legacy_compose(title: str, subtitle: str, summary: str, sections: List[Dict[str, str]]) -> str:
+    body_md = f"# {title}\n\n{subtitle}\n\n## 개요\n{summary}\n\n"
+    body_md += "## 문제 제기\n오늘날 개발자는 수많은 오픈소스 중 필요한 것을 고르는 데 시간이 많이 듭니다. 자동화된 리포 분석과 정리된 블로그 글은 탐색 비용을 줄여줍니다.\n\n"
+    for sec in sections:
+        body_md += f"### {sec['title']}\n{sec['content']}\n\n"
+    body_md += "## 마무리\n본 소개 글은 로컬 Codex 파이프라인이 자동 생성했습니다. 추가 기능(이미지, 퍼블리싱)을 연결하면 완전 자동 블로그를 운영할 수 있습니다.\n\n"
+    body_md += "## CTA\n- GitHub 리포 방문\n- 별(Star) 추가\n- 이슈/PR로 기여\n- 블로그 구독\n"
+    return body_md
+
+
+def legacy_body(analysis: Dict[str, Any], target_len: int) -> str:
+    sections = blog_writer._build_sections(analysis)
+    body = legacy_compose(
+        analysis["repo_name"], analysis["description"], analysis["summary"], sections
+    )
+    return legacy_ensure_length(body, target_len)
+
+
+def new_body(analysis: Dict[str, Any], target_len: int) -> str:
+    sections = blog_writer._apply_section_policy(
+        blog_writer._build_sections(analysis), blog_writer.DEFAULT_LENGTH_POLICY["sections"]
+    )
+    body = blog_writer._compose_body(
+        analysis["repo_name"], analysis["description"], analysis["summary"], sections
+    )
+    return blog_writer._ensure_length(body, target_len)
+
+
+def full_draft(analysis: Dict[str, Any], target_len: int) -> str:
+    return generate_blog(analysis, length_policy={"total_min": target_len})["body_md"]
+
+
+def synthetic(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "repo_name": f"repo-{i}",
+            "description": f"Synthetic project {i}",
+            "summary": "A generated summary. " * 10,
+            "features": [f"feature {j}" for j in range(i % 8)],
+            "tech_stack": ["Python", "Docker"][: 1 + i % 2],
+            "folders": [f"pkg{j}/" for j in range(i % 12)],
+            "main_files": ["main.py"],
+        }
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10_000)
+    args = parser.parse_args()
+
+    analyses = synthetic(args.count)
+    for target in (5200, 50_000):
+        for name, fn in (
+            ("legacy", legacy_body), ("builder", new_body), ("generate", full_draft)
+        ):
+            t0 = time.perf_counter()
+            for analysis in analyses:
+                fn(analysis, target)
+            seconds = time.perf_counter() - t0
+            print(f"target={target:6} {name:9}: {seconds:6.2f}s"
+                  f"  {seconds / args.count * 1e6:7.1f} us/draft")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,56 +1,208 @@
 #!/usr/bin/env python
+"""Build the static article index from ``articles/final/manifest.json``.
+
+Pages are paginated (``index.html``, ``page-2.html``, ...) and every tech-stack
+tag gets its own paginated listing under ``tags/``. A page is only rewritten when
+its content hash differs from the last build (recorded in ``.index-state.json``);
+pages that no longer exist are removed.
+
+    python -m scripts.gen_index [--page-size 48] [--backfill]
+
+``--backfill`` imports HTML posts written before the manifest existed. The
+search index under ``search/`` (``writers.search_index``) is brought up to date
+in the same run unless ``--no-search`` is given.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+from datetime import datetime, timezone
 from pathlib import Path
-from datetime import datetime
+from typing import Any, Dict, List
+
+from writers.manifest import MANIFEST_NAME, ArticleManifest
+from writers.search_index import build_search_index
 
 ARTICLES_DIR = Path(__file__).resolve().parent.parent / "articles" / "final"
+STATE_NAME = ".index-state.json"
+DEFAULT_PAGE_SIZE = 48
+
+STYLE = """    body { font-family: 'Inter', system-ui, -apple-system, sans-serif; margin: 0; padding: 32px; background:#f7f8fa; }
+    h1 { margin: 0 0 12px 0; }
+    .meta { color:#666; margin-bottom:24px; }
+    .grid { display:grid; grid-template-columns: repeat(auto-fit, minmax(240px,1fr)); gap:16px; }
+    .card { display:block; padding:16px; background:#fff; border-radius:10px; box-shadow:0 4px 12px rgba(0,0,0,0.06); color:#111; text-decoration:none; transition: transform .15s ease, box-shadow .15s ease; }
+    .card:hover { transform: translateY(-3px); box-shadow:0 10px 20px rgba(0,0,0,0.08); }
+    .card-title { font-weight:600; line-height:1.4; }
+    .card-meta { color:#777; font-size:13px; margin-top:8px; }
+    .tags a { color:#3366cc; text-decoration:none; margin-right:6px; font-size:13px; }
+    .pager { margin-top:24px; display:flex; gap:12px; }"""
 
 
-def collect_posts():
-    posts = []
-    for html in sorted(ARTICLES_DIR.glob("*.html")):
-        if html.name == "index.html":
+def tag_slug(tag: str) -> str:
+    tag = tag.lower().replace("+", "p").replace("#", "sharp")
+    return re.sub(r"[^a-z0-9]+", "-", tag).strip("-") or "tag"
+
+
+def page_name(prefix: str, number: int) -> str:
+    """``index.html`` for the first page, ``page-N.html`` after it (``prefix`` for tags)."""
+    if not prefix:
+        return "index.html" if number == 1 else f"page-{number}.html"
+    return f"{prefix}.html" if number == 1 else f"{prefix}-{number}.html"
+
+
+def backfill(manifest: ArticleManifest, articles_dir: Path) -> int:
+    """Add manifest entries for HTML posts that predate the manifest."""
+    added = 0
+    known = {p["href"] for p in manifest.posts()}
+    for path in sorted(articles_dir.glob("*.html")):
+        if path.name == "index.html" or path.name in known or re.match(r"page-\d+\.html$", path.name):
             continue
-        title = html.stem.replace('_—_', ' — ').replace('_', ' ')
-        posts.append({"title": title, "href": html.name})
-    return posts
+        title = path.stem.replace("_—_", " — ").replace("_", " ")
+        md = path.with_suffix(".md")
+        body = md.read_text(encoding="utf-8") if md.exists() else path.read_text(encoding="utf-8")
+        date = datetime.fromtimestamp(path.stat().st_mtime, timezone.utc).date().isoformat()
+        manifest.record(title, body, date=date)  # the title round-trips to path.stem
+        added += 1
+    return added
 
 
-def render(posts):
-    cards = "\n".join(
-        f"<a class='card' href='{p['href']}'><div class='card-title'>{p['title']}</div></a>"
-        for p in posts
+def _card(post: Dict, root: str) -> str:
+    tags = " ".join(
+        f"<a href='{root}tags/{tag_slug(t)}.html'>#{html.escape(t)}</a>" for t in post.get("tech_stack", [])
+    )
+    meta = html.escape(post.get("date") or "")
+    return (
+        f"<div class='card'><a href='{root}{html.escape(post['href'])}' class='card-title'>"
+        f"{html.escape(post['title'])}</a>"
+        f"<div class='card-meta'>{meta}</div><div class='tags'>{tags}</div></div>"
     )
+
+
+def render(posts: List[Dict], heading: str, total: int, number: int, pages: int,
+           prefix: str = "", root: str = "") -> str:
+    """One listing page. No timestamps, so identical input renders identical bytes."""
+    cards = "\n    ".join(_card(p, root) for p in posts)
+    pager = []
+    if number > 1:
+        pager.append(f"<a href='{page_name(prefix, number - 1)}'>← 이전</a>")
+    if number < pages:
+        pager.append(f"<a href='{page_name(prefix, number + 1)}'>다음 →</a>")
+    home = f" · <a href='{root}index.html'>전체 글</a>" if root else ""
     return f"""<!doctype html>
 <html lang='ko'>
 <head>
   <meta charset='UTF-8'>
   <meta name='viewport' content='width=device-width, initial-scale=1'>
-  <title>Auto GitHub Blogger — Articles</title>
+  <title>{html.escape(heading)}</title>
   <style>
-    body {{ font-family: 'Inter', system-ui, -apple-system, sans-serif; margin: 0; padding: 32px; background:#f7f8fa; }}
-    h1 {{ margin: 0 0 12px 0; }}
-    .meta {{ color:#666; margin-bottom:24px; }}
-    .grid {{ display:grid; grid-template-columns: repeat(auto-fit, minmax(240px,1fr)); gap:16px; }}
-    .card {{ display:block; padding:16px; background:#fff; border-radius:10px; box-shadow:0 4px 12px rgba(0,0,0,0.06); color:#111; text-decoration:none; transition: transform .15s ease, box-shadow .15s ease; }}
-    .card:hover {{ transform: translateY(-3px); box-shadow:0 10px 20px rgba(0,0,0,0.08); }}
-    .card-title {{ font-weight:600; line-height:1.4; }}
+{STYLE}
   </style>
 </head>
 <body>
-  <h1>Auto GitHub Blogger</h1>
-  <div class='meta'>총 {len(posts)}편 · 생성 {datetime.utcnow().strftime('%Y-%m-%d %H:%M')} UTC</div>
+  <h1>{html.escape(heading)}</h1>
+  <div class='meta'>총 {total}편 · {number}/{pages} 페이지{home}</div>
   <div class='grid'>
     {cards}
   </div>
+  <div class='pager'>{' '.join(pager)}</div>
 </body>
-</html>"""
+</html>
+"""
+
+
+def build_pages(posts: List[Dict], page_size: int = DEFAULT_PAGE_SIZE) -> Dict[str, str]:
+    """Map of relative path → HTML for the main listing and every tag listing."""
+    page_size = max(1, page_size)
+    pages: Dict[str, str] = {}
+
+    def listing(items: List[Dict], heading: str, prefix: str = "", subdir: str = "") -> None:
+        count = max(1, -(-len(items) // page_size))
+        root = "../" if subdir else ""
+        for n in range(1, count + 1):
+            chunk = items[(n - 1) * page_size:n * page_size]
+            path = subdir + page_name(prefix, n)
+            pages[path] = render(chunk, heading, len(items), n, count, prefix, root)
+
+    listing(posts, "Auto GitHub Blogger")
+    by_tag: Dict[str, List[Dict]] = {}
+    labels: Dict[str, str] = {}
+    for post in posts:
+        for tag in post.get("tech_stack", []):
+            by_tag.setdefault(tag_slug(tag), []).append(post)
+            labels.setdefault(tag_slug(tag), tag)
+    for slug in sorted(by_tag):
+        listing(by_tag[slug], f"#{labels[slug]} — Auto GitHub Blogger", slug, "tags/")
+    return pages
+
+
+def write_pages(pages: Dict[str, str], out_dir: Path) -> Dict[str, int]:
+    """Write changed pages, delete pages dropped since the last build."""
+    state_path = out_dir / STATE_NAME
+    try:
+        previous: Dict[str, str] = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        previous = {}
+    hashes = {}
+    written = skipped = 0
+    for rel, text in pages.items():
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        hashes[rel] = digest
+        target = out_dir / rel
+        if previous.get(rel) == digest and target.exists():
+            skipped += 1
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(text, encoding="utf-8")
+        written += 1
+    removed = 0
+    for rel in set(previous) - set(hashes):
+        try:
+            (out_dir / rel).unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+    tmp = state_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(hashes, sort_keys=True, indent=1), encoding="utf-8")
+    os.replace(tmp, state_path)
+    return {"written": written, "skipped": skipped, "removed": removed}
+
+
+def generate(articles_dir: Path = ARTICLES_DIR, page_size: int = DEFAULT_PAGE_SIZE,
+             backfill_legacy: bool = False, search: bool = True) -> Dict[str, Any]:
+    manifest = ArticleManifest(articles_dir / MANIFEST_NAME)
+    added = backfill(manifest, articles_dir) if backfill_legacy else 0
+    manifest.save()
+    posts = manifest.posts()
+    stats = write_pages(build_pages(posts, page_size), articles_dir)
+    result: Dict[str, Any] = {"posts": len(posts), "backfilled": added, **stats}
+    if search:
+        result["search"] = build_search_index(posts, articles_dir)
+    return result
 
 
 def main():
-    posts = collect_posts()
-    html = render(posts)
-    (ARTICLES_DIR / "index.html").write_text(html, encoding="utf-8")
-    print(f"index generated with {len(posts)} posts")
+    parser = argparse.ArgumentParser(description="Build paginated index and tag pages from the manifest")
+    parser.add_argument("--dir", type=Path, default=ARTICLES_DIR, help="Articles directory")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--backfill", action="store_true", help="Import HTML posts missing from the manifest")
+    parser.add_argument("--no-search", action="store_true", help="Skip the search index build")
+    args = parser.parse_args()
+    stats = generate(args.dir, args.page_size, args.backfill, search=not args.no_search)
+    print(
+        f"index generated with {stats['posts']} posts: {stats['written']} pages written, "
+        f"{stats['skipped']} unchanged, {stats['removed']} removed"
+    )
+    if "search" in stats:
+        search = stats["search"]
+        print(
+            f"search index: {search['docs']} docs, {search['indexed']} re-indexed, "
+            f"{search['removed']} removed, {search['shards_written']} shards written"
+        )
 
 
 if __name__ == "__main__":
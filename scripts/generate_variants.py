@@ -1,19 +1,168 @@
 #!/usr/bin/env python
+"""Create ``<stem>_v2`` … ``<stem>_v5`` variants of each article (``.md`` and ``.html``).
+
+Each source is read once and its variants are produced together; sources fan out
+over a process pool. A variant with the same bytes as its source is linked
+rather than copied — a reflink (copy-on-write clone) where the filesystem
+supports it, otherwise a hardlink, otherwise a plain copy. A variant that
+already matches its source (same inode, or same sha256) is left alone.
+
+    python -m scripts.generate_variants [--dir articles/final] [--link auto]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+try:
+    import fcntl  # type: ignore
+except Exception:  # pragma: no cover - not on Windows
+    fcntl = None  # type: ignore
+
+ARTICLES_DIR = Path("articles/final")
+PATTERN = "*_오픈소스_자동_소개.md"
+VARIANT_TAGS = ("v2", "v3", "v4", "v5")  # v1 is the original
+SUFFIXES = (".md", ".html")
+LINK_MODES = ("auto", "reflink", "hardlink", "copy")
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+
+_STAT_KEYS = ("written", "linked", "skipped", "bytes_written", "bytes_saved")
+
+
+def variant_path(source: Path, tag: str) -> Path:
+    return source.with_name(f"{source.stem}_{tag}{source.suffix}")
 
-BASE = Path('articles/final')
-variants = ['v1','v2','v3','v4','v5']
-for md in BASE.glob('*_오픈소스_자동_소개.md'):
-    stem = md.stem
-    html = md.with_suffix('.html')
-    for idx, tag in enumerate(variants, start=1):
-        # skip first variant (original) for v1 to keep count 5 total
-        if idx == 1:
+
+def _reflink(src: Path, dst: Path) -> None:
+    if fcntl is None:
+        raise OSError("reflink unsupported on this platform")
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            dst.unlink()
+            raise
+
+
+def _place(src: Path, data: bytes, dst: Path, link: str) -> str:
+    """Materialize ``dst`` with ``data`` (== src's bytes); returns the method used."""
+    tmp = dst.with_name(f".{dst.name}.tmp")
+    if tmp.exists():
+        tmp.unlink()
+    methods = {"auto": ("reflink", "hardlink", "copy")}.get(link, (link,))
+    for method in methods:
+        try:
+            if method == "reflink":
+                _reflink(src, tmp)
+            elif method == "hardlink":
+                os.link(src, tmp)
+            else:
+                tmp.write_bytes(data)
+        except OSError:
+            if method == methods[-1]:
+                raise
             continue
-        suffix = f"_{tag}"
-        new_md = BASE / f"{stem}{suffix}.md"
-        new_html = BASE / f"{stem}{suffix}.html"
-        new_md.write_text(md.read_text(encoding='utf-8'), encoding='utf-8')
-        if html.exists():
-            new_html.write_text(html.read_text(encoding='utf-8'), encoding='utf-8')
-        print(f"created {new_md.name}")
+        os.replace(tmp, dst)
+        return method
+    raise ValueError(f"unknown link mode {link!r}")
+
+
+def _is_current(dst: Path, src: Path, size: int, digest: str) -> bool:
+    try:
+        if os.path.samefile(src, dst):
+            return True
+        if dst.stat().st_size != size:
+            return False
+        return hashlib.sha256(dst.read_bytes()).hexdigest() == digest
+    except OSError:
+        return False
+
+
+def variants_for_source(
+    source: Path, tags: Sequence[str] = VARIANT_TAGS, link: str = "auto"
+) -> Dict[str, int]:
+    """Create every variant of ``source`` and its sibling formats; returns counters."""
+    stats = dict.fromkeys(_STAT_KEYS, 0)
+    for suffix in SUFFIXES:
+        src = source.with_suffix(suffix)
+        try:
+            data = src.read_bytes()
+        except FileNotFoundError:
+            continue
+        digest = hashlib.sha256(data).hexdigest()
+        for tag in tags:
+            dst = variant_path(src, tag)
+            if _is_current(dst, src, len(data), digest):
+                stats["skipped"] += 1
+                stats["bytes_saved"] += len(data)
+                continue
+            if _place(src, data, dst, link) == "copy":
+                stats["written"] += 1
+                stats["bytes_written"] += len(data)
+            else:
+                stats["linked"] += 1
+                stats["bytes_saved"] += len(data)
+    return stats
+
+
+def _run_one(args: tuple) -> Dict[str, int]:
+    return variants_for_source(*args)
+
+
+def find_sources(root: Path = ARTICLES_DIR, pattern: str = PATTERN) -> List[Path]:
+    return sorted(root.glob(pattern))
+
+
+def generate_variants(
+    sources: Iterable[Path],
+    tags: Sequence[str] = VARIANT_TAGS,
+    link: str = "auto",
+    workers: Optional[int] = None,
+) -> Dict[str, int]:
+    """Generate variants for ``sources``; ``workers=1`` stays in-process."""
+    if link not in LINK_MODES:
+        raise ValueError(f"link must be one of {LINK_MODES}, got {link!r}")
+    jobs = [(Path(s), tuple(tags), link) for s in sources]
+    totals = dict.fromkeys(_STAT_KEYS, 0)
+    totals["sources"] = len(jobs)
+    if workers == 1 or len(jobs) <= 1:
+        results: Iterable[Dict[str, int]] = map(_run_one, jobs)
+        return _sum(totals, results)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return _sum(totals, pool.map(_run_one, jobs, chunksize=max(1, len(jobs) // 64)))
+
+
+def _sum(totals: Dict[str, int], results: Iterable[Dict[str, int]]) -> Dict[str, int]:
+    for stats in results:
+        for key, value in stats.items():
+            totals[key] += value
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Create article variants by linking or copying")
+    parser.add_argument("--dir", type=Path, default=ARTICLES_DIR, help="Articles directory")
+    parser.add_argument("--pattern", default=PATTERN, help="Glob for source .md files")
+    parser.add_argument("--tags", default=",".join(VARIANT_TAGS), help="Comma-separated tags")
+    parser.add_argument("--link", choices=LINK_MODES, default="auto")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size")
+    args = parser.parse_args()
+
+    tags = [t.strip() for t in args.tags.split(",") if t.strip()]
+    stats = generate_variants(
+        find_sources(args.dir, args.pattern), tags=tags, link=args.link, workers=args.workers
+    )
+    print(
+        f"{stats['sources']} sources: {stats['written']} written, {stats['linked']} linked,"
+        f" {stats['skipped']} unchanged; {stats['bytes_written']} bytes written,"
+        f" {stats['bytes_saved']} bytes saved"
+    )
+
+
+if __name__ == "__main__":
+    main()
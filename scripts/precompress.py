@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""Write ``.gz`` (and ``.br`` when ``brotli`` is installed) siblings for text assets.
+
+``scripts/serve_local.py`` serves them to clients that accept the encoding. A
+sibling is regenerated only when it is older than its source, and dropped when
+compression does not make the file smaller.
+
+    python -m scripts.precompress [--root articles/final]
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import os
+from pathlib import Path
+from typing import Dict
+
+try:
+    import brotli  # type: ignore
+except Exception:  # pragma: no cover
+    brotli = None  # type: ignore
+
+from scripts.serve_local import ROOT
+
+COMPRESSIBLE = {".html", ".css", ".js", ".json", ".svg", ".txt", ".md", ".xml"}
+MIN_SIZE = 256  # below this the headers outweigh the savings
+
+
+def _encoders():
+    yield ".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield ".br", lambda data: brotli.compress(data, quality=11)
+
+
+def precompress(root: Path = ROOT, min_size: int = MIN_SIZE) -> Dict[str, int]:
+    stats = {"written": 0, "fresh": 0, "skipped": 0, "bytes_in": 0, "bytes_out": 0}
+    encoders = list(_encoders())
+    for dirpath, _, names in os.walk(root):
+        for name in names:
+            source = Path(dirpath) / name
+            if source.suffix not in COMPRESSIBLE:
+                continue
+            st = source.stat()
+            if st.st_size < min_size:
+                stats["skipped"] += 1
+                continue
+            data = None
+            for suffix, encode in encoders:
+                sibling = source.with_name(name + suffix)
+                try:
+                    if sibling.stat().st_mtime_ns >= st.st_mtime_ns:
+                        stats["fresh"] += 1
+                        continue
+                except FileNotFoundError:
+                    pass
+                data = source.read_bytes() if data is None else data
+                packed = encode(data)
+                if len(packed) >= len(data):
+                    sibling.unlink(missing_ok=True)
+                    stats["skipped"] += 1
+                    continue
+                tmp = sibling.with_name(sibling.name + ".tmp")
+                tmp.write_bytes(packed)
+                os.replace(tmp, sibling)
+                stats["written"] += 1
+                stats["bytes_in"] += len(data)
+                stats["bytes_out"] += len(packed)
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=ROOT)
+    parser.add_argument("--min-size", type=int, default=MIN_SIZE)
+    args = parser.parse_args()
+    stats = precompress(args.root, args.min_size)
+    if brotli is None:
+        print("brotli not installed; wrote .gz only")
+    print(
+        f"{stats['written']} written, {stats['fresh']} up to date, {stats['skipped']} skipped "
+        f"({stats['bytes_in']} → {stats['bytes_out']} bytes)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""Publish articles to every configured target (WordPress / Tistory / Velog).
+
+Targets are configured via env (``PUBLISH_WORDPRESS_URL``/``_KEY``,
+``PUBLISH_TISTORY_TOKEN``/``_BLOG``, ``PUBLISH_VELOG_COOKIE``); unconfigured ones
+are skipped. Already-published posts (same content hash) are skipped via the
+ledger in ``.cache/publish_ledger.json``.
+
+    python -m scripts.publish --source manifest --targets wordpress,velog --rate 0.5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+from database.client import SupabaseClient
+from publishers.ledger import PublishLedger
+from publishers.runner import publish_posts
+from publishers.sources import posts_from_manifest, posts_from_supabase
+from publishers.targets import TARGETS, configured_publishers
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Publish articles to blog platforms")
+    parser.add_argument("--source", choices=("manifest", "supabase"), default="manifest")
+    parser.add_argument("--articles-dir", type=Path, default=Path("articles/final"))
+    parser.add_argument("--targets", default=",".join(TARGETS), help="Comma-separated target names")
+    parser.add_argument("--rate", type=float, default=1.0, help="Requests per second per target")
+    parser.add_argument("--concurrency", type=int, default=2, help="In-flight posts per target")
+    parser.add_argument("--ledger", type=Path, default=Path(".cache") / "publish_ledger.json")
+    parser.add_argument("--dry-run", action="store_true", help="List what would be published")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.targets.split(",") if n.strip()]
+    publishers = configured_publishers(names, rate_per_s=args.rate, concurrency=args.concurrency)
+    for name in names:
+        if name not in publishers:
+            print(f"[publish] {name} not configured; skipped")
+    if args.source == "manifest":
+        posts = posts_from_manifest(args.articles_dir)
+    else:
+        posts = posts_from_supabase(
+            SupabaseClient(os.getenv("SUPABASE_URL", ""), os.getenv("SUPABASE_KEY", ""))
+        )
+    try:
+        report = publish_posts(posts, publishers, PublishLedger(args.ledger), dry_run=args.dry_run)
+    finally:
+        for publisher in publishers.values():
+            publisher.close()
+    print(json.dumps(report["summary"], ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,14 @@
 #!/usr/bin/env python
-"""Dedicated Tistory publisher stub."""
+"""Dedicated Tistory publisher (see ``publishers.targets.TistoryPublisher``)."""
 from __future__ import annotations
 
-import os
-import sys
-try:
-    import requests  # type: ignore
-except Exception:  # pragma: no cover
-    requests = None  # type: ignore
+from typing import Optional
 
+from scripts.publish_wordpress import publish_tistory
 
-def publish(title: str, html: str) -> None:
-    token = os.getenv("PUBLISH_TISTORY_TOKEN")
-    if not token or not requests:
-        print("[publish] Tistory not configured or requests missing")
-        return
-    # TODO: implement real endpoint call
-    print(f"[publish] would send '{title}' to Tistory")
+
+def publish(title: str, html: str) -> Optional[str]:
+    return publish_tistory(title, html)
 
 
 if __name__ == "__main__":
@@ -1,49 +1,50 @@
 #!/usr/bin/env python
-"""Publisher skeleton for WordPress/Tistory/Velog."""
+"""Single-post publish helpers for WordPress/Tistory/Velog.
+
+Thin wrappers over ``publishers.targets``; batch publishing (concurrent, rate
+limited, idempotent) lives in ``scripts/publish.py``.
+"""
 from __future__ import annotations
 
-import os
-import json
 from typing import Optional
 
-try:
-    import requests  # type: ignore
-except Exception:  # pragma: no cover
-    requests = None  # type: ignore
+from publishers.base import PublishError
+from publishers.targets import TistoryPublisher, VelogPublisher, WordPressPublisher
+from writers.manifest import article_slug, content_hash
 
 
-def publish_wordpress(title: str, html: str) -> Optional[str]:
-    url = os.getenv("PUBLISH_WORDPRESS_URL")
-    key = os.getenv("PUBLISH_WORDPRESS_KEY")
-    if not url or not key or not requests:
-        print("[publish] WordPress not configured or requests missing; skipped")
+def _publish_one(cls, title: str, html: str) -> Optional[str]:
+    try:
+        publisher = cls.from_env()
+    except PublishError as e:  # requests missing
+        print(f"[publish] {cls.name} skipped: {e}")
         return None
-    payload = {"title": title, "content": html, "status": "publish"}
-    headers = {"Authorization": f"Bearer {key}"}
-    resp = requests.post(f"{url}/wp-json/wp/v2/posts", json=payload, headers=headers, timeout=10)
-    if resp.ok:
-        link = resp.json().get("link")
-        print(f"[publish] WordPress published: {link}")
+    if publisher is None:
+        print(f"[publish] {cls.name} not configured; skipped")
+        return None
+    post = {"slug": article_slug(title), "title": title, "html": html, "body_md": "",
+            "tags": [], "content_hash": content_hash(html)}
+    try:
+        link = publisher.publish(post)
+        print(f"[publish] {cls.name} published: {link}")
         return link
-    print("[publish] WordPress failed:", resp.text)
-    return None
+    except PublishError as e:
+        print(f"[publish] {cls.name} failed: {e}")
+        return None
+    finally:
+        publisher.close()
+
+
+def publish_wordpress(title: str, html: str) -> Optional[str]:
+    return _publish_one(WordPressPublisher, title, html)
 
 
-def publish_tistory(title: str, html: str) -> None:
-    token = os.getenv("PUBLISH_TISTORY_TOKEN")
-    if not token or not requests:
-        print("[publish] Tistory not configured; skipped")
-        return
-    # Placeholder: add actual Tistory API endpoint parameters
-    print("[publish] Tistory stub invoked")
+def publish_tistory(title: str, html: str) -> Optional[str]:
+    return _publish_one(TistoryPublisher, title, html)
 
 
-def publish_velog(title: str, html: str) -> None:
-    cookie = os.getenv("PUBLISH_VELOG_COOKIE")
-    if not cookie or not requests:
-        print("[publish] Velog not configured; skipped")
-        return
-    print("[publish] Velog stub invoked")
+def publish_velog(title: str, html: str) -> Optional[str]:
+    return _publish_one(VelogPublisher, title, html)
 
 
 def main() -> None:
@@ -2,22 +2,68 @@
 """CLI to run GitHub → blog pipeline."""
 from __future__ import annotations
 import argparse
+import json
+import logging
 import os
 from pathlib import Path
 from pipeline.orchestrator import Pipeline
 from database.client import SupabaseClient
 
 
+def _read_urls(path: str) -> list[str]:
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+
+
+def _execute(args: argparse.Namespace, pipeline: Pipeline) -> None:
+    if args.urls_file:
+        report = pipeline.run_many(
+            _read_urls(args.urls_file), max_workers=args.max_workers, force=args.force
+        )
+        print(json.dumps(report["summary"], ensure_ascii=False, indent=2))
+        return
+    result = pipeline.run(args.url, force=args.force)
+    if result["skipped"]:
+        print("Unchanged since last run; nothing regenerated (use --force to override).")
+        return
+    print("Draft title:", result["draft"].get("title"))
+    print("Prompts queued:", result["prompt_count"], f"({result['renders_avoided']} reused)")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Generate blog draft from GitHub repo")
-    parser.add_argument("--url", required=True, help="GitHub repository URL")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--url", help="GitHub repository URL")
+    source.add_argument("--urls-file", help="File with one repository URL per line (# comments ok)")
+    parser.add_argument("--max-workers", type=int, default=8, help="Concurrent collectors in batch mode")
+    parser.add_argument(
+        "--clone-mode", choices=("full", "sparse"), default="full",
+        help="sparse: blobless partial clone, checking out only README/entry/manifest files",
+    )
+    parser.add_argument(
+        "--prompt-budget", type=int, default=None,
+        help="Most new image renders queued per post (most distinctive sections first)",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Re-run every stage even if inputs are unchanged"
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Write one cProfile .pstats per repo to .cache/profiles/<repo_slug>.pstats",
+    )
     args = parser.parse_args()
 
+    # per-run stage metrics are logged as one JSON object per line
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     supabase = SupabaseClient(os.getenv("SUPABASE_URL", ""), os.getenv("SUPABASE_KEY", ""))
-    pipeline = Pipeline(supabase, workdir=Path(".cache"))
-    result = pipeline.run(args.url)
-    print("Draft title:", result["draft"].get("title"))
-    print("Prompts queued:", len(result["prompts"]))
+    profile_dir = Path(".cache") / "profiles" if args.profile else None
+    pipeline = Pipeline(
+        supabase, workdir=Path(".cache"), clone_mode=args.clone_mode,
+        prompt_budget=args.prompt_budget, profile_dir=profile_dir,
+    )
+    _execute(args, pipeline)
+    if profile_dir is not None:
+        print(f"Profiles written to {profile_dir} (inspect with: python -m pstats <file>)")
 
 
 if __name__ == "__main__":
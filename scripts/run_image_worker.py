@@ -1,11 +1,55 @@
 #!/usr/bin/env python
-"""Stub Midjourney worker trigger.
-In the real system, Aivesto's Discord worker would poll Supabase and render images."""
+"""Midjourney image worker.
+Claims waiting rows from Supabase image_prompts in leased batches and renders them
+through a pluggable renderer backend (``fake`` or ``module:Class``)."""
 from __future__ import annotations
 
+import argparse
+import asyncio
+import json
+import os
+from pathlib import Path
+
+from database.client import SupabaseClient
+from prompts.prompt_cache import PromptCache
+from workers.image_worker import ImageWorker
+from workers.renderers import load_renderer
+
 
 def main() -> None:
-    print("Run existing Aivesto Midjourney worker against Supabase image_prompts table.")
+    parser = argparse.ArgumentParser(description="Render queued image prompts")
+    parser.add_argument("--renderer", default="fake", help="fake or package.module:RendererClass")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--lease-seconds", type=float, default=300)
+    parser.add_argument("--max-poll", type=float, default=30.0, help="Longest idle poll interval")
+    parser.add_argument("--max-batches", type=int, default=None)
+    parser.add_argument("--once", action="store_true", help="Exit as soon as the queue is empty")
+    parser.add_argument(
+        "--prompt-cache", type=Path, default=Path(".cache") / "prompt_cache.sqlite",
+        help="Rendered-prompt cache shared with the pipeline",
+    )
+    parser.add_argument("--no-prompt-cache", action="store_true", help="Render every prompt")
+    args = parser.parse_args()
+
+    supabase = SupabaseClient(os.getenv("SUPABASE_URL", ""), os.getenv("SUPABASE_KEY", ""))
+    if not supabase.connected:
+        print("Supabase not configured; set SUPABASE_URL/SUPABASE_KEY to run the image worker.")
+        return
+    worker = ImageWorker(
+        supabase,
+        load_renderer(args.renderer),
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        lease_seconds=args.lease_seconds,
+        max_poll=args.max_poll,
+        cache=None if args.no_prompt_cache else PromptCache(args.prompt_cache),
+    )
+    try:
+        summary = asyncio.run(worker.run(max_batches=args.max_batches, stop_when_idle=args.once))
+    except KeyboardInterrupt:
+        summary = worker.metrics.summary()
+    print(json.dumps(summary, indent=2))
 
 
 if __name__ == "__main__":
@@ -1,19 +1,212 @@
 #!/usr/bin/env python
-import http.server
-import socketserver
-from pathlib import Path
+"""Threaded static server for ``articles/final``.
+
+- every request path is resolved and confined to ``ROOT`` (no ``..`` escapes)
+- ``ETag`` / ``Last-Modified`` with ``304 Not Modified`` on revalidation
+- precompressed ``.br`` / ``.gz`` siblings (see ``scripts/precompress.py``) are
+  served when the client accepts them and they are not older than the source
+- optional in-memory LRU for hot files (``--cache-mb``)
 
+    python -m scripts.serve_local [--port 8000] [--cache-mb 64]
+"""
+from __future__ import annotations
+
+import argparse
+import mimetypes
 import os
+import shutil
+import socket
+import threading
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
 PORT = int(os.getenv("PORT", 8000))
 ROOT = Path(__file__).resolve().parent.parent / "articles" / "final"
 
-class Handler(http.server.SimpleHTTPRequestHandler):
-    def translate_path(self, path):
-        # Serve files from ROOT regardless of cwd
-        rel = path.lstrip('/') or 'index.html'
-        return str((ROOT / rel).resolve())
+# (Accept-Encoding token, sibling suffix), in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
 
-if __name__ == "__main__":
-    with socketserver.TCPServer(('', PORT), Handler) as httpd:
-        print(f"Serving {ROOT} at http://localhost:{PORT}")
+
+class FileCache:
+    """Thread-safe LRU of file bodies, keyed by path + mtime + size."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_entry_bytes: int = 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.hits = self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, int, int], bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, path: Path, st: os.stat_result) -> Optional[bytes]:
+        key = (str(path), st.st_mtime_ns, st.st_size)
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return body
+            self.misses += 1
+        if st.st_size > self.max_entry_bytes:
+            return None
+        body = path.read_bytes()
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = body
+                self._size += len(body)
+                while self._size > self.max_bytes and self._entries:
+                    _, old = self._entries.popitem(last=False)
+                    self._size -= len(old)
+        return body
+
+
+def _accepts(header: str) -> set:
+    accepted = set()
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if token:
+            accepted.add(token.strip().lower())
+    return accepted
+
+
+class Handler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive; every response carries Content-Length
+    root: Path = ROOT
+    cache: Optional[FileCache] = None
+
+    def setup(self) -> None:
+        super().setup()
+        # headers and body go out in separate writes; without this, Nagle plus the
+        # client's delayed ACK adds ~40 ms to every keep-alive response
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def translate_path(self, path: str) -> str:
+        """Map a URL path into ``root``; returns "" when it escapes ``root``."""
+        rel = unquote(urlsplit(path).path).replace("\\", "/").lstrip("/")
+        root = self.root.resolve()
+        target = (root / rel).resolve()
+        if target != root and not target.is_relative_to(root):
+            return ""
+        if target.is_dir():
+            target = target / "index.html"
+        return str(target)
+
+    def do_GET(self) -> None:
+        self._serve(send_body=True)
+
+    def do_HEAD(self) -> None:
+        self._serve(send_body=False)
+
+    def _serve(self, send_body: bool) -> None:
+        path = self.translate_path(self.path)
+        if not path:
+            self.send_error(HTTPStatus.FORBIDDEN)
+            return
+        source = Path(path)
+        try:
+            src_stat = source.stat()
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        if not source.is_file():
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        file, st, encoding = source, src_stat, None
+        accepted = _accepts(self.headers.get("Accept-Encoding", ""))
+        for token, suffix in ENCODINGS:
+            if token not in accepted:
+                continue
+            sibling = source.with_name(source.name + suffix)
+            try:
+                sib_stat = sibling.stat()
+            except OSError:
+                continue
+            if sib_stat.st_mtime_ns >= src_stat.st_mtime_ns:
+                file, st, encoding = sibling, sib_stat, token
+                break
+
+        etag = f'"{src_stat.st_mtime_ns:x}-{src_stat.st_size:x}{"-" + encoding if encoding else ""}"'
+        if self._not_modified(etag, src_stat.st_mtime):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._common_headers(etag, src_stat.st_mtime)
+            self.end_headers()
+            return
+
+        body = self.cache.get(file, st) if self.cache else None
+        self.send_response(HTTPStatus.OK)
+        ctype = mimetypes.guess_type(source.name)[0] or "application/octet-stream"
+        if ctype.startswith("text/") or ctype in ("application/json", "application/javascript"):
+            ctype += "; charset=utf-8"
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(st.st_size if body is None else len(body)))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self._common_headers(etag, src_stat.st_mtime)
+        self.end_headers()
+        if not send_body:
+            return
+        if body is not None:
+            self.wfile.write(body)
+            return
+        with open(file, "rb") as f:
+            shutil.copyfileobj(f, self.wfile)
+
+    def _common_headers(self, etag: str, mtime: float) -> None:
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", formatdate(mtime, usegmt=True))
+        self.send_header("Cache-Control", "no-cache")  # always revalidate, cheap with 304s
+        self.send_header("Vary", "Accept-Encoding")
+
+    def _not_modified(self, etag: str, mtime: float) -> bool:
+        inm = self.headers.get("If-None-Match")
+        if inm is not None:  # takes precedence over If-Modified-Since (RFC 9110)
+            tags = {t.strip() for t in inm.split(",")}
+            return "*" in tags or etag in tags or f"W/{etag}" in tags
+        ims = self.headers.get("If-Modified-Since")
+        if ims:
+            try:
+                return int(mtime) <= parsedate_to_datetime(ims).timestamp()
+            except (TypeError, ValueError, OverflowError):
+                return False
+        return False
+
+    def log_message(self, format: str, *args) -> None:
+        if not getattr(self.server, "quiet", False):
+            super().log_message(format, *args)
+
+
+def make_server(
+    root: Path = ROOT, port: int = PORT, host: str = "", cache_mb: float = 0, quiet: bool = False
+) -> ThreadingHTTPServer:
+    """Build (but do not start) a server for ``root``; ``port=0`` picks a free port."""
+    cache = FileCache(int(cache_mb * 1024 * 1024)) if cache_mb > 0 else None
+    handler = type("RootHandler", (Handler,), {"root": Path(root), "cache": cache})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.quiet = quiet
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve articles/final locally")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--bind", default="", help="Address to bind (default: all interfaces)")
+    parser.add_argument("--root", type=Path, default=ROOT)
+    parser.add_argument("--cache-mb", type=float, default=0, help="In-memory LRU size; 0 disables")
+    parser.add_argument("--quiet", action="store_true", help="Disable per-request logging")
+    args = parser.parse_args()
+    with make_server(args.root, args.port, args.bind, args.cache_mb, args.quiet) as httpd:
+        print(f"Serving {args.root} at http://localhost:{httpd.server_address[1]}")
         httpd.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
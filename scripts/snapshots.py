@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+"""Inspect the pipeline's snapshot store (``.cache/snapshots.sqlite``).
+
+    python -m scripts.snapshots list [--repo URL]
+    python -m scripts.snapshots diff --repo URL [--old SHA --new SHA]
+    python -m scripts.snapshots gc [--keep 3]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from pipeline.snapshot_store import SnapshotStore
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="List, diff and garbage-collect repo snapshots")
+    parser.add_argument("command", choices=("list", "diff", "gc"))
+    parser.add_argument("--db", type=Path, default=Path(".cache") / "snapshots.sqlite")
+    parser.add_argument("--repo", help="Repository URL")
+    parser.add_argument("--old", help="Older commit SHA (diff)")
+    parser.add_argument("--new", help="Newer commit SHA (diff)")
+    parser.add_argument("--keep", type=int, default=3, help="Versions kept per repo (gc)")
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.db, keep=0)
+    try:
+        if args.command == "list":
+            for v in store.list(args.repo):
+                print(f"{v['repo']}  {(v['commit_sha'] or '-')[:12]:12}  files={v['file_count']}  id={v['id']}")
+        elif args.command == "diff":
+            if not args.repo:
+                parser.error("diff needs --repo")
+            print(json.dumps(store.diff(args.repo, args.old, args.new), ensure_ascii=False, indent=2))
+        else:
+            print(f"removed {store.gc(keep=args.keep, repo=args.repo)} old snapshots")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
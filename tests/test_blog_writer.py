@@ -0,0 +1,50 @@
+from writers import blog_writer
+from writers.blog_writer import _ensure_length, generate_blog
+
+ANALYSIS = {
+    "repo_name": "demo",
+    "description": "Demo tool",
+    "summary": "A demo repository.",
+    "features": ["fast", "small"],
+    "tech_stack": ["Python"],
+    "structure": ["src/", "tests/"],
+    "main_files": ["main.py"],
+}
+
+
+def _legacy_ensure_length(text, target_len):
+    if len(text) >= target_len:
+        return text
+    filler = "\n\n" + "이 프로젝트를 통한 자동화, 확장성, 유지보수 방법을 깊게 다룹니다. "
+    while len(text) < target_len:
+        text += filler
+    return text[:target_len]
+
+
+def test_computed_padding_matches_loop():
+    for text in ("", "x", "# t\n" * 300):
+        for target in (0, 1, 37, 38, 5200):
+            assert _ensure_length(text, target) == _legacy_ensure_length(text, target)
+
+
+def test_default_policy_keeps_legacy_body():
+    body = generate_blog(dict(ANALYSIS))["body_md"]
+    legacy_head = blog_writer._compose_body(
+        "demo — 오픈소스 자동 소개", "Demo tool", "A demo repository.",
+        blog_writer._build_sections(dict(ANALYSIS)),
+    )
+    assert body.startswith(_legacy_ensure_length(legacy_head, 5200))
+    assert body.endswith("_\n") and len(body.split("_Generated")[0]) == 5200
+
+
+def test_per_section_and_total_limits():
+    policy = {
+        "total_min": 0,
+        "total_max": 1500,
+        "sections": {"핵심 기능": {"min": 400}, "default": {"max": 40}},
+    }
+    draft = generate_blog(dict(ANALYSIS, features=["feature " * 20] * 3), length_policy=policy)
+    by_title = {s["title"]: s["content"] for s in draft["sections"]}
+    assert len(by_title["핵심 기능"]) >= 400
+    assert all(len(c) <= 40 for t, c in by_title.items() if t != "핵심 기능")
+    assert len(draft["body_md"].split("_Generated")[0]) <= 1500
@@ -0,0 +1,106 @@
+import subprocess
+
+from collectors.clone_cache import CloneCache, normalize_repo_url
+from collectors.github_collector import collect_repo
+
+
+def _git(cwd, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+        cwd=cwd, check=True, capture_output=True,
+    )
+
+
+def _make_remote(path, text="hello"):
+    path.mkdir()
+    _git(path, "init", "-q")
+    (path / "README.md").write_text(text, encoding="utf-8")
+    _git(path, "add", "-A")
+    _git(path, "commit", "-qm", "init")
+    return path
+
+
+def test_normalize_repo_url():
+    assert normalize_repo_url("git@github.com:Owner/Repo.git") == "https://github.com/owner/repo"
+    assert normalize_repo_url("https://GitHub.com/Owner/Repo/") == "https://github.com/owner/repo"
+
+
+def test_cache_hit_miss_and_refresh(tmp_path):
+    remote = _make_remote(tmp_path / "remote")
+    cache = CloneCache(tmp_path / "clones")
+
+    path, info = cache.checkout(str(remote))
+    assert info["cache"] == "miss"
+    assert (path / "README.md").read_text() == "hello"
+
+    assert cache.checkout(str(remote))[1]["cache"] == "hit"
+
+    (remote / "README.md").write_text("changed", encoding="utf-8")
+    _git(remote, "commit", "-qam", "update")
+    path, info = cache.checkout(str(remote))
+    assert info["cache"] == "refresh"
+    assert (path / "README.md").read_text() == "changed"
+
+    # index survives a restart
+    assert CloneCache(tmp_path / "clones").checkout(str(remote))[1]["cache"] == "hit"
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    remotes = [_make_remote(tmp_path / f"r{i}") for i in range(3)]
+    cache = CloneCache(tmp_path / "clones", max_entries=2)
+    for r in remotes:
+        with cache.pinned(str(r)):
+            pass
+    keys = set(cache.entries())
+    assert keys == {CloneCache.key_for(str(r)) for r in remotes[1:]}
+    assert not (tmp_path / "clones" / CloneCache.key_for(str(remotes[0]))).exists()
+
+
+def test_pinned_checkouts_survive_eviction_until_released(tmp_path):
+    remotes = [_make_remote(tmp_path / f"r{i}") for i in range(2)]
+    cache = CloneCache(tmp_path / "clones", max_entries=1)
+    old, old_info = cache.checkout(str(remotes[0]))
+    with cache.pinned(str(remotes[1])) as (_, new_info):
+        # over budget, but the older checkout is still being read elsewhere
+        assert (old / "README.md").exists() and len(cache.entries()) == 2
+        cache.release(old_info["key"])
+        assert not old.exists()
+    assert set(cache.entries()) == {new_info["key"]}
+
+
+def test_collect_repo_reports_cache_status(tmp_path, monkeypatch):
+    monkeypatch.setattr("collectors.github_collector.fetch_contributors", lambda *a: [])
+    monkeypatch.setattr("collectors.github_collector.fetch_repo_metadata", lambda *a: {})
+    remote = _make_remote(tmp_path / "remote", text="# demo\n- feature")
+    cache = CloneCache(tmp_path / "clones")
+    first = collect_repo(str(remote), tmp_path / "work", cache=cache)
+    second = collect_repo(str(remote), tmp_path / "work", cache=cache)
+    assert (first["clone_cache"], second["clone_cache"]) == ("miss", "hit")
+    assert first["commit_sha"] and first["commit_sha"] == second["commit_sha"]
+    assert first["readme_text"].startswith("# demo")
+
+
+def test_sparse_mode_lists_whole_tree_but_checks_out_only_candidates(tmp_path, monkeypatch):
+    monkeypatch.setattr("collectors.github_collector.fetch_contributors", lambda *a: [])
+    monkeypatch.setattr("collectors.github_collector.fetch_repo_metadata", lambda *a: {})
+    remote = _make_remote(tmp_path / "remote", text="# demo")
+    (remote / "src").mkdir()
+    (remote / "src" / "main.py").write_text("print('hi')\n", encoding="utf-8")
+    (remote / "assets").mkdir()
+    (remote / "assets" / "big.bin").write_bytes(b"\0" * 4096)
+    _git(remote, "add", "-A")
+    _git(remote, "commit", "-qm", "more")
+    _git(tmp_path, "clone", "-q", "--bare", str(remote), "bare.git")
+    _git(tmp_path / "bare.git", "config", "uploadpack.allowFilter", "true")
+    url = (tmp_path / "bare.git").as_uri()
+
+    cache = CloneCache(tmp_path / "clones", mode="sparse")
+    snap = collect_repo(url, tmp_path / "work", cache=cache)
+    path = tmp_path / "clones" / CloneCache.key_for(url)
+    assert not (path / "assets" / "big.bin").exists()
+    assert sorted(snap["file_list"]) == ["README.md", "assets/big.bin", "src/main.py"]
+    assert snap["readme_text"] == "# demo" and snap["main_file_excerpts"][0]["path"] == "src/main.py"
+
+    # switching modes re-clones instead of reusing the sparse checkout
+    _, info = CloneCache(tmp_path / "clones").checkout(url)
+    assert info["cache"] == "refresh" and (path / "assets" / "big.bin").exists()
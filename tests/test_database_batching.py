@@ -0,0 +1,57 @@
+import pipeline.orchestrator as orchestrator
+from database.memory import InMemorySupabaseClient
+from database.write_buffer import WriteBuffer
+from pipeline.orchestrator import Pipeline
+
+
+def test_insert_many_chunks_and_retries():
+    db = InMemorySupabaseClient()
+    db.fail_next = 1
+    statuses = db.insert_many("image_prompts", [{"n": i} for i in range(5)], chunk_size=2, backoff=0)
+    assert [s["status"] for s in statuses] == ["ok"] * 5
+    assert db.round_trips == 4  # 3 chunks + 1 retry
+    assert [r["n"] for r in db.rows("image_prompts")] == [0, 1, 2, 3, 4]
+
+
+def test_insert_many_isolates_bad_rows():
+    db = InMemorySupabaseClient(reject=lambda row: row.get("bad"))
+    rows = [{"n": 0}, {"n": 1, "bad": True}, {"n": 2}, {"n": 3}]
+    statuses = db.insert_many("t", rows, retries=0, backoff=0)
+    assert [s["status"] for s in statuses] == ["ok", "error", "ok", "ok"]
+
+
+def test_write_buffer_flushes_by_size_and_time():
+    now = [0.0]
+    db = InMemorySupabaseClient()
+    buf = WriteBuffer(db, max_rows=3, max_delay=5, clock=lambda: now[0])
+    buf.extend("t", [{"n": 1}, {"n": 2}], key="a")
+    assert db.round_trips == 0
+    buf.add("t", {"n": 3}, key="b")
+    assert db.round_trips == 1 and buf.pending() == 0
+    buf.add("t", {"n": 4})
+    now[0] = 6
+    buf.add("u", {"n": 5})
+    assert db.round_trips == 2  # "t" aged out; "u" is still fresh
+    with buf:
+        pass
+    assert db.round_trips == 3 and buf.pending() == 0
+
+
+def _snapshot(url, dest, **kwargs):
+    return {"repo_name": url.rsplit("/", 1)[-1], "readme_text": "# x\n- a", "file_list": ["main.py"]}
+
+
+def test_pipeline_batches_round_trips(monkeypatch, tmp_path):
+    monkeypatch.setattr(orchestrator, "collect_repo", _snapshot)
+    monkeypatch.setattr(Pipeline, "_write_local_outputs", lambda *args, **kwargs: None)
+    db = InMemorySupabaseClient()
+    pipeline = Pipeline(db, workdir=tmp_path)
+
+    pipeline.run("https://github.com/o/single")
+    assert db.round_trips == 2  # one draft insert + one array insert of all prompts
+
+    report = pipeline.run_many([f"https://github.com/o/r{i}" for i in range(5)], max_workers=2)
+    assert report["summary"]["db_round_trips"] == 2
+    assert len(db.rows("blog_drafts")) == 6
+    assert all(r["result"]["stages"]["persist"] == "run" for r in report["results"])
+    assert (tmp_path / "repos" / "o__r0" / "state.json").exists()
@@ -0,0 +1,46 @@
+import pipeline.orchestrator as orchestrator
+from database.memory import InMemorySupabaseClient
+from pipeline.orchestrator import Pipeline
+
+
+def _snapshot(url, dest, **kwargs):
+    return {"repo_name": "demo", "readme_text": "# demo\n- a\n- b", "file_list": ["main.py"]}
+
+
+def test_forced_rerun_does_not_duplicate_rows(monkeypatch, tmp_path):
+    monkeypatch.setattr(orchestrator, "collect_repo", _snapshot)
+    monkeypatch.setattr(Pipeline, "_write_local_outputs", lambda *args, **kwargs: None)
+    db = InMemorySupabaseClient()
+    pipeline = Pipeline(db, workdir=tmp_path)
+    url = "https://github.com/Example/Demo"
+
+    pipeline.run(url)
+    prompts = db.rows("image_prompts")
+    db.tables["image_prompts"][0]["status"] = "done"  # rendered meanwhile
+
+    pipeline.run(url, force=True)
+    pipeline.run_many([url, "https://github.com/example/demo.git"], force=True)
+    assert len(db.rows("blog_drafts")) == 1
+    assert db.rows("blog_drafts")[0]["repo"] == "https://github.com/example/demo"
+    assert db.rows("image_prompts") == [dict(prompts[0], status="done"), *prompts[1:]]
+
+
+def test_upsert_collapses_duplicate_keys_in_one_call():
+    db = InMemorySupabaseClient()
+    statuses = db.upsert_many("blog_drafts", [{"repo": "a", "v": 1}, {"repo": "a", "v": 2}])
+    assert len(statuses) == 2 and db.round_trips == 1
+    assert [(r["repo"], r["v"]) for r in db.rows("blog_drafts")] == [("a", 2)]
+
+
+def test_waiting_prompts_are_paginated_and_projected():
+    db = InMemorySupabaseClient()
+    db.insert_many("image_prompts", [{"section": str(i), "prompt": "p", "extra": "x" * 100}
+                                     for i in range(5)])
+    db.tables["image_prompts"][1]["status"] = "done"
+    db.round_trips = 0
+
+    page = db.fetch_waiting_prompts(limit=2)
+    assert [r["section"] for r in page] == ["0", "2"]
+    assert "extra" not in page[0]
+    assert [r["section"] for r in db.iter_waiting_prompts(page_size=2)] == ["0", "2", "3", "4"]
+    assert db.round_trips == 1 + 3  # two full pages and an empty one
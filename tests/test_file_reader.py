@@ -0,0 +1,45 @@
+import codecs
+
+from collectors.file_reader import find_readme, read_bounded, sample_files
+from collectors.github_collector import read_readme
+
+
+def test_find_readme_is_case_insensitive_and_falls_back_to_docs(tmp_path):
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "README.md").write_text("# docs", encoding="utf-8")
+    assert find_readme(tmp_path) == tmp_path / "docs" / "README.md"
+
+    (tmp_path / "Readme.RST").write_text("Title\n=====", encoding="utf-8")
+    assert find_readme(tmp_path) == tmp_path / "Readme.RST"
+    (tmp_path / "readme.Md").write_text("# md wins", encoding="utf-8")
+    assert read_readme(tmp_path) == "# md wins"
+
+
+def test_read_is_capped_and_cut_characters_are_dropped(tmp_path):
+    path = tmp_path / "README.md"
+    path.write_text("가" * 1000, encoding="utf-8")  # 3 bytes per character
+    read = read_bounded(path, max_bytes=100)
+    assert read["bytes_read"] == 100 and read["truncated"]
+    assert read["text"] == "가" * 33 and read["encoding"] == "utf-8"
+
+
+def test_encoding_detection(tmp_path):
+    cases = {
+        "bom.md": (codecs.BOM_UTF8 + "héllo".encode("utf-8"), "utf-8-sig", "héllo"),
+        "kr.md": ("한국어 문서".encode("cp949"), "cp949", "한국어 문서"),
+        "latin.md": (b"caf\xe9 \xff", "latin-1", "café ÿ"),
+    }
+    for name, (data, encoding, text) in cases.items():
+        (tmp_path / name).write_bytes(data)
+        read = read_bounded(tmp_path / name)
+        assert (read["encoding"], read["text"]) == (encoding, text), name
+
+
+def test_sample_files_skips_binary_and_oversized(tmp_path):
+    (tmp_path / "main.py").write_text("print('hi')\n" * 200, encoding="utf-8")
+    (tmp_path / "app.bin").write_bytes(b"\x7fELF\0\0\0")
+    (tmp_path / "bundle.js").write_text("x" * 5000, encoding="utf-8")
+    samples = sample_files(tmp_path, ["app.bin", "bundle.js", "main.py", "missing.py"],
+                           max_bytes=64, skip_over=4096)
+    assert [s["path"] for s in samples] == ["main.py"]
+    assert samples[0]["truncated"] and len(samples[0]["excerpt"]) == 64
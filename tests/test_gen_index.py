@@ -0,0 +1,65 @@
+from scripts.gen_index import generate
+from writers.manifest import ArticleManifest
+
+
+def _seed(path, n):
+    manifest = ArticleManifest(path / "manifest.json")
+    for i in range(n):
+        stack = ["python"] if i % 2 else ["go", "c++"]
+        manifest.record(f"post {i:02d}", f"body {i}", repo=f"https://github.com/o/r{i}",
+                        tech_stack=stack, date=f"2024-01-{i + 1:02d}")
+    manifest.save()
+    return manifest
+
+
+def test_paginates_and_emits_tag_pages(tmp_path):
+    _seed(tmp_path, 5)
+    stats = generate(tmp_path, page_size=2)
+    assert stats["posts"] == 5
+    names = sorted(str(p.relative_to(tmp_path)) for p in tmp_path.rglob("*.html"))
+    assert names == ["index.html", "page-2.html", "page-3.html",
+                     "tags/cpp-2.html", "tags/cpp.html", "tags/go-2.html", "tags/go.html",
+                     "tags/python.html"]
+    first = (tmp_path / "index.html").read_text(encoding="utf-8")
+    assert "post 04" in first and "post 00" not in first  # newest first
+    assert "page-2.html" in first
+    assert "../post_01.html" in (tmp_path / "tags/python.html").read_text(encoding="utf-8")
+
+
+def test_unchanged_pages_are_not_rewritten_and_stale_pages_removed(tmp_path):
+    manifest = _seed(tmp_path, 3)
+    generate(tmp_path, page_size=2)
+    assert generate(tmp_path, page_size=2)["written"] == 0
+
+    manifest.record("post 05", "new", tech_stack=["rust"], date="2024-02-01")
+    manifest.save()
+    stats = generate(tmp_path, page_size=10)
+    assert stats["removed"] == 1 and not (tmp_path / "page-2.html").exists()
+    assert (tmp_path / "tags/rust.html").exists()
+
+
+def test_record_keeps_date_for_identical_body(tmp_path):
+    manifest = ArticleManifest(tmp_path / "manifest.json")
+    manifest.record("a b", "same", date="2024-01-01")
+    assert manifest.save()
+    again = ArticleManifest(tmp_path / "manifest.json")
+    entry = again.record("a b", "same", date="2030-01-01")
+    assert entry["date"] == "2024-01-01" and entry["href"] == "a_b.html"
+    assert not again.save()
+
+
+def test_backfill_imports_legacy_html(tmp_path):
+    (tmp_path / "flask_—_소개.html").write_text("<p>x</p>", encoding="utf-8")
+    stats = generate(tmp_path, backfill_legacy=True)
+    assert stats["backfilled"] == 1
+    assert ArticleManifest(tmp_path / "manifest.json").posts()[0]["title"] == "flask — 소개"
+
+
+def test_generation_date_trailer_is_not_an_edit(tmp_path):
+    manifest = ArticleManifest(tmp_path / "manifest.json")
+    body = "# t\n\nsame content\n\n_Generated locally on {}_\n"
+    first = manifest.record("a b", body.format("2024-01-01"), date="2024-01-01")
+    again = manifest.record("a b", body.format("2024-03-09"), date="2024-03-09")
+    assert again["content_hash"] == first["content_hash"] and again["date"] == "2024-01-01"
+    edited = manifest.record("a b", body.format("2024-03-09").replace("same", "new"), date="2024-03-09")
+    assert edited["date"] == "2024-03-09"
@@ -0,0 +1,34 @@
+import os
+
+from scripts.generate_variants import find_sources, generate_variants, variant_path
+
+
+def _article(root, name, body):
+    (root / f"{name}.md").write_text(body, encoding="utf-8")
+    (root / f"{name}.html").write_text(f"<p>{body}</p>", encoding="utf-8")
+    return root / f"{name}.md"
+
+
+def test_hardlinks_variants_and_skips_unchanged(tmp_path):
+    src = _article(tmp_path, "demo_—_오픈소스_자동_소개", "hello")
+    _article(tmp_path, "other_note", "not a source")
+    assert find_sources(tmp_path) == [src]
+
+    first = generate_variants([src], tags=("v2", "v3"), link="hardlink", workers=1)
+    assert (first["linked"], first["written"], first["skipped"]) == (4, 0, 0)
+    v2 = variant_path(src, "v2")
+    assert v2.read_text(encoding="utf-8") == "hello"
+    assert os.stat(v2).st_ino == os.stat(src).st_ino
+
+    second = generate_variants(find_sources(tmp_path), tags=("v2", "v3"), link="hardlink")
+    assert second["skipped"] == 4 and second["bytes_saved"] == 2 * (5 + len("<p>hello</p>"))
+    assert not (tmp_path / "demo_—_오픈소스_자동_소개_v2_v2.md").exists()
+
+
+def test_copy_mode_rewrites_only_stale_variants(tmp_path):
+    src = _article(tmp_path, "demo_—_오픈소스_자동_소개", "one")
+    generate_variants([src], tags=("v2",), link="copy", workers=1)
+    src.write_text("two", encoding="utf-8")
+    stats = generate_variants([src], tags=("v2",), link="copy", workers=1)
+    assert (stats["written"], stats["skipped"], stats["bytes_written"]) == (1, 1, 3)
+    assert variant_path(src, "v2").read_text(encoding="utf-8") == "two"
@@ -0,0 +1,94 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from collectors.github_api import GitHubClient, parse_link_header
+
+
+class _StubGitHub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    pages = {1: [{"login": "alice"}, {"login": "bob"}], 2: [{"login": "carol"}]}
+    log: list = []
+    throttle_once = False
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, payload=None, headers=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        type(self).log.append((self.path, self.headers.get("If-None-Match")))
+        if type(self).throttle_once:
+            type(self).throttle_once = False
+            reset = str(int(time.time()) + 1)
+            return self._send(403, {"message": "rate limited"},
+                              {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset})
+        if self.path.startswith("/repos/o/r/contributors"):
+            page = 2 if "page=2" in self.path else 1
+            etag = f'"c{page}"'
+            if self.headers.get("If-None-Match") == etag:
+                return self._send(304)
+            headers = {"ETag": etag, "X-RateLimit-Remaining": "4999"}
+            if page == 1:
+                base = f"http://{self.headers['Host']}"
+                headers["Link"] = f'<{base}/repos/o/r/contributors?per_page=100&page=2>; rel="next"'
+            return self._send(200, self.pages[page], headers)
+        if self.path == "/repos/o/r":
+            return self._send(200, {"description": "demo", "stargazers_count": 7,
+                                    "topics": ["cli"], "license": {"spdx_id": "MIT"}})
+        return self._send(404, {"message": "Not Found"})
+
+
+@pytest.fixture
+def stub_server():
+    _StubGitHub.log = []
+    _StubGitHub.throttle_once = False
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubGitHub)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_paginates_and_revalidates_from_disk_cache(stub_server, tmp_path):
+    client = GitHubClient(cache_dir=tmp_path, base_url=stub_server)
+    assert client.contributors("o", "r") == ["alice", "bob", "carol"]
+    assert [etag for _path, etag in _StubGitHub.log] == [None, None]
+
+    fresh = GitHubClient(cache_dir=tmp_path, base_url=stub_server)
+    assert fresh.contributors("o", "r") == ["alice", "bob", "carol"]
+    assert [etag for _path, etag in _StubGitHub.log[2:]] == ['"c1"', '"c2"']
+    assert fresh.stats["not_modified"] == 2
+
+
+def test_repo_metadata_and_missing_repo(stub_server):
+    client = GitHubClient(base_url=stub_server)
+    meta = client.repo_metadata("o", "r")
+    assert (meta["description"], meta["stars"], meta["topics"], meta["license"]) == (
+        "demo", 7, ["cli"], "MIT")
+    assert client.repo_metadata("o", "missing") == {}
+
+
+def test_rate_limit_backoff_then_success(stub_server):
+    sleeps = []
+    _StubGitHub.throttle_once = True
+    client = GitHubClient(base_url=stub_server, sleep=sleeps.append)
+    assert client.repo_metadata("o", "r")["stars"] == 7
+    assert len(sleeps) == 1 and sleeps[0] <= 2
+    assert client.stats["rate_limited"] == 1
+
+
+def test_parse_link_header():
+    value = '<https://x/?page=2>; rel="next", <https://x/?page=5>; rel="last"'
+    assert parse_link_header(value) == {"next": "https://x/?page=2", "last": "https://x/?page=5"}
@@ -0,0 +1,126 @@
+import asyncio
+from datetime import timedelta
+
+from database.client import utc_now
+from database.memory import InMemorySupabaseClient
+from workers.image_worker import ImageWorker
+from workers.renderers import FakeRenderer, Renderer
+
+
+def _queue(n):
+    db = InMemorySupabaseClient()
+    db.insert_many("image_prompts", [{"section": f"s{i}", "prompt": f"p{i}"} for i in range(n)])
+    return db
+
+
+def test_two_workers_never_render_the_same_prompt():
+    db = _queue(20)
+    a, b = FakeRenderer(delay=0.001), FakeRenderer(delay=0.001)
+    workers = [ImageWorker(db, a, worker_id="a", batch_size=3, concurrency=2),
+               ImageWorker(db, b, worker_id="b", batch_size=3, concurrency=2)]
+
+    async def main():
+        return await asyncio.gather(*(w.run(stop_when_idle=True) for w in workers))
+
+    summaries = asyncio.run(main())
+    assert sorted(a.rendered + b.rendered) == list(range(1, 21))
+    assert not set(a.rendered) & set(b.rendered)
+    assert sum(s["rendered"] for s in summaries) == 20
+    rows = db.rows("image_prompts")
+    assert {r["status"] for r in rows} == {"done"}
+    assert all(r["image_url"].startswith("fake://") for r in rows)
+
+
+def test_failures_retry_then_fail_and_expired_leases_requeue():
+    db = _queue(2)
+    renderer = FakeRenderer(fail=lambda row: row["section"] == "s1")
+    worker = ImageWorker(db, renderer, worker_id="w", max_attempts=2)
+    summary = asyncio.run(worker.run(stop_when_idle=True))
+    assert (summary["rendered"], summary["retried"], summary["failed"]) == (1, 1, 1)
+    statuses = {r["section"]: (r["status"], r.get("attempts")) for r in db.rows("image_prompts")}
+    assert statuses == {"s0": ("done", None), "s1": ("failed", 2)}
+
+    db.insert_many("image_prompts", [{"section": "s2", "prompt": "p2"}])
+    assert len(db.claim_prompts("crashed", limit=5, lease_seconds=60)) == 1
+    assert db.requeue_expired() == {"requeued": 0, "failed": 0}
+    assert db.requeue_expired(now=utc_now() + timedelta(seconds=61))["requeued"] == 1
+    assert db.rows("image_prompts")[-1]["status"] == "waiting"
+    assert db.rows("image_prompts")[-1]["attempts"] == 1
+
+
+class HangingRenderer(Renderer):
+    async def render(self, prompt):
+        await asyncio.Event().wait()  # never returns, like a wedged backend
+
+
+def test_prompt_that_hangs_the_worker_fails_after_max_attempts():
+    db = _queue(1)
+
+    async def crash(worker):
+        task = asyncio.create_task(worker.run_once())
+        await asyncio.sleep(0.01)
+        task.cancel()  # the worker process dies mid-render
+
+    for _ in range(3):
+        worker = ImageWorker(db, HangingRenderer(), lease_seconds=0, max_attempts=3)
+        asyncio.run(crash(worker))
+    summary = asyncio.run(
+        ImageWorker(db, HangingRenderer(), max_attempts=3).run(stop_when_idle=True)
+    )
+    row = db.rows("image_prompts")[0]
+    assert (row["status"], row["attempts"], row["error"]) == ("failed", 3, "lease expired")
+    assert (summary["failed"], summary["claimed"]) == (1, 0)
+
+
+def test_idle_polls_back_off():
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    worker = ImageWorker(_queue(0), FakeRenderer(), min_poll=1, max_poll=5, sleep=fake_sleep)
+
+    async def main():
+        task = asyncio.create_task(worker.run())
+        while len(sleeps) < 5:
+            await asyncio.sleep(0)
+        task.cancel()
+
+    asyncio.run(main())
+    assert sleeps[:5] == [1, 2, 4, 5, 5]
+
+
+class FlakyClient(InMemorySupabaseClient):
+    """Raises once from each of the named methods, like a network blip."""
+
+    def __init__(self, *fail_once):
+        super().__init__()
+        self.fail_once = set(fail_once)
+
+    def _blip(self, name):
+        if name in self.fail_once:
+            self.fail_once.discard(name)
+            raise ConnectionError("network blip")
+
+    def claim_prompts(self, *args, **kwargs):
+        self._blip("claim_prompts")
+        return super().claim_prompts(*args, **kwargs)
+
+    def finish_prompt(self, *args, **kwargs):
+        self._blip("finish_prompt")
+        return super().finish_prompt(*args, **kwargs)
+
+
+def test_worker_survives_transient_database_errors():
+    db = FlakyClient("claim_prompts", "finish_prompt")
+    db.insert_many("image_prompts", [{"section": f"s{i}", "prompt": f"p{i}"} for i in range(3)])
+    sleeps = []
+
+    async def sleep(seconds):
+        sleeps.append(seconds)
+
+    worker = ImageWorker(db, FakeRenderer(), worker_id="w", sleep=sleep)
+    summary = asyncio.run(worker.run(stop_when_idle=True))
+    assert (summary["db_errors"], summary["write_errors"], summary["rendered"]) == (1, 1, 3)
+    assert {r["status"] for r in db.rows("image_prompts")} == {"done"}
+    assert sleeps == [1.0, 1.0]
@@ -0,0 +1,41 @@
+from writers.markdown_renderer import render_document, render_markdown
+
+
+def test_renders_blog_subset():
+    md = (
+        "# Title <x>\n\nIntro with `a<b>` and **bold** and *em*.\n"
+        "Second line [docs](https://example.com/?a=1&b=2)\n\n"
+        "## List\n- one\n- two_words here\n1. first\n2. second\n\n"
+        "```python\nif a < b:\n    print('**no**')\n```\n"
+        "> quoted\n---\n_Generated locally on 2026-01-01_\n"
+    )
+    assert render_markdown(md) == (
+        "<h1>Title &lt;x&gt;</h1>\n"
+        "<p>Intro with <code>a&lt;b&gt;</code> and <strong>bold</strong> and <em>em</em>.<br>\n"
+        'Second line <a href="https://example.com/?a=1&amp;b=2">docs</a></p>\n'
+        "<h2>List</h2>\n<ul>\n<li>one</li>\n<li>two_words here</li>\n</ul>\n"
+        "<ol>\n<li>first</li>\n<li>second</li>\n</ol>\n"
+        '<pre><code class="language-python">if a &lt; b:\n    print(&#x27;**no**&#x27;)\n</code></pre>\n'
+        "<blockquote>quoted</blockquote>\n<hr>\n"
+        "<p><em>Generated locally on 2026-01-01</em></p>\n"
+    )
+
+
+def test_unsafe_links_and_unclosed_fence():
+    out = render_markdown('[x](javascript:alert(1)) <script>\n```\nraw')
+    assert "href" not in out and "<script>" not in out
+    assert out.endswith("raw\n</code></pre>\n")
+
+
+def test_emphasis_never_rewrites_link_urls():
+    out = render_markdown("[*x*](https://a.com/*star*) and [wiki](https://w.org/Foo_(bar)) *y*")
+    assert out == (
+        '<p><a href="https://a.com/*star*"><em>x</em></a> and '
+        '<a href="https://w.org/Foo_(bar)">wiki</a> <em>y</em></p>\n'
+    )
+
+
+def test_document_wrapper_declares_charset():
+    doc = render_document("# 안녕", title="a & b")
+    assert '<meta charset="UTF-8">' in doc and "<title>a &amp; b</title>" in doc
+    assert "<h1>안녕</h1>" in doc
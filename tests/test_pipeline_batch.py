@@ -0,0 +1,78 @@
+import pipeline.orchestrator as orchestrator
+from pipeline.orchestrator import Pipeline
+from database.client import SupabaseClient
+
+
+def _fake_collect(repo_url, dest_dir, **kwargs):
+    if repo_url.endswith("/broken"):
+        raise RuntimeError("clone failed")
+    name = repo_url.rstrip("/").split("/")[-1]
+    return {"repo_name": name, "readme_text": f"# {name}\n- fast", "file_list": [str(dest_dir)]}
+
+
+def test_run_many_isolates_workdirs_and_failures(monkeypatch, tmp_path):
+    monkeypatch.setattr(orchestrator, "collect_repo", _fake_collect)
+    monkeypatch.setattr(Pipeline, "_write_local_outputs", lambda *args, **kwargs: None)
+    pipeline = Pipeline(SupabaseClient("", ""), workdir=tmp_path)
+    urls = [
+        "https://github.com/a/one",
+        "https://github.com/b/two",
+        "https://github.com/c/broken",
+        "https://github.com/a/one",  # duplicate is collapsed
+    ]
+    report = pipeline.run_many(urls, max_workers=3, full=True)
+
+    summary = report["summary"]
+    assert summary["total"] == 3
+    assert summary["succeeded"] == 2
+    assert summary["failures"] == [{"url": urls[2], "error": "RuntimeError: clone failed"}]
+
+    ok = {r["url"]: r["result"] for r in report["results"] if r["status"] == "ok"}
+    dirs = {res["snapshot"]["file_list"][0] for res in ok.values()}
+    assert len(dirs) == 2
+    assert [v["repo"] for v in pipeline.snapshots.list()] == [
+        "https://github.com/a/one", "https://github.com/b/two"
+    ]
+
+
+def test_run_many_bounds_repos_in_flight_and_returns_compact_results(monkeypatch, tmp_path):
+    live, peak = set(), []
+
+    def collect(repo_url, dest_dir, **kwargs):
+        live.add(repo_url)
+        peak.append(len(live))
+        return {"repo_name": "r", "readme_text": "# r\n" + "x" * 10_000, "file_list": ["a.py"]}
+
+    def write_outputs(self, draft, repo_url="", analysis=None):
+        live.discard(repo_url)
+
+    monkeypatch.setattr(orchestrator, "collect_repo", collect)
+    monkeypatch.setattr(Pipeline, "_write_local_outputs", write_outputs)
+    pipeline = Pipeline(SupabaseClient("", ""), workdir=tmp_path)
+    report = pipeline.run_many(
+        [f"https://github.com/o/r{i}" for i in range(12)], max_workers=2, max_in_flight=3
+    )
+
+    assert report["summary"]["succeeded"] == 12
+    assert max(peak) <= 3
+    result = report["results"][0]["result"]
+    assert set(result) == {
+        "draft", "prompt_count", "renders_avoided", "snapshot_fp", "stages", "skipped"
+    }
+    assert result["draft"]["title"] and result["prompt_count"] > 0
+
+
+def test_run_many_reports_unreachable_repo(monkeypatch, tmp_path):
+    monkeypatch.setattr(Pipeline, "_write_local_outputs", lambda *args, **kwargs: None)
+    monkeypatch.setattr("collectors.github_collector.fetch_repo_metadata", lambda *a: {})
+    monkeypatch.setattr("collectors.github_collector.fetch_contributors", lambda *a: [])
+    db = SupabaseClient("", "")
+    pipeline = Pipeline(db, workdir=tmp_path)
+    url = (tmp_path / "nonexistent" / "x.git").as_uri()
+    report = pipeline.run_many([url])
+
+    summary = report["summary"]
+    assert (summary["succeeded"], summary["failed"]) == (0, 1)
+    assert summary["failures"][0]["error"].startswith("CollectError: ")
+    assert pipeline.snapshots.list() == []
+    assert db.fetch_drafts() == []
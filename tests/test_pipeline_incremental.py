@@ -0,0 +1,29 @@
+import pipeline.orchestrator as orchestrator
+from pipeline.orchestrator import Pipeline
+from database.client import SupabaseClient
+
+
+def test_unchanged_snapshot_skips_downstream_stages(monkeypatch, tmp_path):
+    snapshot = {"repo_name": "demo", "readme_text": "# demo\n- one", "file_list": ["a.py"],
+                "commit_sha": "abc"}
+    monkeypatch.setattr(orchestrator, "collect_repo", lambda url, dest, **kw: dict(snapshot))
+    writes = []
+    monkeypatch.setattr(Pipeline, "_write_local_outputs", lambda self, draft, *a: writes.append(draft))
+    pipeline = Pipeline(SupabaseClient("", ""), workdir=tmp_path)
+    url = "https://github.com/example/demo"
+
+    first = pipeline.run(url, full=True)
+    assert first["stages"] == {"analyze": "run", "write": "run", "persist": "run"}
+
+    second = pipeline.run(url, full=True)
+    assert second["skipped"] and second["draft"] is None
+    assert second["stages"] == {"analyze": "skipped", "write": "skipped", "persist": "skipped"}
+    assert second["analysis"] == first["analysis"]
+    assert len(writes) == 1
+
+    assert pipeline.run(url, force=True)["stages"]["write"] == "run"
+
+    snapshot["readme_text"] = "# demo\n- one\n- two"
+    changed = pipeline.run(url)
+    assert changed["stages"]["analyze"] == "run" and not changed["skipped"]
+    assert len(writes) == 3
@@ -0,0 +1,59 @@
+import json
+import logging
+
+import pipeline.orchestrator as orchestrator
+from database.memory import InMemorySupabaseClient
+from pipeline.metrics import RunMetrics
+from pipeline.orchestrator import Pipeline
+
+
+def test_run_attaches_stage_metrics_and_logs_json(monkeypatch, tmp_path, caplog):
+    def fake_collect(url, dest, metrics=None, **kwargs):
+        with metrics.stage("collect.clone"):
+            metrics.incr("files_walked", 3)
+        return {"repo_name": "demo", "readme_text": "# demo", "file_list": ["a.py"]}
+
+    monkeypatch.setattr(orchestrator, "collect_repo", fake_collect)
+    monkeypatch.setattr(Pipeline, "_write_local_outputs", lambda *args, **kwargs: None)
+    pipeline = Pipeline(InMemorySupabaseClient(), workdir=tmp_path)
+
+    with caplog.at_level(logging.INFO, logger="pipeline.metrics"):
+        result = pipeline.run("https://github.com/o/demo")
+
+    metrics = result["metrics"]
+    assert set(metrics["stages"]) == {
+        "collect", "collect.clone", "snapshot", "analyze", "write", "persist", "output"}
+    assert metrics["counters"] == {"files_walked": 3, "db_round_trips": 2}
+    logged = json.loads(caplog.records[-1].getMessage())
+    assert logged["event"] == "pipeline.run" and logged["repo"] == "https://github.com/o/demo"
+
+
+def test_run_metrics_accumulates_repeated_stages():
+    m = RunMetrics()
+    for _ in range(3):
+        with m.stage("write"):
+            sum(range(1000))
+    with m.stage("write.sub"):
+        pass
+    data = m.as_dict()
+    assert data["stages"]["write"]["calls"] == 3
+    assert data["total_wall_s"] == round(m.stages["write"]["wall_s"], 4)
+
+
+def test_profile_dir_gets_one_profile_per_repo_including_collect_threads(monkeypatch, tmp_path):
+    import pstats
+    import threading
+
+    def fake_collect(url, dest, metrics=None, **kwargs):
+        assert threading.current_thread() is not threading.main_thread()
+        return {"repo_name": url.rsplit("/", 1)[-1], "readme_text": "# demo", "file_list": []}
+
+    monkeypatch.setattr(orchestrator, "collect_repo", fake_collect)
+    monkeypatch.setattr(Pipeline, "_write_local_outputs", lambda *args, **kwargs: None)
+    pipeline = Pipeline(InMemorySupabaseClient(), workdir=tmp_path, profile_dir=tmp_path / "prof")
+    pipeline.run_many(["https://github.com/o/a", "https://github.com/o/b"], max_workers=2)
+
+    files = sorted(p.name for p in (tmp_path / "prof").iterdir())
+    assert files == ["o__a.pstats", "o__b.pstats"]
+    functions = {f[2] for f in pstats.Stats(str(tmp_path / "prof" / files[0])).stats}
+    assert {"fake_collect", "analyze_repo", "generate_blog"} <= functions
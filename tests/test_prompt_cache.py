@@ -0,0 +1,75 @@
+import asyncio
+
+from database.memory import InMemorySupabaseClient
+from prompts.prompt_cache import PromptCache, prompt_hash
+from prompts.prompt_generator import BASE_STYLE, generate_prompts, plan_prompts
+from workers.image_worker import ImageWorker
+from workers.renderers import FakeRenderer
+
+SETUP = "pip install -r requirements.txt 후 python main.py 로 실행합니다. 환경 변수를 설정하세요."
+
+
+def _draft(title, sections):
+    return {"title": title, "sections": [{"title": t, "content": c} for t, c in sections]}
+
+
+def test_normalized_prompts_share_a_hash():
+    assert prompt_hash("Hello,  World!") == prompt_hash("hello world")
+    assert prompt_hash("hello world") != prompt_hash("hello there")
+
+
+def test_exact_and_near_prompts_reuse_rendered_images(tmp_path):
+    cache = PromptCache(tmp_path / "cache.sqlite")
+    first = generate_prompts(_draft("alpha", [("설치 및 실행", SETUP)]))[0]
+    cache.record(first["prompt"], "img://setup")
+
+    # another repo, same section text: the title prefix differs but the subject matches
+    other = _draft("beta", [("설치 및 실행", SETUP + "!"), ("아키텍처", "이벤트 소싱과 CQRS 구조")])
+    plan = plan_prompts(other, cache=cache)
+    by_section = {p["section"]: p for p in plan["prompts"]}
+    assert by_section["설치 및 실행"]["status"] == "done"
+    assert by_section["설치 및 실행"]["image_url"] == "img://setup"
+    assert by_section["아키텍처"]["status"] == "waiting"
+    assert plan["stats"]["near_hits"] == 1 and plan["stats"]["renders_avoided"] == 1
+
+    again = plan_prompts(_draft("alpha", [("설치 및 실행", SETUP)]), cache=cache)
+    assert again["stats"]["exact_hits"] == 1 and again["stats"]["queued"] == 0
+    assert cache.stats() == {"entries": 1, "hits": 2}
+
+
+def test_budget_keeps_the_most_distinctive_sections(tmp_path):
+    cache = PromptCache(tmp_path / "cache.sqlite")
+    cache.record(
+        f"Illustration for x - 활용 아이디어: 팀 위키와 문서 자동화에 활용, {BASE_STYLE}", "img://a"
+    )
+    draft = _draft("gamma", [
+        ("활용 아이디어", "팀 위키와 문서 자동화에 활용할 수 있습니다"),
+        ("성능", "벡터 인덱스를 샤딩해 지연 시간을 줄입니다"),
+        ("확장성", "벡터 인덱스를 샤딩해 지연 시간을 줄입니다. 노드를 늘립니다"),
+        ("보안", "토큰은 환경 변수로만 읽고 로그에 남기지 않습니다"),
+    ])
+    plan = plan_prompts(draft, cache=cache, budget=1)
+    # the cached section is reused for free; the budget goes to the section least
+    # like the others, not to either of the two near-identical ones
+    assert [(p["section"], p["status"]) for p in plan["prompts"]] == [
+        ("활용 아이디어", "done"), ("보안", "waiting")
+    ]
+    assert plan["stats"]["over_budget"] == 2 and plan["stats"]["queued"] == 1
+
+    no_cache = plan_prompts(draft, budget=2)["prompts"]
+    assert len(no_cache) == 2 and set(no_cache[0]) == {"section", "prompt"}
+
+
+def test_worker_records_renders_and_reuses_them(tmp_path):
+    cache = PromptCache(tmp_path / "cache.sqlite")
+    db = InMemorySupabaseClient()
+    db.insert_many("image_prompts", [{"section": "a", "prompt": "A cat, studio light"}])
+    renderer = FakeRenderer()
+    summary = asyncio.run(ImageWorker(db, renderer, cache=cache).run(stop_when_idle=True))
+    assert (summary["rendered"], summary["reused"]) == (1, 0)
+
+    db.insert_many("image_prompts", [{"section": "b", "prompt": "a cat  studio light"}])
+    summary = asyncio.run(ImageWorker(db, renderer, cache=cache).run(stop_when_idle=True))
+    assert (summary["rendered"], summary["reused"]) == (0, 1)
+    urls = [r["image_url"] for r in db.rows("image_prompts")]
+    assert urls[0] == urls[1] and len(renderer.rendered) == 1
@@ -0,0 +1,119 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from database.memory import InMemorySupabaseClient
+from publishers.base import RateLimiter
+from publishers.ledger import PublishLedger
+from publishers.runner import publish_posts
+from publishers.sources import posts_from_manifest, posts_from_supabase
+from writers.manifest import ArticleManifest
+
+
+class FakePublisher:
+    concurrency = 2
+
+    def __init__(self, name, fail=()):
+        self.name, self.fail, self.sent = name, set(fail), []
+
+    def publish(self, post):
+        if post["slug"] in self.fail:
+            raise RuntimeError("boom")
+        self.sent.append(post["slug"])
+        return f"https://{self.name}/{post['slug']}"
+
+
+def _posts(n):
+    return [{"slug": f"p{i}", "title": f"p{i}", "html": "", "content_hash": f"h{i}"} for i in range(n)]
+
+
+def test_fan_out_records_ledger_and_skips_published(tmp_path):
+    ledger = PublishLedger(tmp_path / "ledger.json")
+    wp, velog = FakePublisher("wp"), FakePublisher("velog", fail={"p1"})
+    report = publish_posts(_posts(3), {"wp": wp, "velog": velog}, ledger)
+    assert report["summary"]["published"] == 5 and report["summary"]["error"] == 1
+    assert sorted(wp.sent) == ["p0", "p1", "p2"]
+
+    again = publish_posts(_posts(3), {"wp": wp, "velog": velog}, PublishLedger(tmp_path / "ledger.json"))
+    assert again["summary"]["skipped"] == 5 and again["summary"]["published"] == 0
+    assert velog.sent.count("p0") == 1 and "p1" not in velog.sent  # only the failed post retried
+
+
+def test_rate_limiter_spaces_calls():
+    now, sleeps = [0.0], []
+    limiter = RateLimiter(2.0, clock=lambda: now[0], sleep=sleeps.append)
+    for _ in range(3):
+        limiter.acquire()
+    assert sleeps == [0.5, 1.0]
+
+
+def test_sources_read_manifest_and_drafts(tmp_path):
+    manifest = ArticleManifest(tmp_path / "manifest.json")
+    manifest.record("a b", "# a", tech_stack=["python"])
+    manifest.save()
+    (tmp_path / "a_b.html").write_text("<h1>a</h1>", encoding="utf-8")
+    (post,) = posts_from_manifest(tmp_path)
+    assert post["html"] == "<h1>a</h1>" and post["tags"] == ["python"]
+
+    db = InMemorySupabaseClient()
+    db.insert_many("blog_drafts", [{"repo": f"r{i}", "title": f"t {i}", "body_md": "x"} for i in range(5)])
+    drafts = list(posts_from_supabase(db, page_size=2))
+    assert [d["slug"] for d in drafts] == [f"t_{i}" for i in range(5)]
+    assert "<p>x</p>" in drafts[0]["html"]
+
+
+def test_wordpress_retries_429_over_one_session(tmp_path):
+    pytest.importorskip("requests")
+    from publishers.targets import WordPressPublisher
+
+    calls, ports = [], set()
+
+    class Stub(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            calls.append((body["title"], self.headers["Authorization"]))
+            ports.add(self.client_address[1])
+            status = 429 if len(calls) == 1 else 201
+            payload = json.dumps({"link": f"http://wp/{body['title']}"}).encode()
+            self.send_response(status)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Stub)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    try:
+        wp = WordPressPublisher(f"http://127.0.0.1:{server.server_address[1]}", "key",
+                                rate_per_s=0, concurrency=1, sleep=lambda s: None)
+        report = publish_posts(_posts(3), {"wordpress": wp}, PublishLedger(tmp_path / "l.json"))
+        wp.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert report["summary"]["published"] == 3
+    assert wp.stats == {"requests": 4, "retries": 1}
+    assert calls[0][1] == "Bearer key"
+    assert len(ports) == 1  # keep-alive: one pooled connection
+
+
+def test_sources_agree_on_content_hash(tmp_path):
+    body = "# demo\n\n본문\n\n_Generated locally on 2024-01-01_\n"
+    manifest = ArticleManifest(tmp_path / "manifest.json")
+    manifest.record("demo", body)
+    manifest.save()
+    (tmp_path / "demo.html").write_text("<h1>demo</h1>", encoding="utf-8")
+    (from_manifest,) = posts_from_manifest(tmp_path)
+
+    db = InMemorySupabaseClient()
+    db.insert_many("blog_drafts", [{"repo": "r", "title": "demo",
+                                    "body_md": body.replace("2024-01-01", "2024-02-02")}])
+    (from_db,) = posts_from_supabase(db)
+    assert from_db["content_hash"] == from_manifest["content_hash"]
@@ -0,0 +1,75 @@
+from analyzers.readme_parser import parse_readme, section_word_counts
+
+README = """[![Build](https://github.com/o/r/actions/workflows/ci.yml/badge.svg)](https://github.com/o/r/actions)
+[![License: MIT](https://img.shields.io/badge/License-MIT-yellow.svg)](LICENSE)
+
+# Demo Tool
+
+Fast things for people.
+
+## Features
+- one
+- two
+  - nested is not a top-level feature
+
+## Installation
+
+```bash
+$ pip install demo-tool
+npm i -g demo
+```
+
+    cargo install demo
+
+Usage
+-----
+Run `demo --help` for details.
+
+```
+- not a feature
+```
+
+## License
+Released under the Apache License 2.0.
+"""
+
+
+def test_single_pass_extracts_structure_and_metadata():
+    parsed = parse_readme(README)
+    assert parsed["description"] == "Demo Tool"
+    assert parsed["features"] == ["one", "two"]
+    assert parsed["install_commands"] == ["pip install demo-tool", "npm i -g demo", "cargo install demo"]
+    assert [b["alt"] for b in parsed["badges"]] == ["Build", "License: MIT"]
+    assert parsed["license"] == "MIT"  # the badge comes first
+
+    (top,) = parsed["sections"]
+    assert top["title"] == "Demo Tool" and top["level"] == 1
+    assert [c["title"] for c in top["children"]] == ["Features", "Installation", "Usage", "License"]
+    features, install, usage, _ = top["children"]
+    assert features["bullets"] == 3 and install["code_blocks"] == 1 and usage["code_blocks"] == 1
+    counts = section_word_counts(parsed["sections"])
+    assert counts["Usage"] == 5 and counts["Demo Tool"] == 4
+
+
+def test_license_from_section_and_early_stop():
+    parsed = parse_readme("# x\n## Licence\nBSD-2-Clause, see LICENSE\n")
+    assert parsed["license"] == "BSD-2-Clause"
+
+    long = "# t\n" + "".join(f"## s{i}\n- item {i}\n" for i in range(1000))
+    capped = parse_readme(long, max_sections=10, max_features=3)
+    assert capped["truncated"] and len(capped["features"]) == 3
+    assert len(capped["sections"][0]["children"]) == 9
+    assert parse_readme(long, max_lines=5)["truncated"]
+
+
+def test_full_parse_by_default_and_truncation_reaches_insights():
+    from analyzers.repo_analyzer import analyze_repo
+
+    long = "# t\n" + "".join(f"## s{i}\nword {i}\n" for i in range(500))
+    parsed = parse_readme(long)
+    assert not parsed["truncated"] and len(parsed["sections"][0]["children"]) == 500
+    assert parsed["word_count"] == 500 * 2  # heading text is not body text
+
+    insights = analyze_repo({"repo_name": "r", "readme_text": long})["insights"]
+    assert insights["readme_parse_truncated"] is False
+    assert insights["readme_words"] == parsed["word_count"]
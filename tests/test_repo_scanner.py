@@ -0,0 +1,42 @@
+from collectors.github_collector import guess_tech_stack
+from collectors.repo_scanner import RepoScanner, path_suffix
+
+
+def test_scanner_single_pass_aggregates():
+    entries = [("src/main.py", 100), ("src/util.py", 50), ("web/index.ts", 30),
+               ("README.md", 10), ("Makefile", None)]
+    scan = RepoScanner().feed(iter(entries)).result("Built with FastAPI and Docker")
+    assert scan["folders"] == ["src", "web"]
+    assert scan["main_files"] == ["src/main.py"]
+    assert scan["tech_stack"] == ["docker", "fastapi", "python", "typescript"]
+    assert scan["extension_histogram"] == {".py": 2, ".ts": 1, ".md": 1, "": 1}
+    assert scan["language_bytes"] == {"python": 150, "typescript": 30}
+    assert (scan["file_count"], scan["total_bytes"]) == (5, 190)
+
+
+def test_scanner_classifies_paths_added_after_a_result():
+    scanner = RepoScanner().feed([("a.py", 10)])
+    assert scanner.result()["language_bytes"] == {"python": 10}
+    scan = scanner.feed([("b.go", 5), ("c.py", 1)]).result()
+    assert scan["extension_histogram"] == {".py": 2, ".go": 1}
+    assert scan["language_bytes"] == {"python": 11, "go": 5}
+
+
+def test_scanner_pairs_sizes_with_newline_names():
+    scan = RepoScanner().feed([("weird\nname.txt", 10), ("big.py", 1000), ("x.js", 5)]).result()
+    assert scan["extension_histogram"] == {".txt": 1, ".py": 1, ".js": 1}
+    assert scan["language_bytes"] == {"python": 1000, "javascript": 5}
+
+
+def test_scanner_caps_file_list():
+    scan = RepoScanner(file_list_limit=2).feed(f"f{i}.go" for i in range(10)).result()
+    assert scan["file_list"] == ["f0.go", "f1.go"]
+    assert scan["file_count"] == 10 and scan["file_list_truncated"]
+    assert RepoScanner(file_list_limit=0).feed(["a.py"]).result()["file_list"] == []
+
+
+def test_path_suffix_matches_pathlib():
+    from pathlib import Path
+    for p in ["a/b.py", "a/.bashrc", "x.tar.gz", "noext", "dir.d/file", "a."]:
+        assert path_suffix(p) == Path(p).suffix
+    assert guess_tech_stack(["a.rs", "b.kt"], "") == ["kotlin", "rust"]
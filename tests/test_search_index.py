@@ -0,0 +1,58 @@
+from writers.manifest import ArticleManifest
+from writers.search_index import SearchIndex, build_search_index, shard_of, tokenize
+
+
+def _post(manifest, root, title, body, stack=(), repo=""):
+    entry = manifest.record(title, body, repo=repo, tech_stack=stack, date="2024-01-01")
+    (root / f"{entry['slug']}.md").write_text(body, encoding="utf-8")
+    return entry
+
+
+def _seed(root):
+    manifest = ArticleManifest(root / "manifest.json")
+    _post(manifest, root, "flask 소개", "Flask 는 파이썬 웹 프레임워크입니다. Next.js 와 비교합니다.",
+          ["python", "flask"], "github.com/pallets/flask")
+    _post(manifest, root, "tokio 소개", "Rust 비동기 런타임. 웹 서버에 쓰입니다.",
+          ["rust"], "github.com/tokio-rs/tokio")
+    _post(manifest, root, "django 소개", "파이썬 웹 프레임워크, ORM 포함.",
+          ["python", "django"], "github.com/django/django")
+    manifest.save()
+    return manifest
+
+
+def test_tokenize_keeps_tech_words_and_splits_hangul_into_bigrams():
+    assert tokenize("Next.js 와 C++ 오픈소스!") == ["next.js", "와", "c++", "오픈", "픈소", "소스"]
+    assert shard_of("오픈", 64) == shard_of("오픈", 64) < 64
+
+
+def test_search_ranks_matches_and_counts_facets(tmp_path):
+    build_search_index(_seed(tmp_path).posts(), tmp_path, shards=4)
+    index = SearchIndex(tmp_path / "search")
+
+    result = index.search("파이썬 프레임워크")
+    assert {h["slug"] for h in result["hits"]} == {"flask_소개", "django_소개"}
+    assert result["facets"]["tech_stack"] == {"python": 2, "flask": 1, "django": 1}
+
+    assert [h["slug"] for h in index.search("웹", tech_stack=["rust"])["hits"]] == ["tokio_소개"]
+    assert index.search("next.js")["total"] == 1
+    assert index.search("", repo="github.com/django/django")["hits"][0]["title"] == "django 소개"
+    assert index.search("haskell")["total"] == 0
+
+
+def test_incremental_build_only_touches_changed_posts(tmp_path):
+    manifest = _seed(tmp_path)
+    assert build_search_index(manifest.posts(), tmp_path, shards=16)["indexed"] == 3
+    again = build_search_index(manifest.posts(), tmp_path, shards=16)
+    assert (again["indexed"], again["shards_written"]) == (0, 0)
+
+    _post(manifest, tmp_path, "tokio 소개", "Rust 비동기 런타임과 채널.", ["rust"])
+    stats = build_search_index(manifest.posts(), tmp_path, shards=16)
+    assert stats["indexed"] == 1 and 0 < stats["shards_written"] < 16
+    index = SearchIndex(tmp_path / "search")
+    assert index.search("채널")["total"] == 1 and index.search("서버")["total"] == 0
+
+    posts = [p for p in manifest.posts() if p["slug"] != "flask_소개"]
+    assert build_search_index(posts, tmp_path, shards=16)["removed"] == 1
+    index = SearchIndex(tmp_path / "search")
+    assert [h["slug"] for h in index.search("파이썬")["hits"]] == ["django_소개"]
+    assert "flask" not in index.facets["tech_stack"]
@@ -0,0 +1,67 @@
+import gzip
+import http.client
+import os
+import threading
+
+import pytest
+
+from scripts.precompress import precompress
+from scripts.serve_local import make_server
+
+
+@pytest.fixture
+def site(tmp_path):
+    root = tmp_path / "site"
+    root.mkdir()
+    (root / "index.html").write_text("<h1>hello</h1>" * 100, encoding="utf-8")
+    (tmp_path / "secret.txt").write_text("nope", encoding="utf-8")
+    server = make_server(root, port=0, host="127.0.0.1", cache_mb=1, quiet=True)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield root, server
+    server.shutdown()
+    server.server_close()
+
+
+def _get(server, path, headers=None, method="GET"):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    conn.request(method, path, headers=headers or {})
+    resp = conn.getresponse()
+    body = resp.read()
+    conn.close()
+    return resp, body
+
+
+def test_paths_are_confined_to_root(site):
+    _, server = site
+    for path in ("/../secret.txt", "/%2e%2e/secret.txt", "/..%2fsecret.txt"):
+        resp, body = _get(server, path)
+        assert resp.status in (403, 404) and b"nope" not in body
+
+
+def test_etag_and_last_modified_revalidate_with_304(site):
+    _, server = site
+    resp, body = _get(server, "/")
+    assert resp.status == 200 and body.startswith(b"<h1>hello")
+    etag, modified = resp.getheader("ETag"), resp.getheader("Last-Modified")
+    assert _get(server, "/", {"If-None-Match": etag})[0].status == 304
+    assert _get(server, "/", {"If-Modified-Since": modified})[0].status == 304
+    assert _get(server, "/", {"If-None-Match": '"other"'})[0].status == 200
+    _get(server, "/")
+    assert server.RequestHandlerClass.cache.hits >= 1
+
+
+def test_serves_fresh_precompressed_sibling(site):
+    root, server = site
+    stats = precompress(root)
+    assert stats["written"] >= 1 and (root / "index.html.gz").exists()
+    resp, body = _get(server, "/index.html", {"Accept-Encoding": "gzip"})
+    assert resp.getheader("Content-Encoding") == "gzip"
+    assert gzip.decompress(body).startswith(b"<h1>hello")
+    assert precompress(root)["written"] == 0
+
+    src = root / "index.html"
+    st = (root / "index.html.gz").stat()
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))  # source now newer
+    resp, body = _get(server, "/index.html", {"Accept-Encoding": "gzip"})
+    assert resp.getheader("Content-Encoding") is None and body.startswith(b"<h1>")
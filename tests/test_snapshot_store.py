@@ -0,0 +1,56 @@
+import pytest
+
+from pipeline.snapshot_store import SnapshotStore
+
+URL = "https://github.com/example/demo"
+
+
+def _snap(sha, files, stars=1, readme="# demo"):
+    return {"repo_name": "demo", "commit_sha": sha, "readme_text": readme, "file_list": files,
+            "file_count": len(files), "stars": stars, "repo_path": "/tmp/x"}
+
+
+def test_put_is_keyed_by_commit_and_loads_large_fields_lazily(tmp_path):
+    store = SnapshotStore(tmp_path / "s.sqlite")
+    first = store.put(URL, _snap("a1", ["a.py", "b.py"]))
+    assert store.put(URL + ".git", _snap("a1", ["a.py", "b.py"])) == first  # unchanged → no write
+    store.put(URL, _snap("a1", ["a.py", "b.py"], stars=2))  # same commit, new data → replaced
+    assert len(store.list(URL)) == 1
+
+    snap = store.get(URL)
+    assert snap["stars"] == 2 and "repo_path" not in snap
+    assert not snap.loaded("file_list")
+    assert snap["file_list"] == ["a.py", "b.py"] and snap.loaded("file_list")
+    assert snap.to_dict()["readme_text"] == "# demo"
+
+
+def test_diff_and_gc(tmp_path):
+    store = SnapshotStore(tmp_path / "s.sqlite", keep=0)
+    store.put(URL, _snap("a1", ["a.py", "b.py"]))
+    store.put(URL, _snap("b2", ["a.py", "c.py"], stars=5, readme="# demo v2"))
+    store.put("https://github.com/other/repo", _snap("c3", []))
+
+    diff = store.diff(URL)
+    assert (diff["old"], diff["new"]) == ("a1", "b2")
+    assert diff["files_added"] == ["c.py"] and diff["files_removed"] == ["b.py"]
+    assert diff["readme_changed"]
+    assert diff["changed"]["stars"] == {"old": 1, "new": 5}
+    assert "commit_sha" in diff["changed"]
+
+    assert store.gc(keep=1) == 1
+    assert [v["commit_sha"] for v in store.list(URL)] == ["b2"]
+    assert store.get(URL, "a1") is None
+
+
+def test_diff_defaults_only_the_missing_side(tmp_path):
+    store = SnapshotStore(tmp_path / "s.sqlite", keep=0)
+    for sha in ("a1", "b2", "c3"):
+        store.put(URL, _snap(sha, [f"{sha}.py"]))
+    diff = store.diff(URL, old_sha="a1")
+    assert (diff["old"], diff["new"]) == ("a1", "c3")
+    diff = store.diff(URL, new_sha="b2")
+    assert (diff["old"], diff["new"]) == ("a1", "b2")
+    with pytest.raises(KeyError):
+        store.diff(URL, old_sha="zz")
+    with pytest.raises(ValueError):
+        store.diff(URL, new_sha="a1")  # nothing older to compare against
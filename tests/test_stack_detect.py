@@ -0,0 +1,56 @@
+import json
+from collections import Counter
+
+from collectors.repo_scanner import path_suffix
+from collectors.stack_detect import (
+    detect_stack,
+    read_manifests,
+    readme_keywords,
+    stack_names,
+    suffix_counts,
+)
+
+PATHS = [".env", "src/app.py", "src/util.py", "web/index.tsx", ".gitignore", "a/.npmrc", "Makefile",
+         "a.b/c", "lib/x.tar.gz", "trailing."]
+
+
+def test_suffix_counts_matches_path_suffix():
+    expected = Counter(s for s in map(path_suffix, PATHS) if s)
+    assert suffix_counts(PATHS) == expected
+    odd = ["a.py\nb", "weird\nname.txt", "x.js"]
+    assert suffix_counts(odd) == Counter(s for s in map(path_suffix, odd) if s)
+
+
+def test_readme_keywords_use_word_boundaries():
+    text = "Reactive streams, built with React and Next.js; not a dockerfile-free FastAPIs."
+    assert readme_keywords(text) == ["react", "next.js"]
+
+
+def test_manifests_drive_framework_detection(tmp_path):
+    (tmp_path / "package.json").write_text(
+        json.dumps({"dependencies": {"react": "^18", "next": "14"}, "devDependencies": {"vite": "5"}}),
+        encoding="utf-8",
+    )
+    (tmp_path / "requirements-dev.txt").write_text("# tools\nDjango>=4\n-r base.txt\n", encoding="utf-8")
+    (tmp_path / "pyproject.toml").write_text(
+        '[project]\nname = "x"\ndependencies = ["fastapi>=0.100", "torch"]\n', encoding="utf-8"
+    )
+    (tmp_path / "Cargo.toml").write_text(
+        '[package]\nname = "x"\n[dependencies]\ntokio = { version = "1" }\naxum = "0.7"\n',
+        encoding="utf-8",
+    )
+    (tmp_path / "go.mod").write_text(
+        "module x\n\nrequire (\n\tgithub.com/gin-gonic/gin v1.9.1\n)\n", encoding="utf-8"
+    )
+    manifests = read_manifests(tmp_path, ["package.json", "requirements-dev.txt", "pyproject.toml",
+                                          "Cargo.toml", "go.mod", "sub/package.json", "missing.txt"])
+    assert manifests["requirements-dev.txt"] == ["Django"]
+    stack = detect_stack(["src/main.rs"] * 9 + ["app.py"], readme="uses docker", manifests=manifests)
+    by_name = {s["name"]: s for s in stack}
+    assert {"react", "next.js", "vite", "django", "fastapi", "pytorch", "tokio", "axum", "gin",
+            "docker", "rust", "python", "javascript", "go"} <= set(by_name)
+    assert by_name["rust"]["confidence"] > by_name["python"]["confidence"] > by_name["docker"]["confidence"]
+    assert by_name["react"]["evidence"] == ["manifest:package.json"]
+    assert stack_names(stack, min_confidence=0.5) == sorted(
+        n for n, s in by_name.items() if s["confidence"] >= 0.5
+    )
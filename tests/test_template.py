@@ -0,0 +1,63 @@
+import os
+from pathlib import Path
+
+from pipeline.fingerprint import file_fingerprint
+from writers.blog_writer import BLOG_TEMPLATE_PATH, generate_blog
+from writers.template import TemplateCache, compile_sections
+
+GUIDE = """# 가이드
+intro
+
+# 1. 도입부
+- 왜 필요한가
+- 무엇이 바뀌는가
+
+예)
+- 예시는 제외
+
+# 2. 핵심 기능
+### 2-1. 수집
+### 2-2. 분석
+"""
+
+
+def test_compile_sections_builds_plan():
+    plan = compile_sections(GUIDE)
+    assert [(s["number"], s["title"]) for s in plan] == [("1", "도입부"), ("2", "핵심 기능")]
+    assert plan[0]["guidance"] == ["왜 필요한가", "무엇이 바뀌는가"]
+    assert plan[1]["subsections"] == ["수집", "분석"]
+
+
+def test_cache_reloads_only_when_file_changes(tmp_path):
+    path = tmp_path / "guide.md"
+    path.write_text(GUIDE, encoding="utf-8")
+    cache = TemplateCache()
+    first = cache.get(path)
+    assert cache.get(path) is first and cache.loads == 1
+    assert first.version == file_fingerprint(path)
+
+    path.write_text(GUIDE + "# 3. 마무리\n", encoding="utf-8")
+    mtime = path.stat().st_mtime_ns
+    os.utime(path, ns=(mtime, mtime + 1))  # same-tick writes still invalidate
+    second = cache.get(path)
+    assert cache.loads == 2 and second.version != first.version
+    assert second.section_titles()[-1] == "마무리"
+
+    assert cache.get(tmp_path / "missing.md").version == ""
+
+
+def test_draft_references_template_by_version():
+    draft = generate_blog({"repo_name": "demo"})
+    assert "template" not in draft
+    assert draft["template_version"] == file_fingerprint(Path(BLOG_TEMPLATE_PATH))
+
+
+def test_writer_follows_the_guide_section_plan():
+    from writers.blog_writer import _build_sections
+
+    analysis = {"repo_name": "demo", "features": ["fast"], "tech_stack": ["Python"]}
+    plan = compile_sections("# 7. 기술 스택\n# 2. 문제 제기\n# 4. 핵심 기능\n")
+    assert [s["title"] for s in _build_sections(analysis, plan)] == ["기술 스택", "핵심 기능"]
+    assert [s["title"] for s in _build_sections(analysis)] == [
+        "프로젝트 배경", "핵심 기능", "기술 스택", "설치 및 실행", "활용 아이디어",
+    ]
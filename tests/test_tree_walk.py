@@ -0,0 +1,40 @@
+import subprocess
+
+from collectors.github_collector import tree_paths
+from collectors.tree_walk import GitIgnore, walk_tree
+
+
+def _touch(root, *paths):
+    for rel in paths:
+        p = root / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text("x", encoding="utf-8")
+
+
+def test_walk_prunes_ignored_dirs_and_patterns(tmp_path):
+    _touch(tmp_path, "src/main.py", "src/app.min.js", "node_modules/x/index.js",
+           ".git/objects/ab/cd", "vendor/lib.go", "docs/guide.md")
+    assert sorted(walk_tree(tmp_path)) == ["docs/guide.md", "src/app.min.js", "src/main.py"]
+    assert sorted(walk_tree(tmp_path, ignore_patterns=["*.min.js", "docs"])) == ["src/main.py"]
+
+
+def test_walk_honors_gitignore(tmp_path):
+    _touch(tmp_path, "a.py", "build/out.bin", "logs/x.log", "keep.log")
+    (tmp_path / ".gitignore").write_text("build/\n*.log\n!keep.log\n", encoding="utf-8")
+    found = sorted(walk_tree(tmp_path, use_gitignore=True))
+    assert found == [".gitignore", "a.py", "keep.log"]
+
+
+def test_gitignore_leading_slash_anchors_directory_rules():
+    rules = GitIgnore(["/build/", "cache/"])
+    assert rules.match("build", is_dir=True)
+    assert not rules.match("src/build", is_dir=True)
+    assert rules.match("src/cache", is_dir=True) and not rules.match("cache", is_dir=False)
+
+
+def test_tree_paths_uses_git_index(tmp_path):
+    _touch(tmp_path, "main.py", "node_modules/dep.js", "untracked.txt")
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    subprocess.run(["git", "add", "main.py", "node_modules/dep.js"], cwd=tmp_path, check=True)
+    assert tree_paths(tmp_path) == ["main.py"]
+    assert sorted(tree_paths(tmp_path, use_git=False)) == ["main.py", "untracked.txt"]
@@ -0,0 +1,171 @@
+"""Async image worker: claims ``image_prompts`` in leased batches and renders them.
+
+Each poll re-queues expired leases, claims up to ``batch_size`` waiting prompts,
+renders them with at most ``concurrency`` in flight and writes the outcome back.
+A lost lease counts as an attempt, so a prompt that hangs or kills the worker is
+marked ``failed`` after ``max_attempts`` like one that raises.
+Idle polls back off geometrically from ``min_poll`` to ``max_poll``, and so do
+polls whose claim or requeue hit a database error; a failed write-back is retried
+up to ``max_attempts`` times before the row is left to its lease. With a
+``PromptCache`` a prompt that matches an earlier render reuses its image, and
+every finished render is recorded for later prompts.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from database.client import SupabaseClient
+from prompts.prompt_cache import PromptCache
+from workers.renderers import Renderer
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class WorkerMetrics:
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.counts = {"claimed": 0, "rendered": 0, "retried": 0, "failed": 0, "requeued": 0,
+                       "lost_leases": 0, "batches": 0, "idle_polls": 0, "reused": 0,
+                       "db_errors": 0, "write_errors": 0}
+        self.latencies: List[float] = []
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started
+        return {
+            **self.counts,
+            "elapsed_s": round(elapsed, 3),
+            "renders_per_s": round(self.counts["rendered"] / elapsed, 3) if elapsed > 0 else 0.0,
+            "latency_p50_s": round(_percentile(self.latencies, 50), 4),
+            "latency_p95_s": round(_percentile(self.latencies, 95), 4),
+        }
+
+
+class ImageWorker:
+    def __init__(
+        self,
+        db: SupabaseClient,
+        renderer: Renderer,
+        worker_id: Optional[str] = None,
+        batch_size: int = 8,
+        concurrency: int = 4,
+        lease_seconds: float = 300,
+        max_attempts: int = 3,
+        min_poll: float = 1.0,
+        max_poll: float = 30.0,
+        backoff: float = 2.0,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        cache: Optional[PromptCache] = None,
+    ):
+        self.db = db
+        self.renderer = renderer
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.min_poll = min_poll
+        self.max_poll = max_poll
+        self.backoff = backoff
+        self._sleep = sleep
+        self.cache = cache
+        self.metrics = WorkerMetrics()
+
+    async def run_once(self) -> int:
+        """One poll: requeue expired leases, claim a batch and render it."""
+        expired = await asyncio.to_thread(self.db.requeue_expired, None, self.max_attempts)
+        self.metrics.counts["requeued"] += expired["requeued"]
+        self.metrics.counts["failed"] += expired["failed"]
+        rows = await asyncio.to_thread(
+            self.db.claim_prompts, self.worker_id, self.batch_size, self.lease_seconds
+        )
+        if not rows:
+            self.metrics.counts["idle_polls"] += 1
+            return 0
+        self.metrics.counts["batches"] += 1
+        self.metrics.counts["claimed"] += len(rows)
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+        await asyncio.gather(
+            *(self._process(row, semaphore) for row in rows), return_exceptions=True
+        )
+        return len(rows)
+
+    async def run(self, max_batches: Optional[int] = None, stop_when_idle: bool = False) -> Dict[str, Any]:
+        interval = self.min_poll
+        while max_batches is None or self.metrics.counts["batches"] < max_batches:
+            try:
+                processed = await self.run_once()
+            except Exception:  # claim/requeue failed; back off and poll again
+                self.metrics.counts["db_errors"] += 1
+                await self._sleep(interval)
+                interval = min(self.max_poll, interval * self.backoff)
+                continue
+            if processed:
+                interval = self.min_poll
+                continue
+            if stop_when_idle:
+                break
+            await self._sleep(interval)
+            interval = min(self.max_poll, interval * self.backoff)
+        return self.metrics.summary()
+
+    # Internal helpers -------------------------------------------------
+    async def _process(self, row: Dict[str, Any], semaphore: asyncio.Semaphore) -> None:
+        async with semaphore:
+            t0 = time.perf_counter()
+            try:
+                hit = None
+                if self.cache is not None:
+                    hit = await asyncio.to_thread(self.cache.lookup, row.get("prompt", ""))
+                if hit is not None:
+                    fields = {"image_url": hit["image_url"], "status": "done", "error": None}
+                    self.metrics.counts["reused"] += 1
+                else:
+                    result = await self.renderer.render(row)
+                    fields = {**result, "status": "done", "error": None}
+                    self.metrics.counts["rendered"] += 1
+                    self.metrics.latencies.append(time.perf_counter() - t0)
+                    if self.cache is not None and result.get("image_url"):
+                        await asyncio.to_thread(
+                            self.cache.record, row.get("prompt", ""), result["image_url"]
+                        )
+            except Exception as e:
+                attempts = int(row.get("attempts") or 0) + 1
+                retry = attempts < self.max_attempts
+                fields = {
+                    "status": "waiting" if retry else "failed",
+                    "attempts": attempts,
+                    "error": f"{type(e).__name__}: {e}",
+                    "worker_id": None,
+                }
+                self.metrics.counts["retried" if retry else "failed"] += 1
+        await self._write_back(row, fields)
+
+    async def _write_back(self, row: Dict[str, Any], fields: Dict[str, Any]) -> None:
+        """``finish_prompt`` with retries; after ``max_attempts`` errors the lease expires."""
+        interval = self.min_poll
+        for attempt in range(max(1, self.max_attempts)):
+            if attempt:
+                await self._sleep(interval)
+                interval = min(self.max_poll, interval * self.backoff)
+            try:
+                written = await asyncio.to_thread(
+                    self.db.finish_prompt, row["id"], self.worker_id, fields
+                )
+            except Exception:
+                self.metrics.counts["write_errors"] += 1
+                continue
+            if not written:  # lease expired and the row was handed to someone else
+                self.metrics.counts["lost_leases"] += 1
+            return
+
+
+__all__ = ["ImageWorker", "WorkerMetrics"]
@@ -0,0 +1,58 @@
+"""Pluggable image renderer backends for the image worker.
+
+A renderer exposes ``async render(prompt_row) -> dict``; the returned fields
+(e.g. ``image_url``) are written back to the ``image_prompts`` row.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import importlib
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional
+
+
+class Renderer(ABC):
+    name = "base"
+
+    @abstractmethod
+    async def render(self, prompt: Dict[str, Any]) -> Dict[str, Any]:
+        """Render one ``image_prompts`` row; returns the fields to write back."""
+
+
+class FakeRenderer(Renderer):
+    """Deterministic local renderer for tests and dry runs."""
+
+    name = "fake"
+
+    def __init__(self, delay: float = 0.0, fail: Optional[Callable[[Dict[str, Any]], bool]] = None):
+        self.delay = delay
+        self.fail = fail
+        self.rendered: list = []
+
+    async def render(self, prompt: Dict[str, Any]) -> Dict[str, Any]:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail and self.fail(prompt):
+            raise RuntimeError(f"render failed for prompt {prompt.get('id')}")
+        self.rendered.append(prompt.get("id"))
+        digest = prompt.get("prompt_hash") or hashlib.sha256(
+            str(prompt.get("prompt", "")).encode("utf-8")
+        ).hexdigest()
+        return {"image_url": f"fake://images/{digest[:16]}.png"}
+
+
+RENDERERS = {"fake": FakeRenderer}
+
+
+def load_renderer(spec: str, **kwargs: Any) -> Renderer:
+    """``fake`` or ``package.module:ClassName`` for an external backend."""
+    if spec in RENDERERS:
+        return RENDERERS[spec](**kwargs)
+    module_name, _, attr = spec.partition(":")
+    if not attr:
+        raise ValueError(f"unknown renderer {spec!r}; use one of {sorted(RENDERERS)} or module:Class")
+    return getattr(importlib.import_module(module_name), attr)(**kwargs)
+
+
+__all__ = ["Renderer", "FakeRenderer", "RENDERERS", "load_renderer"]
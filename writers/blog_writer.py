@@ -4,68 +4,116 @@ Generates markdown outline using local Codex runtime (no external LLM APIs).
 from __future__ import annotations
 
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, Any, List
+from typing import Any, Callable, Dict, List, Optional
+
+from writers.template import CompiledTemplate, load_template
 
 
 BLOG_TEMPLATE_PATH = "config/BLOG_WRITING_GUIDE.md"
 
+FILLER = "\n\n" + "이 프로젝트를 통한 자동화, 확장성, 유지보수 방법을 깊게 다룹니다. "
 
-def _load_template() -> str:
-    path = Path(BLOG_TEMPLATE_PATH)
-    return path.read_text(encoding="utf-8") if path.exists() else ""
+# Length policy: ``total_min`` pads the whole body (legacy ``target_len``),
+# ``total_max`` caps it; ``sections`` maps a section title (or "default") to
+# ``{"min": chars, "max": chars}`` applied to that section's content.
+DEFAULT_LENGTH_POLICY: Dict[str, Any] = {
+    "total_min": 5200,
+    "total_max": None,
+    "sections": {"default": {"min": 0, "max": None}},
+}
 
 
-def _build_sections(analysis: Dict[str, Any]) -> List[Dict[str, str]]:
-    features = analysis.get("features") or []
-    tech_stack = analysis.get("tech_stack", [])
-    folders = analysis.get("folders", [])
-    main_files = analysis.get("main_files", [])
+def _load_template() -> CompiledTemplate:
+    return load_template(BLOG_TEMPLATE_PATH)
 
-    sections: List[Dict[str, str]] = []
 
-    sections.append({
-        "title": "프로젝트 배경",
-        "content": _intro_paragraph(analysis)
-    })
+def _background(analysis: Dict[str, Any]) -> List[Dict[str, str]]:
+    return [{"title": "프로젝트 배경", "content": _intro_paragraph(analysis)}]
 
-    if features:
-        bullet_md = "\n".join(f"- {f}" for f in features)
-        sections.append({"title": "핵심 기능", "content": bullet_md})
 
-    if folders:
-        tree_preview = "\n".join(f"- {p}" for p in folders[:12])
-        sections.append({"title": "디렉터리 구조", "content": tree_preview})
+def _features(analysis: Dict[str, Any]) -> List[Dict[str, str]]:
+    features = analysis.get("features") or []
+    if not features:
+        return []
+    return [{"title": "핵심 기능", "content": "\n".join(f"- {f}" for f in features)}]
 
-    if tech_stack:
-        sections.append({"title": "기술 스택", "content": ", ".join(tech_stack)})
 
+def _architecture(analysis: Dict[str, Any]) -> List[Dict[str, str]]:
+    folders = analysis.get("folders", [])
+    main_files = analysis.get("main_files", [])
+    sections: List[Dict[str, str]] = []
+    if folders:
+        sections.append({"title": "디렉터리 구조", "content": "\n".join(f"- {p}" for p in folders[:12])})
     if main_files:
         sections.append({"title": "주요 엔트리 파일", "content": "\n".join(f"- {f}" for f in main_files)})
+    return sections
 
-    sections.append({
-        "title": "활용 아이디어",
-        "content": _business_ideas(analysis)
-    })
 
-    sections.append({
+def _tech_stack(analysis: Dict[str, Any]) -> List[Dict[str, str]]:
+    tech_stack = analysis.get("tech_stack", [])
+    return [{"title": "기술 스택", "content": ", ".join(tech_stack)}] if tech_stack else []
+
+
+def _usage(analysis: Dict[str, Any]) -> List[Dict[str, str]]:
+    return [{
         "title": "설치 및 실행",
         "content": "1. 리포지토리 클론\n2. 의존성 설치\n3. 환경변수(.env) 설정\n4. `python scripts/run_github_blog.py --url <repo>` 실행"
-    })
+    }]
+
+
+def _ideas(analysis: Dict[str, Any]) -> List[Dict[str, str]]:
+    return [{"title": "활용 아이디어", "content": _business_ideas(analysis)}]
 
+
+# Guide section number -> builder for the draft sections it covers. Guide
+# sections without a builder (title, problem, CTA, ...) are written by
+# ``_compose_body`` or not generated.
+SECTION_BUILDERS: Dict[str, Callable[[Dict[str, Any]], List[Dict[str, str]]]] = {
+    "1": _background,
+    "4": _features,
+    "5": _architecture,
+    "7": _tech_stack,
+    "8": _usage,
+    "9": _ideas,
+}
+
+
+def _build_sections(
+    analysis: Dict[str, Any], plan: Optional[List[Dict[str, Any]]] = None
+) -> List[Dict[str, str]]:
+    """Draft sections in the order of the guide's section ``plan``.
+
+    Without a plan (e.g. the guide file is missing) every builder runs in
+    guide-number order.
+    """
+    numbers = [s["number"] for s in plan] if plan else list(SECTION_BUILDERS)
+    sections: List[Dict[str, str]] = []
+    for number in numbers:
+        builder = SECTION_BUILDERS.get(number)
+        if builder:
+            sections.extend(builder(analysis))
     return sections
 
 
-def generate_blog(analysis: Dict[str, Any]) -> Dict[str, Any]:
+def generate_blog(
+    analysis: Dict[str, Any], length_policy: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """Return structured blog draft strictly following BLOG_WRITING_GUIDE sections.
     Replace body generation with Codex prompt in production.
+    ``length_policy`` overrides keys of ``DEFAULT_LENGTH_POLICY``.
     """
+    policy = {**DEFAULT_LENGTH_POLICY, **(length_policy or {})}
     repo = analysis.get("repo_name", "project")
     title = f"{repo} — 오픈소스 자동 소개"
     subtitle = analysis.get("description", "")
-    sections = _build_sections(analysis)
+    template = _load_template()
+    sections = _apply_section_policy(
+        _build_sections(analysis, template.sections), policy.get("sections") or {}
+    )
     body_md = _compose_body(title, subtitle, analysis.get("summary", ""), sections)
-    body_md = _ensure_length(body_md, target_len=5200)
+    body_md = _ensure_length(body_md, target_len=policy.get("total_min") or 0)
+    if policy.get("total_max"):
+        body_md = _truncate(body_md, policy["total_max"])
     body_md += f"_Generated locally on {datetime.utcnow().date()}_\n"
 
     return {
@@ -74,17 +122,40 @@ def generate_blog(analysis: Dict[str, Any]) -> Dict[str, Any]:
         "body_md": body_md,
         "seo_keywords": _seo_keywords(analysis),
         "sections": sections,
-        "template": _load_template(),
+        "template_version": template.version,
     }
 
 
-def _ensure_length(text: str, target_len: int) -> str:
-    if len(text) >= target_len:
+def _ensure_length(text: str, target_len: int, filler: str = FILLER) -> str:
+    """Pad ``text`` with repeated ``filler`` to exactly ``target_len`` characters."""
+    missing = target_len - len(text)
+    if missing <= 0:
         return text
-    filler = "\n\n" + "이 프로젝트를 통한 자동화, 확장성, 유지보수 방법을 깊게 다룹니다. "
-    while len(text) < target_len:
-        text += filler
-    return text[:target_len]
+    repeats = -(-missing // len(filler))  # ceil
+    return text + (filler * repeats)[:missing]
+
+
+def _truncate(text: str, max_len: int) -> str:
+    """Cut ``text`` to at most ``max_len`` characters, preferring a line boundary."""
+    if len(text) <= max_len:
+        return text
+    cut = text.rfind("\n", 0, max_len)
+    return text[:cut if cut > max_len // 2 else max_len].rstrip() + "\n"
+
+
+def _apply_section_policy(
+    sections: List[Dict[str, str]], rules: Dict[str, Dict[str, Optional[int]]]
+) -> List[Dict[str, str]]:
+    default = rules.get("default") or {}
+    for sec in sections:
+        rule = rules.get(sec["title"], default)
+        content = sec["content"]
+        if rule.get("min") and len(content) < rule["min"]:
+            content = _ensure_length(content, rule["min"])
+        if rule.get("max") and len(content) > rule["max"]:
+            content = _truncate(content, rule["max"]).rstrip("\n")
+        sec["content"] = content
+    return sections
 
 
 def _seo_keywords(analysis: Dict[str, Any]) -> List[str]:
@@ -117,15 +188,20 @@ def _business_ideas(analysis: Dict[str, Any]) -> str:
     return "\n".join(f"- {i}" for i in ideas)
 
 
+_PROBLEM_MD = "## 문제 제기\n오늘날 개발자는 수많은 오픈소스 중 필요한 것을 고르는 데 시간이 많이 듭니다. 자동화된 리포 분석과 정리된 블로그 글은 탐색 비용을 줄여줍니다.\n\n"
+_CLOSING_MD = (
+    "## 마무리\n본 소개 글은 로컬 Codex 파이프라인이 자동 생성했습니다. 추가 기능(이미지, 퍼블리싱)을 연결하면 완전 자동 블로그를 운영할 수 있습니다.\n\n"
+    "## CTA\n- GitHub 리포 방문\n- 별(Star) 추가\n- 이슈/PR로 기여\n- 블로그 구독\n"
+)
+
+
 def _compose_body(title: str, subtitle: str, summary: str, sections: List[Dict[str, str]]) -> str:
-    body_md = f"# {title}\n\n{subtitle}\n\n## 개요\n{summary}\n\n"
+    parts = [f"# {title}\n\n{subtitle}\n\n## 개요\n{summary}\n\n"]
     # 템플릿 주요 섹션
-    body_md += "## 문제 제기\n오늘날 개발자는 수많은 오픈소스 중 필요한 것을 고르는 데 시간이 많이 듭니다. 자동화된 리포 분석과 정리된 블로그 글은 탐색 비용을 줄여줍니다.\n\n"
-    for sec in sections:
-        body_md += f"### {sec['title']}\n{sec['content']}\n\n"
-    body_md += "## 마무리\n본 소개 글은 로컬 Codex 파이프라인이 자동 생성했습니다. 추가 기능(이미지, 퍼블리싱)을 연결하면 완전 자동 블로그를 운영할 수 있습니다.\n\n"
-    body_md += "## CTA\n- GitHub 리포 방문\n- 별(Star) 추가\n- 이슈/PR로 기여\n- 블로그 구독\n"
-    return body_md
+    parts.append(_PROBLEM_MD)
+    parts.extend(f"### {sec['title']}\n{sec['content']}\n\n" for sec in sections)
+    parts.append(_CLOSING_MD)
+    return "".join(parts)
 
 
-__all__ = ["generate_blog", "BLOG_TEMPLATE_PATH"]
+__all__ = ["generate_blog", "BLOG_TEMPLATE_PATH", "DEFAULT_LENGTH_POLICY", "SECTION_BUILDERS"]
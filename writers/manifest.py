@@ -0,0 +1,123 @@
+"""JSON manifest of published articles.
+
+One entry per post keyed by its file slug: title, repo, tech stack, date and
+a content hash of the Markdown body (``body_hash``: without the
+"_Generated locally on <date>_" trailer, so re-rendering unchanged content on
+another day is not an edit). The pipeline records an entry whenever it
+writes a post; ``scripts/gen_index.py`` builds every index/tag page from the
+manifest alone, so it never re-reads the article HTML.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def article_slug(title: str) -> str:
+    """File stem used for ``<slug>.md`` / ``<slug>.html`` (matches the legacy naming)."""
+    return (title or "draft").replace(" ", "_")
+
+
+_TRAILER_RE = re.compile(r"_Generated locally on [^\n]*_\s*\Z")
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def body_hash(body_md: str) -> str:
+    """``content_hash`` of a post body with its generation-date trailer removed."""
+    return content_hash(_TRAILER_RE.sub("", body_md).rstrip())
+
+
+class ArticleManifest:
+    """Load-modify-save wrapper around ``manifest.json``; writes are atomic."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                self._entries = {e["slug"]: e for e in data.get("posts", []) if e.get("slug")}
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, slug: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._load().get(slug)
+
+    def record(
+        self,
+        title: str,
+        body_md: str,
+        repo: str = "",
+        tech_stack: Iterable[str] = (),
+        date: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Insert or update the entry for ``title``.
+
+        The date is kept when the body is unchanged, so re-running the pipeline on
+        an identical draft leaves the manifest (and the index pages) untouched.
+        """
+        slug = article_slug(title)
+        entry = {
+            "slug": slug,
+            "title": title,
+            "href": f"{slug}.html",
+            "repo": repo,
+            "tech_stack": list(dict.fromkeys(t for t in tech_stack if t)),
+            "content_hash": body_hash(body_md),
+        }
+        with self._lock:
+            entries = self._load()
+            old = entries.get(slug)
+            if old and old.get("content_hash") == entry["content_hash"]:
+                entry["date"] = old.get("date")
+            else:
+                entry["date"] = date or datetime.now(timezone.utc).date().isoformat()
+            if old != entry:
+                entries[slug] = entry
+                self._dirty = True
+        return entry
+
+    def posts(self) -> List[Dict[str, Any]]:
+        """Entries newest first (ties broken by title for stable pages)."""
+        with self._lock:
+            entries = list(self._load().values())
+        entries.sort(key=lambda e: e.get("title", ""))
+        entries.sort(key=lambda e: e.get("date") or "", reverse=True)
+        return entries
+
+    def save(self) -> bool:
+        """Write the manifest if anything changed; returns whether it was written."""
+        with self._lock:
+            if not self._dirty:
+                return False
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            posts = sorted(self._load().values(), key=lambda e: e["slug"])
+            tmp = self.path.with_suffix(".json.tmp")
+            tmp.write_text(
+                json.dumps({"version": MANIFEST_VERSION, "posts": posts}, ensure_ascii=False, indent=1),
+                encoding="utf-8",
+            )
+            os.replace(tmp, self.path)
+            self._dirty = False
+            return True
+
+
+__all__ = ["ArticleManifest", "MANIFEST_NAME", "article_slug", "body_hash", "content_hash"]
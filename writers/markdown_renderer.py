@@ -0,0 +1,182 @@
+"""Dependency-free, single-pass Markdown → HTML renderer.
+
+Covers the subset ``generate_blog`` emits: ATX headings, ``-``/``*`` bullets,
+ordered lists, fenced code blocks, blockquotes, horizontal rules, paragraphs and
+inline code / links / ``**strong**`` / ``*em*`` / ``_em_``. Input is consumed line
+by line and HTML chunks are yielded as soon as a block closes; all text is escaped.
+"""
+from __future__ import annotations
+
+import html
+import re
+from typing import Iterable, Iterator, List, Optional
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_BULLET_RE = re.compile(r"^\s*[-*+]\s+(.*)$")
+_ORDERED_RE = re.compile(r"^\s*\d{1,9}[.)]\s+(.*)$")
+_FENCE_RE = re.compile(r"^\s*(```|~~~)\s*([\w+#.-]*)")
+_HR_RE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+_QUOTE_RE = re.compile(r"^\s*>\s?(.*)$")
+
+_CODE_SPAN_RE = re.compile(r"(`+)(.+?)\1")
+# the URL may contain balanced parentheses one level deep (``.../Foo_(bar)``)
+_LINK_RE = re.compile(r"\[([^\]]+)\]\(((?:[^()\s]|\([^()\s]*\))+)\)")
+_STRONG_RE = re.compile(r"\*\*(?=\S)(.+?)(?<=\S)\*\*")
+_EM_STAR_RE = re.compile(r"(?<![*\w])\*(?=\S)(.+?)(?<=\S)\*(?![*\w])")
+_EM_UNDERSCORE_RE = re.compile(r"(?<![\w])_(?=\S)(.+?)(?<=\S)_(?![\w])")
+_SAFE_URL_RE = re.compile(r"^(https?:|mailto:|#|/|\.{0,2}/|[\w.-]+(/|$|#|\?))", re.IGNORECASE)
+
+
+def _link(text: str, url: str) -> str:
+    if not _SAFE_URL_RE.match(html.unescape(url)):
+        return text  # drop javascript:, data: and friends
+    return f'<a href="{url}">{text}</a>'
+
+
+def render_inline(text: str) -> str:
+    """Escape ``text`` and render inline code, links and emphasis."""
+    parts: List[str] = []
+    pos = 0
+    for m in _CODE_SPAN_RE.finditer(text):
+        parts.append(_render_plain(text[pos:m.start()]))
+        parts.append(f"<code>{html.escape(m.group(2).strip())}</code>")
+        pos = m.end()
+    parts.append(_render_plain(text[pos:]))
+    return "".join(parts)
+
+
+def _render_plain(text: str) -> str:
+    """Escaped ``text`` with links and emphasis; link URLs are never rewritten."""
+    if not text:
+        return ""
+    out = html.escape(text)
+    if "[" not in out:
+        return _emphasis(out)
+    # links are split out first (like code spans) so emphasis cannot reach the href
+    parts: List[str] = []
+    pos = 0
+    for m in _LINK_RE.finditer(out):
+        parts.append(_emphasis(out[pos:m.start()]))
+        parts.append(_link(_emphasis(m.group(1)), m.group(2)))
+        pos = m.end()
+    parts.append(_emphasis(out[pos:]))
+    return "".join(parts)
+
+
+def _emphasis(out: str) -> str:
+    if "*" in out:
+        out = _STRONG_RE.sub(r"<strong>\1</strong>", out)
+        out = _EM_STAR_RE.sub(r"<em>\1</em>", out)
+    if "_" in out:
+        out = _EM_UNDERSCORE_RE.sub(r"<em>\1</em>", out)
+    return out
+
+
+def iter_html(lines: Iterable[str]) -> Iterator[str]:
+    """Yield HTML chunks for Markdown ``lines`` (with or without trailing newlines)."""
+    para: List[str] = []
+    quote: List[str] = []
+    list_tag: Optional[str] = None
+    fence: Optional[str] = None
+
+    def close_para() -> Iterator[str]:
+        if para:
+            yield "<p>" + "<br>\n".join(render_inline(p) for p in para) + "</p>\n"
+            para.clear()
+
+    def close_quote() -> Iterator[str]:
+        if quote:
+            yield "<blockquote>" + "<br>\n".join(render_inline(q) for q in quote) + "</blockquote>\n"
+            quote.clear()
+
+    def close_blocks() -> Iterator[str]:
+        nonlocal list_tag
+        yield from close_para()
+        yield from close_quote()
+        if list_tag:
+            yield f"</{list_tag}>\n"
+            list_tag = None
+
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if fence is not None:
+            if line.strip().startswith(fence):
+                yield "</code></pre>\n"
+                fence = None
+            else:
+                yield html.escape(line) + "\n"
+            continue
+        stripped = line.strip()
+        if not stripped:
+            yield from close_blocks()
+            continue
+        lead = stripped[0]  # cheap dispatch: most lines are plain paragraph text
+        if lead in "`~":
+            m = _FENCE_RE.match(line)
+            if m:
+                yield from close_blocks()
+                fence = m.group(1)
+                lang = m.group(2)
+                cls = f' class="language-{html.escape(lang)}"' if lang else ""
+                yield f"<pre><code{cls}>"
+                continue
+        if lead == "#":
+            m = _HEADING_RE.match(line)
+            if m:
+                yield from close_blocks()
+                level = len(m.group(1))
+                yield f"<h{level}>{render_inline(m.group(2))}</h{level}>\n"
+                continue
+        if lead in "-*_" and _HR_RE.match(line):
+            yield from close_blocks()
+            yield "<hr>\n"
+            continue
+        bullet = _BULLET_RE.match(line) if lead in "-*+" else None
+        ordered = _ORDERED_RE.match(line) if lead.isdigit() else None
+        if bullet or ordered:
+            tag = "ul" if bullet else "ol"
+            yield from close_para()
+            yield from close_quote()
+            if list_tag != tag:
+                if list_tag:
+                    yield f"</{list_tag}>\n"
+                yield f"<{tag}>\n"
+                list_tag = tag
+            yield f"<li>{render_inline((bullet or ordered).group(1))}</li>\n"
+            continue
+        if lead == ">":
+            yield from close_para()
+            if list_tag:
+                yield f"</{list_tag}>\n"
+                list_tag = None
+            quote.append(_QUOTE_RE.match(line).group(1))
+            continue
+        if list_tag:
+            yield f"</{list_tag}>\n"
+            list_tag = None
+        yield from close_quote()
+        para.append(stripped)
+
+    if fence is not None:
+        yield "</code></pre>\n"
+    yield from close_blocks()
+
+
+def render_markdown(md: str) -> str:
+    """Render a Markdown string to an HTML fragment."""
+    return "".join(iter_html(md.splitlines()))
+
+
+def render_document(md: str, title: str = "", lang: str = "ko") -> str:
+    """Full HTML page around ``render_markdown``."""
+    return "".join([
+        f"<!doctype html>\n<html lang=\"{html.escape(lang)}\">\n<head>\n",
+        "<meta charset=\"UTF-8\">\n",
+        "<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\">\n",
+        f"<title>{html.escape(title)}</title>\n</head>\n<body>\n",
+        render_markdown(md),
+        "</body>\n</html>\n",
+    ])
+
+
+__all__ = ["render_markdown", "render_document", "render_inline", "iter_html"]
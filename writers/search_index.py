@@ -0,0 +1,334 @@
+"""Full-text and faceted search index over the published articles.
+
+Every post in the manifest is tokenized from its title and ``<slug>.md`` body:
+Latin words and numbers become whole tokens (``next.js``, ``c++`` kept intact)
+and Hangul runs become overlapping character bigrams, so "오픈소스" is found by
+"오픈소스" or "소스" without a morphological analyzer. The index is written as
+static JSON under ``<articles>/search/`` for the site to load lazily:
+
+- ``meta.json``: shard count, document count and the BM25 average length;
+- ``docs.json``: one entry per document id (``null`` for a removed post);
+- ``facets.json``: ``{"tech_stack": {label: [ids]}, "repo": {repo: [ids]}}``;
+- ``terms/<n>.json``: ``{term: [gap, tf, gap, tf, ...]}`` for the terms whose
+  FNV-1a (32-bit, UTF-8) hash modulo the shard count is ``n``; document ids are
+  ascending and stored as gaps from the previous id.
+
+Builds are incremental on the manifest ``content_hash``: ids are stable, and the
+state file remembers which shards hold each post, so only posts whose hash
+changed are re-tokenized and only the shards they touch are read and rewritten.
+``SearchIndex`` is the Python query API over the same files.
+"""
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import os
+import re
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+INDEX_DIR = "search"
+STATE_NAME = ".search-state.json"
+INDEX_VERSION = 1
+DEFAULT_SHARDS = 64
+TITLE_WEIGHT = 3
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# one group matches per hit: a word, a lone Hangul syllable, or (via lookahead)
+# the bigram starting at each syllable of a longer Hangul run
+_TOKEN_RE = re.compile(
+    r"([0-9a-z][0-9a-z+#]*(?:\.[0-9a-z]+)*)"
+    r"|(?<![가-힣])([가-힣])(?![가-힣])"
+    r"|(?=([가-힣]{2}))[가-힣]"
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens, with Hangul runs split into character bigrams."""
+    return list(map("".join, _TOKEN_RE.findall(unicodedata.normalize("NFKC", text).lower())))
+
+
+def shard_of(term: str, shards: int) -> int:
+    """FNV-1a 32-bit hash of the UTF-8 term, modulo ``shards`` (mirrored by the site)."""
+    h = 0x811C9DC5
+    for byte in term.encode("utf-8"):
+        h = ((h ^ byte) * 0x01000193) & 0xFFFFFFFF
+    return h % shards
+
+
+def _encode(postings: Mapping[int, int]) -> List[int]:
+    flat: List[int] = []
+    last = 0
+    for doc_id in sorted(postings):
+        flat += (doc_id - last, postings[doc_id])
+        last = doc_id
+    return flat
+
+
+def _decode(flat: Sequence[int]) -> Dict[int, int]:
+    postings: Dict[int, int] = {}
+    doc_id = 0
+    for i in range(0, len(flat), 2):
+        doc_id += flat[i]
+        postings[doc_id] = flat[i + 1]
+    return postings
+
+
+def _term_counts(title: str, body: str) -> Counter:
+    counts = Counter(tokenize(body))
+    for token in tokenize(title):
+        counts[token] += TITLE_WEIGHT
+    return counts
+
+
+def _read_json(path: Path, default: Any) -> Any:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return default
+
+
+def _write_json(path: Path, data: Any) -> bool:
+    """Atomically write ``data`` unless the file already holds the same bytes."""
+    text = json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+    return True
+
+
+def _read_body(articles_dir: Path, post: Mapping[str, Any]) -> str:
+    try:
+        return (articles_dir / f"{post['slug']}.md").read_text(encoding="utf-8")
+    except OSError:
+        return ""  # legacy HTML-only post: the title is still indexed
+
+
+def build_search_index(
+    posts: Iterable[Mapping[str, Any]],
+    articles_dir: Path,
+    shards: int = DEFAULT_SHARDS,
+    rebuild: bool = False,
+) -> Dict[str, int]:
+    """Bring ``<articles_dir>/search`` up to date with the manifest ``posts``.
+
+    Returns counters: ``docs``, ``indexed`` (posts re-tokenized), ``removed``,
+    ``shards_written``. A full rebuild happens on ``rebuild``, a shard-count or
+    format change, or once removed posts leave more than half the ids empty.
+    """
+    out_dir = articles_dir / INDEX_DIR
+    state_path = out_dir / STATE_NAME
+    state = {} if rebuild else _read_json(state_path, {})
+    if state.get("version") != INDEX_VERSION or state.get("shards") != shards:
+        state = {}
+    ids: Dict[str, Dict[str, Any]] = state.get("docs", {})
+    next_id: int = state.get("next_id", 0)
+    docs: List[Optional[Dict[str, Any]]] = _read_json(out_dir / "docs.json", []) if ids else []
+    if len(docs) != next_id:
+        ids, next_id, docs = {}, 0, []
+
+    posts = {p["slug"]: p for p in posts if p.get("slug")}
+    if ids and next_id > 2 * max(1, len(posts)):
+        ids, next_id, docs = {}, 0, []  # compact the id space
+    if not ids:
+        for stale in (out_dir / "terms").glob("*.json"):
+            stale.unlink()
+
+    # postings to drop (stale ids) and add (new counts), grouped by shard
+    drop: Dict[int, set] = {}
+    add: Dict[int, Dict[str, Dict[int, int]]] = {}
+    shard_cache: Dict[str, int] = {}
+    removed = indexed = 0
+    for slug in list(ids):
+        if slug not in posts:
+            entry = ids.pop(slug)
+            for n in entry["shards"]:
+                drop.setdefault(n, set()).add(entry["id"])
+            docs[entry["id"]] = None
+            removed += 1
+    for slug, post in posts.items():
+        entry = ids.get(slug)
+        if entry is not None and entry["hash"] == post.get("content_hash"):
+            docs[entry["id"]] = _doc(post, docs[entry["id"]]["length"])
+            continue
+        if entry is None:
+            entry = ids[slug] = {"id": next_id, "hash": None, "shards": []}
+            docs.append(None)
+            next_id += 1
+        for n in entry["shards"]:
+            drop.setdefault(n, set()).add(entry["id"])
+        counts = _term_counts(post.get("title", ""), _read_body(articles_dir, post))
+        touched = set()
+        for term, tf in counts.items():
+            n = shard_cache.get(term)
+            if n is None:
+                n = shard_cache[term] = shard_of(term, shards)
+            add.setdefault(n, {}).setdefault(term, {})[entry["id"]] = tf
+            touched.add(n)
+        entry.update(hash=post.get("content_hash"), shards=sorted(touched))
+        docs[entry["id"]] = _doc(post, sum(counts.values()))
+        indexed += 1
+
+    written = 0
+    for n in sorted(set(drop) | set(add)):
+        path = out_dir / "terms" / f"{n}.json"
+        table = {term: _decode(flat) for term, flat in _read_json(path, {}).items()}
+        stale = drop.get(n, set())
+        if stale:
+            for postings in table.values():
+                for doc_id in stale & postings.keys():
+                    del postings[doc_id]
+        for term, postings in add.get(n, {}).items():
+            table.setdefault(term, {}).update(postings)
+        written += _write_json(path, {t: _encode(p) for t, p in table.items() if p})
+
+    live = [d for d in docs if d is not None]
+    facets: Dict[str, Dict[str, List[int]]] = {"tech_stack": {}, "repo": {}}
+    for doc_id, doc in enumerate(docs):
+        if doc is None:
+            continue
+        for label in doc["tech_stack"]:
+            facets["tech_stack"].setdefault(label, []).append(doc_id)
+        if doc["repo"]:
+            facets["repo"].setdefault(doc["repo"], []).append(doc_id)
+    meta = {
+        "version": INDEX_VERSION,
+        "shards": shards,
+        "hash": "fnv1a32",
+        "docs": len(live),
+        "avg_length": round(sum(d["length"] for d in live) / len(live), 3) if live else 0.0,
+        "title_weight": TITLE_WEIGHT,
+    }
+    _write_json(out_dir / "docs.json", docs)
+    _write_json(out_dir / "facets.json", facets)
+    _write_json(out_dir / "meta.json", meta)
+    _write_json(state_path, {
+        "version": INDEX_VERSION, "shards": shards, "next_id": next_id, "docs": ids,
+    })
+    return {"docs": len(live), "indexed": indexed, "removed": removed, "shards_written": written}
+
+
+def _doc(post: Mapping[str, Any], length: int) -> Dict[str, Any]:
+    return {
+        "slug": post["slug"],
+        "title": post.get("title", ""),
+        "href": post.get("href", f"{post['slug']}.html"),
+        "date": post.get("date"),
+        "repo": post.get("repo", ""),
+        "tech_stack": list(post.get("tech_stack", [])),
+        "length": length,
+    }
+
+
+class SearchIndex:
+    """Query API over a built ``search/`` directory; shards are loaded on first use."""
+
+    def __init__(self, index_dir: Path):
+        self.index_dir = Path(index_dir)
+        self.meta = _read_json(self.index_dir / "meta.json", {})
+        self.docs: List[Optional[Dict[str, Any]]] = _read_json(self.index_dir / "docs.json", [])
+        self.facets: Dict[str, Dict[str, List[int]]] = _read_json(
+            self.index_dir / "facets.json", {}
+        )
+        self._shards: Dict[int, Dict[str, List[int]]] = {}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._facet_sets = {
+            name: {value: set(ids) for value, ids in values.items()}
+            for name, values in self.facets.items()
+        }
+        avg = self.meta.get("avg_length") or 1.0
+        # per-document BM25 length normalization, k1 * (1 - b + b * len / avg)
+        self._norms = [
+            BM25_K1 * (1 - BM25_B + BM25_B * d["length"] / avg) if d else 0.0 for d in self.docs
+        ]
+
+    def postings(self, term: str) -> Dict[int, int]:
+        """``{doc_id: tf}`` for one (already tokenized) term."""
+        cached = self._postings.get(term)
+        if cached is not None:
+            return cached
+        shards = self.meta.get("shards")
+        if not shards:
+            return {}
+        n = shard_of(term, shards)
+        if n not in self._shards:
+            self._shards[n] = _read_json(self.index_dir / "terms" / f"{n}.json", {})
+        cached = self._postings[term] = _decode(self._shards[n].get(term, ()))
+        return cached
+
+    def _facet_counts(self, name: str, matched: set) -> Dict[str, int]:
+        values = self._facet_sets.get(name, {})
+        if len(matched) < len(values):
+            counts: Counter = Counter()
+            for doc_id in matched:
+                value = self.docs[doc_id][name]
+                counts.update(value if isinstance(value, list) else [value] if value else ())
+        else:
+            counts = Counter({v: len(ids & matched) for v, ids in values.items()})
+        return {v: c for v, c in counts.most_common() if c}
+
+    def search(
+        self,
+        query: str = "",
+        tech_stack: Iterable[str] = (),
+        repo: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """Posts matching every query token and every filter, best BM25 score first.
+
+        ``tech_stack`` labels must all be present; ``repo`` must match exactly.
+        Returns ``{"total", "hits", "facets"}``: hits are doc entries with a
+        ``score``; facets count the labels and repos over all matches.
+        """
+        allowed: Optional[set] = None
+        filters = [("tech_stack", label) for label in tech_stack]
+        if repo is not None:
+            filters.append(("repo", repo))
+        for name, value in filters:
+            ids = self._facet_sets.get(name, {}).get(value, set())
+            allowed = set(ids) if allowed is None else allowed & ids
+
+        terms = list(dict.fromkeys(tokenize(query)))
+        scores: Dict[int, float] = {}
+        if terms:
+            lists = sorted((self.postings(t) for t in terms), key=len)
+            candidates = set(lists[0]) if allowed is None else allowed & lists[0].keys()
+            for postings in lists[1:]:
+                candidates &= postings.keys()
+            scores = dict.fromkeys(candidates, 0.0)
+            total_docs = max(1, self.meta.get("docs", 0))
+            norms = self._norms
+            for postings in lists:
+                df = len(postings)
+                weight = math.log(1 + (total_docs - df + 0.5) / (df + 0.5)) * (BM25_K1 + 1)
+                for doc_id in candidates:
+                    tf = postings[doc_id]
+                    scores[doc_id] += weight * tf / (tf + norms[doc_id])
+        else:
+            pool = allowed if allowed is not None else range(len(self.docs))
+            scores = {doc_id: 0.0 for doc_id in pool if self.docs[doc_id] is not None}
+
+        docs = self.docs
+        top = heapq.nlargest(
+            offset + limit, scores, key=lambda i: (scores[i], docs[i].get("date") or "", -i)
+        )[offset:]
+        matched = set(scores)
+        return {
+            "total": len(scores),
+            "hits": [{**docs[i], "score": round(scores[i], 4)} for i in top],
+            "facets": {name: self._facet_counts(name, matched) for name in ("tech_stack", "repo")},
+        }
+
+
+__all__ = ["SearchIndex", "build_search_index", "shard_of", "tokenize"]
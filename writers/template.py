@@ -0,0 +1,115 @@
+"""Blog writing guide, loaded once and compiled into a section plan.
+
+``load_template`` keeps one ``CompiledTemplate`` per path and re-reads the file
+only when its mtime or size changes. Drafts reference the guide by
+``version`` (sha256 of the file, the same value ``file_fingerprint`` yields)
+instead of carrying its full text.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# "# 4. 핵심 기능 리스트 (Key Features)" -> number "4", title "핵심 기능 리스트 (Key Features)"
+_SECTION_RE = re.compile(r"^#\s+(\d+)\.\s+(.+?)\s*$")
+_SUBSECTION_RE = re.compile(r"^###\s+(\d+-\d+)\.\s+(.+?)\s*$")
+_BULLET_RE = re.compile(r"^\s*-\s+(.+?)\s*$")
+
+
+class CompiledTemplate:
+    """Parsed guide: ``sections`` is a list of {number, title, guidance, subsections}."""
+
+    __slots__ = ("path", "version", "text", "sections")
+
+    def __init__(self, path: Path, version: str, text: str, sections: List[Dict[str, Any]]):
+        self.path = path
+        self.version = version
+        self.text = text
+        self.sections = sections
+
+    def section_titles(self) -> List[str]:
+        return [s["title"] for s in self.sections]
+
+
+def compile_sections(text: str) -> List[Dict[str, Any]]:
+    """Split the guide on numbered ``# N. Title`` headings.
+
+    ``guidance`` collects the section's bullet points up to its first example
+    (``예``/``예시``) line; ``subsections`` lists ``### N-M. Title`` headings.
+    """
+    sections: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    in_example = False
+    for line in text.splitlines():
+        match = _SECTION_RE.match(line)
+        if match:
+            current = {"number": match.group(1), "title": match.group(2),
+                       "guidance": [], "subsections": []}
+            sections.append(current)
+            in_example = False
+            continue
+        if current is None:
+            continue
+        match = _SUBSECTION_RE.match(line)
+        if match:
+            current["subsections"].append(match.group(2))
+            continue
+        if line.startswith("예"):
+            in_example = True
+        elif not in_example:
+            match = _BULLET_RE.match(line)
+            if match:
+                current["guidance"].append(match.group(1))
+    return sections
+
+
+class TemplateCache:
+    """Thread-safe per-path cache, invalidated by (mtime_ns, size)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[Tuple[int, int], CompiledTemplate]] = {}
+        self.loads = 0
+
+    def get(self, path: os.PathLike | str) -> CompiledTemplate:
+        path = Path(path)
+        try:
+            st = path.stat()
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = (-1, -1)
+        key = str(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == stamp:
+                return entry[1]
+            compiled = self._compile(path, stamp)
+            self._entries[key] = (stamp, compiled)
+            return compiled
+
+    def _compile(self, path: Path, stamp: Tuple[int, int]) -> CompiledTemplate:
+        self.loads += 1
+        if stamp == (-1, -1):
+            return CompiledTemplate(path, "", "", [])
+        data = path.read_bytes()
+        text = data.decode("utf-8")
+        return CompiledTemplate(path, hashlib.sha256(data).hexdigest(), text, compile_sections(text))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_CACHE = TemplateCache()
+
+
+def load_template(path: os.PathLike | str) -> CompiledTemplate:
+    """Cached ``CompiledTemplate`` for ``path``; a missing file has version ``""``."""
+    return _CACHE.get(path)
+
+
+__all__ = ["CompiledTemplate", "TemplateCache", "compile_sections", "load_template"]